@@ -1,5 +1,25 @@
 # ipc_project/core/__init__.py
 
-from .process_manager import ProcessManager  # noqa: F401
-from .ipc_manager import IPCManager  # noqa: F401
-from .security import SecurityManager  # noqa: F401
+# Re-exports are resolved lazily: ProcessManager imports the worker
+# classes, and workers import core helpers (core.rpc, core.status_table),
+# so importing them eagerly here would be circular.
+
+_EXPORTS = {
+    "ProcessManager": "core.process_manager",
+    "IPCManager": "core.ipc_manager",
+    "SecurityManager": "core.security",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module 'core' has no attribute {name!r}")
+
+    import importlib
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
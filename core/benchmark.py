@@ -0,0 +1,413 @@
+# ipc_project/core/benchmark.py
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from array import array
+from dataclasses import asdict, dataclass
+from multiprocessing import Queue
+from typing import Callable, Dict, List
+
+from core.ipc_manager import IPCManager
+from core.process_manager import ProcessManager, WorkerRequest
+from core.security import SecurityManager
+from core.topology import CHANNEL_TYPES
+from core.utils.logger import AppLogger
+from core.utils.proc_stats import read_proc_sample
+from processes.echo_process import EchoWorker
+from processes.ping_process import PingWorker
+
+
+@dataclass
+class ScenarioResult:
+    """
+    One scenario run. Latencies are round trips as seen by the ping
+    workers (warm-up excluded); CPU is the CPU time of every worker
+    process in the scenario divided by the round trips.
+    """
+
+    scenario: str
+    channel_type: str
+    hosted: bool
+    window: int
+    round_trips: int
+    elapsed: float
+    throughput: float
+    p50_us: float
+    p90_us: float
+    p99_us: float
+    max_us: float
+    cpu_us_per_msg: float
+
+    def summary(self) -> str:
+        return (
+            f"{self.scenario:<9} {self.channel_type:<11} "
+            f"{'hosted' if self.hosted else 'procs':<6} "
+            f"{self.throughput:>10.0f}/s  p50 {self.p50_us:>8.0f}us  p90 {self.p90_us:>8.0f}us  "
+            f"p99 {self.p99_us:>8.0f}us  max {self.max_us:>8.0f}us  cpu {self.cpu_us_per_msg:>7.1f}us/msg"
+        )
+
+
+class _Wiring:
+    """
+    Channels and worker requests of one scenario, built on fresh managers.
+    """
+
+    def __init__(
+        self,
+        runner: "ScenarioRunner",
+        ipc: IPCManager,
+        pm: ProcessManager,
+        results: Queue,
+        scratch: str | None = None,
+    ) -> None:
+        self.runner = runner
+        self.ipc = ipc
+        self.results = results
+        # Directory for mmap logs, so no run resumes an earlier run's log
+        self.scratch = scratch
+        self.client = pm.create_dummy_process("bench-client")["id"]
+        self.server = pm.create_dummy_process("bench-server")["id"]
+        self.requests: List[WorkerRequest] = []
+        self.pings = 0
+
+    def channel(self, name: str, senders: List[int], receivers: List[int]):
+        create = getattr(self.ipc, CHANNEL_TYPES[self.runner.channel_type])
+        options = {"directory": self.scratch} if self.runner.channel_type == "mmap_log" else {}
+        return create(name, allowed_senders=senders, allowed_receivers=receivers, **options)
+
+    def ping(self, channel, reply_channel, route: int = 0, window: int | None = None) -> None:
+        count, results = self.runner.count, self.results
+        window = window or self.runner.window
+        client, hosted = self.client, self.runner.hosted
+
+        def factory(proc_id, name, cmd_q, out_q):
+            worker = PingWorker(
+                proc_id, name, cmd_q, out_q, channel, client,
+                reply_channel=reply_channel, receiver_id=client,
+                count=count, window=window, route=route, results=results,
+            )
+            return worker
+
+        self.requests.append(WorkerRequest(f"bench-ping{route}", "ping", factory, hosted=hosted))
+        self.pings += 1
+
+    def echo(self, channel, reply_channel, index: int = 0) -> None:
+        server, hosted = self.server, self.runner.hosted
+
+        def factory(proc_id, name, cmd_q, out_q):
+            worker = EchoWorker(proc_id, name, cmd_q, out_q, channel, server, server, reply_channel)
+            worker.loop_interval = 0.0
+            # WorkerHost turns this into a poll for hosted echoes
+            worker.receive_timeout = 0.05
+            return worker
+
+        self.requests.append(WorkerRequest(f"bench-echo{index}", "echo", factory, hosted=hosted))
+
+
+# ---------------------------------------------------------------------- #
+# Scenarios                                                              #
+# ---------------------------------------------------------------------- #
+
+def _pair(w: _Wiring) -> None:
+    request = w.channel("bench-req", [w.client], [w.server])
+    reply = w.channel("bench-rep", [w.server], [w.client])
+    w.echo(request, reply)
+    w.ping(request, reply)
+
+
+def _fan_out(w: _Wiring) -> None:
+    # One ping round-robins over `width` echo workers
+    width = w.runner.width
+    reply = w.channel("bench-rep", [w.server], [w.client])
+    requests = [w.channel(f"bench-req{i}", [w.client], [w.server]) for i in range(width)]
+    for i, request in enumerate(requests):
+        w.echo(request, reply, index=i)
+    w.ping(requests, reply, window=w.runner.window * width)
+
+
+def _fan_in(w: _Wiring) -> None:
+    # `width` pings share one echo worker, which routes replies by msg[0]
+    width = w.runner.width
+    request = w.channel("bench-req", [w.client], [w.server])
+    replies = [w.channel(f"bench-rep{i}", [w.server], [w.client]) for i in range(width)]
+    w.echo(request, replies)
+    for i, reply in enumerate(replies):
+        w.ping(request, reply, route=i)
+
+
+def _pipeline(w: _Wiring) -> None:
+    # ping -> stage0 -> stage1 -> stage2 -> ping
+    stages = [w.channel("bench-stage0", [w.client], [w.server])]
+    stages += [w.channel(f"bench-stage{i}", [w.server], [w.server]) for i in (1, 2)]
+    reply = w.channel("bench-rep", [w.server], [w.client])
+    for i, stage in enumerate(stages):
+        w.echo(stage, stages[i + 1] if i + 1 < len(stages) else reply, index=i)
+    w.ping(stages[0], reply)
+
+
+SCENARIOS: Dict[str, Callable[[_Wiring], None]] = {
+    "pair": _pair,
+    "fan_out": _fan_out,
+    "fan_in": _fan_in,
+    "pipeline": _pipeline,
+}
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class ScenarioRunner:
+    """
+    Runs the standard worker topologies end to end: PingWorker -> channel
+    -> EchoWorker(s) -> back, through BaseWorker's loop, ProcessManager
+    spawning and the out_queue log drain, exactly as in the control room.
+
+    Each scenario gets fresh managers. Workers start first; timing begins
+    when every ping has been sent "start", so spawn cost is not measured.
+
+    - count: round trips per ping worker
+    - window: pings in flight per ping worker (per echo for fan_out)
+    - width: echo workers (fan_out) or ping workers (fan_in)
+    - hosted: let ProcessManager pack the workers into WorkerHosts
+    - warmup: leading fraction of each ping's samples left out of the
+      latency percentiles
+    """
+
+    def __init__(
+        self,
+        channel_type: str = "queue",
+        count: int = 2000,
+        window: int = 1,
+        width: int = 4,
+        hosted: bool = False,
+        warmup: float = 0.1,
+        timeout: float = 120.0,
+        logger: AppLogger | None = None,
+    ) -> None:
+        if channel_type not in CHANNEL_TYPES or channel_type in ("shared_memory", "ndarray"):
+            raise ValueError(f"channel type '{channel_type}' cannot carry ping/echo messages")
+        self.channel_type = channel_type
+        self.count = count
+        self.window = max(1, window)
+        self.width = max(1, width)
+        self.hosted = hosted
+        self.warmup = warmup
+        self.timeout = timeout
+        # No sinks and no store: records are dropped without formatting
+        self.logger = logger or AppLogger()
+
+    # ------------------------------------------------------------------ #
+    # Internal helpers                                                   #
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def _cpu_seconds(pids: List[int]) -> float:
+        # All threads of each worker: the Queue feeder thread does the
+        # pickling and writing of every send
+        total = 0.0
+        for pid in pids:
+            sample = read_proc_sample(pid)
+            if sample is not None:
+                total += sample.cpu_seconds
+        return total
+
+    def _collect(self, results: Queue, expected: int) -> List[tuple]:
+        deadline = time.monotonic() + self.timeout
+        collected = []
+        while len(collected) < expected:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"{len(collected)}/{expected} ping workers finished in {self.timeout}s")
+            try:
+                collected.append(results.get(timeout=min(remaining, 1.0)))
+            except queue.Empty:
+                continue
+        return collected
+
+    # ------------------------------------------------------------------ #
+    # Public API                                                         #
+    # ------------------------------------------------------------------ #
+
+    def run(self, scenario: str) -> ScenarioResult:
+        if scenario not in SCENARIOS:
+            raise ValueError(f"unknown scenario '{scenario}' (choose from {', '.join(SCENARIOS)})")
+
+        pm = ProcessManager(logger=self.logger)
+        ipc = IPCManager(self.logger, SecurityManager(self.logger))
+        results: Queue = Queue()
+        scratch = tempfile.mkdtemp(prefix="ipc-bench-") if self.channel_type == "mmap_log" else None
+        try:
+            wiring = _Wiring(self, ipc, pm, results, scratch)
+            SCENARIOS[scenario](wiring)
+            proc_ids = pm.spawn_workers(wiring.requests, wait=10.0)
+            # Worker telemetry flows as in the control room
+            pm.output.start(interval=0.05)
+
+            pids = sorted({info.pid for info in pm.list_processes() if info.pid is not None})
+            cpu_before = self._cpu_seconds(pids)
+            for proc_id, req in zip(proc_ids, wiring.requests):
+                if req.role == "ping":
+                    pm.send_command(proc_id, "start")
+
+            collected = self._collect(results, wiring.pings)
+            cpu = self._cpu_seconds(pids) - cpu_before
+        finally:
+            pm.shutdown()
+            ipc.close_all()
+            results.close()
+            if scratch is not None:
+                shutil.rmtree(scratch, ignore_errors=True)
+
+        samples: List[float] = []
+        skip = int(self.count * self.warmup)
+        elapsed = 0.0
+        for _proc_id, raw, ping_elapsed, _ping_cpu in collected:
+            rtts = array("d")
+            rtts.frombytes(raw)
+            samples.extend(rtts[skip:])
+            elapsed = max(elapsed, ping_elapsed)
+        samples.sort()
+        round_trips = self.count * wiring.pings
+
+        return ScenarioResult(
+            scenario=scenario,
+            channel_type=self.channel_type,
+            hosted=self.hosted,
+            window=self.window,
+            round_trips=round_trips,
+            elapsed=elapsed,
+            throughput=round_trips / elapsed if elapsed else 0.0,
+            p50_us=_percentile(samples, 0.50) * 1e6,
+            p90_us=_percentile(samples, 0.90) * 1e6,
+            p99_us=_percentile(samples, 0.99) * 1e6,
+            max_us=(samples[-1] if samples else 0.0) * 1e6,
+            cpu_us_per_msg=cpu / round_trips * 1e6 if round_trips else 0.0,
+        )
+
+    def run_all(self, scenarios: List[str] | None = None) -> List[ScenarioResult]:
+        return [self.run(name) for name in (scenarios or list(SCENARIOS))]
+
+
+# ---------------------------------------------------------------------- #
+# Reports                                                                #
+# ---------------------------------------------------------------------- #
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def make_report(results: List[ScenarioResult], runner: ScenarioRunner) -> dict:
+    """
+    JSON-ready report with enough context to compare runs across commits.
+    """
+    return {
+        "commit": _git_commit(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "host": platform.node(),
+        "cpus": os.cpu_count(),
+        "params": {"count": runner.count, "width": runner.width, "warmup": runner.warmup},
+        "results": [asdict(result) for result in results],
+    }
+
+
+def compare_reports(baseline: dict, current: dict, tolerance: float = 0.15) -> List[str]:
+    """
+    Regressions of `current` against `baseline` beyond `tolerance`
+    (relative): higher p50/p99 latency or CPU per message, lower
+    throughput. Scenarios are matched on (scenario, channel, hosted,
+    window). Raises ValueError if the reports were run with different
+    count/width/warmup, since their numbers are not comparable.
+    """
+    if baseline.get("params") != current.get("params"):
+        raise ValueError(
+            f"reports were run with different parameters: "
+            f"baseline {baseline.get('params')}, current {current.get('params')}"
+        )
+
+    def key(result: dict) -> tuple:
+        return result["scenario"], result["channel_type"], result["hosted"], result["window"]
+
+    base = {key(result): result for result in baseline.get("results", [])}
+    problems = []
+    for result in current.get("results", []):
+        old = base.get(key(result))
+        if old is None:
+            continue
+        label = "/".join(str(part) for part in key(result))
+        for metric in ("p50_us", "p99_us", "cpu_us_per_msg"):
+            if old[metric] > 0 and result[metric] > old[metric] * (1 + tolerance):
+                problems.append(f"{label}: {metric} {old[metric]:.1f} -> {result[metric]:.1f}")
+        if result["throughput"] < old["throughput"] * (1 - tolerance):
+            problems.append(f"{label}: throughput {old['throughput']:.0f} -> {result['throughput']:.0f}")
+    return problems
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="End-to-end worker round-trip benchmarks")
+    parser.add_argument("scenarios", nargs="*", help=f"any of {', '.join(SCENARIOS)} (default: all)")
+    parser.add_argument("--channel", default="queue", help="channel type (default: queue)")
+    parser.add_argument("--count", type=int, default=2000, help="round trips per ping worker")
+    parser.add_argument("--window", type=int, default=1, help="pings in flight per ping worker")
+    parser.add_argument("--width", type=int, default=4, help="echo workers (fan_out) / ping workers (fan_in)")
+    parser.add_argument("--hosted", action="store_true", help="pack workers into WorkerHosts")
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--compare", help="baseline report; exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed relative regression")
+    args = parser.parse_args(argv)
+
+    runner = ScenarioRunner(
+        channel_type=args.channel,
+        count=args.count,
+        window=args.window,
+        width=args.width,
+        hosted=args.hosted,
+    )
+    results = []
+    for name in args.scenarios or list(SCENARIOS):
+        result = runner.run(name)
+        print(result.summary(), flush=True)
+        results.append(result)
+
+    report = make_report(results, runner)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        try:
+            problems = compare_reports(baseline, report, args.tolerance)
+        except ValueError as exc:
+            print(f"Cannot compare: {exc}")
+            return 2
+        for problem in problems:
+            print(f"REGRESSION {problem}")
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+# ipc_project/core/channels/async_channel.py
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, AsyncIterator, Dict, List
+
+from core.channels.pipe_channel import PipeChannel
+from core.channels.queue_channel import QueueChannel
+from core.channels.shm_channel import SharedMemoryChannel
+
+# What _try_receive() returns when nothing is waiting: None is a payload
+_NO_MESSAGE = object()
+
+
+class AsyncChannel:
+    """
+    asyncio facade over a blocking channel.
+
+    Channels that expose a readable file descriptor are registered with
+    the event loop via add_reader(), so waiting costs no thread and no
+    polling; one loop can service thousands of channels. Channels without
+    a descriptor fall back to polling with a bounded backoff.
+
+    The wrapped channel keeps doing the security checks and logging.
+    """
+
+    def __init__(
+        self,
+        channel: Any,
+        poll_interval: float = 0.001,
+        max_poll_interval: float = 0.05,
+    ) -> None:
+        self.channel = channel
+        self.name = channel.name
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+
+        self._waiters: List[asyncio.Future] = []
+        self._reader_loop: asyncio.AbstractEventLoop | None = None
+
+    # ------------------------------------------------------------------ #
+    # Internal helpers                                                   #
+    # ------------------------------------------------------------------ #
+
+    def _readable_fd(self) -> int | None:
+        """
+        Descriptor that becomes readable when a message may be available.
+        """
+        return None
+
+    def _at_eof(self) -> bool:
+        """
+        True once the channel can never deliver again (peer closed).
+        """
+        return False
+
+    def _authorized(self, receiver_id: int) -> bool:
+        return self.channel.security_manager.validate_receiver(
+            channel_name=self.channel.name,
+            receiver_id=receiver_id,
+            allowed_receivers=self.channel.allowed_receivers,
+        )
+
+    def _try_receive(self, receiver_id: int) -> Any:
+        return self.channel.receive_message(receiver_id, block=False, default=_NO_MESSAGE)
+
+    def _on_readable(self) -> None:
+        # One add_reader registration per fd, shared by all waiters
+        if self._reader_loop is not None:
+            self._reader_loop.remove_reader(self._readable_fd())
+            self._reader_loop = None
+        waiters, self._waiters = self._waiters, []
+        for fut in waiters:
+            if not fut.done():
+                fut.set_result(None)
+
+    async def _wait_readable(self, fd: int) -> None:
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._waiters.append(fut)
+        if self._reader_loop is None:
+            loop.add_reader(fd, self._on_readable)
+            self._reader_loop = loop
+        try:
+            await fut
+        finally:
+            if fut in self._waiters:
+                self._waiters.remove(fut)
+            if not self._waiters and self._reader_loop is not None:
+                self._reader_loop.remove_reader(fd)
+                self._reader_loop = None
+
+    async def _receive(self, receiver_id: int) -> Any:
+        fd = self._readable_fd()
+        delay = self.poll_interval
+        while True:
+            msg = self._try_receive(receiver_id)
+            if msg is not _NO_MESSAGE:
+                return msg
+            if self._at_eof():
+                # A closed peer leaves the fd readable forever
+                raise EOFError(f"channel '{self.name}' was closed by its peer")
+            if fd is not None:
+                # Readable can be a false wakeup when another consumer
+                # took the message first; just try again.
+                await self._wait_readable(fd)
+            else:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_poll_interval)
+
+    # ------------------------------------------------------------------ #
+    # Public API                                                         #
+    # ------------------------------------------------------------------ #
+
+    async def send_message(self, sender_id: int, payload: Any) -> bool:
+        return self.channel.send_message(sender_id, payload)
+
+    async def receive_message(
+        self,
+        receiver_id: int,
+        timeout: float | None = None,
+    ) -> Any | None:
+        """
+        Wait for the next message without blocking the event loop.
+
+        Returns None on timeout, if the receiver is not authorized or if
+        the peer has closed the channel (use stream() to receive None
+        payloads unambiguously).
+        """
+        if not self._authorized(receiver_id):
+            return None
+        try:
+            return await asyncio.wait_for(self._receive(receiver_id), timeout)
+        except (asyncio.TimeoutError, EOFError):
+            return None
+
+    async def stream(self, receiver_id: int) -> AsyncIterator[Any]:
+        """
+        Yield messages until the peer closes the channel:
+        async for msg in achan.stream(rid): ...
+        """
+        if not self._authorized(receiver_id):
+            return
+        while True:
+            try:
+                msg = await self._receive(receiver_id)
+            except EOFError:
+                return
+            yield msg
+
+
+class AsyncPipeChannel(AsyncChannel):
+    """
+    Waits on the receive end of the pipe.
+    """
+
+    def __init__(self, channel: PipeChannel, **kwargs: Any) -> None:
+        super().__init__(channel, **kwargs)
+
+    def _readable_fd(self) -> int | None:
+        return self.channel._recv_conn.fileno()
+
+    def _at_eof(self) -> bool:
+        return self.channel.peer_closed
+
+    def _try_receive(self, receiver_id: int) -> Any:
+        # block=False alone polls with timeout=None, which waits forever
+        return self.channel.receive_message(
+            receiver_id, block=False, timeout=0.0, default=_NO_MESSAGE
+        )
+
+
+class AsyncQueueChannel(AsyncChannel):
+    """
+    Waits on the pipe that backs the multiprocessing.Queue.
+    """
+
+    def __init__(self, channel: QueueChannel, **kwargs: Any) -> None:
+        super().__init__(channel, **kwargs)
+
+    def _readable_fd(self) -> int | None:
+        return self.channel._queue._reader.fileno()
+
+
+class AsyncSharedMemoryChannel(AsyncChannel):
+    """
+    Shared memory has no queue semantics: receive_message() waits until
+    the segment has been written since this receiver last saw it and
+    then returns the current value.
+
+    If the channel has wakeup notifiers (notify_readers > 0), waits on
+    notifier `notifier_index` instead of polling the write counter.
+    """
+
+    def __init__(self, channel: SharedMemoryChannel, notifier_index: int = 0, **kwargs: Any) -> None:
+        super().__init__(channel, **kwargs)
+        # Last version seen, per receiver
+        self._seen: Dict[int, int] = {}
+        self._notifier = channel.notifier(notifier_index)
+
+    def _readable_fd(self) -> int | None:
+        return None if self._notifier is None else self._notifier.fileno()
+
+    def _try_receive(self, receiver_id: int) -> Any:
+        if self._notifier is not None:
+            # Clear before checking, so a write in between stays signalled
+            self._notifier.clear()
+        # Lock-free pre-check; the value and its version are then read together
+        if self._seen.get(receiver_id, 0) == self.channel.version():
+            return _NO_MESSAGE
+        read = self.channel.read_versioned(receiver_id)
+        if read is None:
+            return _NO_MESSAGE
+        self._seen[receiver_id] = read[0]
+        return read[1]
+
+    async def send_message(self, sender_id: int, payload: Any) -> bool:
+        return self.channel.write_value(sender_id, payload)
@@ -0,0 +1,429 @@
+# ipc_project/core/channels/mmap_channel.py
+
+from __future__ import annotations
+
+import glob
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+import time
+from contextlib import contextmanager
+from multiprocessing import Lock
+from typing import Any, Dict, Iterator, List, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not on Windows
+    fcntl = None
+
+from core.utils.logger import AppLogger
+from core.security import SecurityManager
+
+
+DEFAULT_LOG_DIR = os.path.join(tempfile.gettempdir(), "ipc_mmap_logs")
+
+_MAGIC = b"IPCLOG01"
+# magic, committed offset, segment index, sealed flag
+_SEG_HEADER = struct.Struct("<8sQQB")
+_HEADER_SIZE = 64
+# record length, sender id
+_RECORD = struct.Struct("<Ii")
+
+# How often a blocking receive re-checks the log
+_POLL_INTERVAL = 0.005
+
+
+class _Segment:
+    """
+    One fixed-size, memory-mapped segment file.
+    """
+
+    def __init__(self, path: str, index: int, size: int, create: bool) -> None:
+        self.path = path
+        self.index = index
+        fd = os.open(path, os.O_RDWR | os.O_CREAT if create else os.O_RDWR, 0o644)
+        try:
+            # Another process may have created it first; never reset that
+            fresh = create and os.fstat(fd).st_size == 0
+            if fresh:
+                os.ftruncate(fd, size)
+            self.map = mmap.mmap(fd, 0)
+        finally:
+            os.close(fd)
+        if fresh:
+            _SEG_HEADER.pack_into(self.map, 0, _MAGIC, _HEADER_SIZE, index, 0)
+        elif _SEG_HEADER.unpack_from(self.map, 0)[0] != _MAGIC:
+            self.map.close()
+            raise ValueError(f"Not a channel log segment: {path}")
+
+    @property
+    def size(self) -> int:
+        return len(self.map)
+
+    def committed(self) -> int:
+        return _SEG_HEADER.unpack_from(self.map, 0)[1]
+
+    def sealed(self) -> bool:
+        return bool(_SEG_HEADER.unpack_from(self.map, 0)[3])
+
+    def commit(self, offset: int) -> None:
+        struct.pack_into("<Q", self.map, 8, offset)
+
+    def seal(self) -> None:
+        struct.pack_into("<B", self.map, 24, 1)
+
+    def close(self) -> None:
+        try:
+            self.map.close()
+        except Exception:
+            pass
+
+
+class MmapLogChannel:
+    """
+    Persistent, append-only log channel backed by memory-mapped files.
+
+    - The log is split into fixed-size segment files; a full segment is
+      sealed and writing rolls over to the next one.
+    - Appending a message is a memcpy into the mapping plus a header
+      update, so there is no syscall per message.
+    - Each receiver tails the log with its own (segment, offset) position.
+    - Files outlive the channel object: re-creating a channel with the
+      same name and directory resumes the existing log.
+    - Appends take an flock() on <name>.lock next to the segments, so
+      processes that opened the log independently (not only forked
+      children sharing the channel's Lock) can write concurrently.
+      Without fcntl (Windows) the log is single-writer across
+      independently opened channels.
+    """
+
+    def __init__(
+        self,
+        channel_id: int,
+        name: str,
+        allowed_senders: List[int],
+        allowed_receivers: List[int],
+        logger: AppLogger,
+        security_manager: SecurityManager,
+        directory: str | None = None,
+        segment_size: int = 4 << 20,
+        max_segments: int | None = None,
+        start_at: str = "earliest",
+    ) -> None:
+        if segment_size <= _HEADER_SIZE + _RECORD.size:
+            raise ValueError("segment_size too small")
+        if start_at not in ("earliest", "latest"):
+            raise ValueError("start_at must be 'earliest' or 'latest'")
+        if max_segments is not None and max_segments < 1:
+            raise ValueError("max_segments must be at least 1")
+
+        self.channel_id = channel_id
+        self.name = name
+        self.allowed_senders = allowed_senders
+        self.allowed_receivers = allowed_receivers
+        self.logger = logger
+        self.security_manager = security_manager
+        self.directory = directory or DEFAULT_LOG_DIR
+        self.segment_size = segment_size
+        self.max_segments = max_segments
+        self.start_at = start_at
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._lock = Lock()
+        # Cross-process writer lock file; opened per process (see _flock_fd)
+        self._lock_path = os.path.join(self.directory, f"{self.name}.lock")
+        self._lock_fd = -1
+        self._lock_pid = 0
+        # Mapped segments of this process, by segment index
+        self._segments: Dict[int, _Segment] = {}
+        # Reader positions: receiver_id -> (segment index, offset)
+        self._offsets: Dict[int, Tuple[int, int]] = {}
+
+        with self._lock, self._writer_lock():
+            existing = self._segment_indexes()
+            if existing:
+                self._write_index = existing[-1]
+                resumed = True
+            else:
+                self._write_index = 0
+                self._open_segment(0, create=True)
+                resumed = False
+
+        self.logger.info(
+            f"[MmapLog:{self.name}] Log {'resumed' if resumed else 'created'} "
+            f"(id={self.channel_id}, dir={self.directory}, segment={self.segment_size})"
+        )
+
+    # ------------------------------------------------------------------ #
+    # Internal helpers                                                   #
+    # ------------------------------------------------------------------ #
+
+    @contextmanager
+    def _writer_lock(self) -> Iterator[None]:
+        """
+        flock() on the log's lock file, excluding writers in processes that
+        do not share self._lock. Caller holds self._lock.
+        """
+        if fcntl is None:
+            yield
+            return
+        # flock() locks belong to the open file description, which a forked
+        # child shares with its parent, so every process opens its own
+        if self._lock_pid != os.getpid():
+            self._lock_fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+            self._lock_pid = os.getpid()
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _segment_path(self, index: int) -> str:
+        return os.path.join(self.directory, f"{self.name}-{index:08d}.seg")
+
+    def _segment_indexes(self) -> List[int]:
+        pattern = os.path.join(glob.escape(self.directory), f"{glob.escape(self.name)}-*.seg")
+        indexes = []
+        for path in glob.glob(pattern):
+            suffix = os.path.basename(path)[len(self.name) + 1 : -4]
+            if suffix.isdigit():
+                indexes.append(int(suffix))
+        return sorted(indexes)
+
+    def _open_segment(self, index: int, create: bool = False) -> _Segment | None:
+        seg = self._segments.get(index)
+        if seg is not None:
+            return seg
+        path = self._segment_path(index)
+        if not create and not os.path.exists(path):
+            return None
+        seg = _Segment(path, index, self.segment_size, create=create)
+        self._segments[index] = seg
+        return seg
+
+    def _drop_segment(self, index: int) -> None:
+        seg = self._segments.pop(index, None)
+        if seg is not None:
+            seg.close()
+
+    def _current_write_segment(self) -> _Segment:
+        """
+        Follow rollovers made by writers in other processes.
+        Caller must hold the lock.
+        """
+        seg = self._open_segment(self._write_index)
+        while seg is not None and seg.sealed():
+            nxt = self._open_segment(self._write_index + 1)
+            if nxt is None:
+                break
+            self._drop_segment(self._write_index)
+            self._write_index += 1
+            seg = nxt
+        if seg is None:
+            seg = self._open_segment(self._write_index, create=True)
+        return seg
+
+    def _roll_over(self, seg: _Segment) -> _Segment:
+        """
+        Create the next segment, then seal the full one. Caller holds the lock.
+        """
+        nxt = self._open_segment(seg.index + 1, create=True)
+        seg.seal()
+        self._drop_segment(seg.index)
+        self._write_index = nxt.index
+
+        if self.max_segments is not None:
+            for old in self._segment_indexes()[: -self.max_segments]:
+                self._drop_segment(old)
+                try:
+                    os.remove(self._segment_path(old))
+                except OSError:
+                    pass
+        return nxt
+
+    def _start_position(self) -> Tuple[int, int]:
+        indexes = self._segment_indexes()
+        if not indexes:
+            return (0, _HEADER_SIZE)
+        if self.start_at == "latest":
+            seg = self._open_segment(indexes[-1])
+            return (indexes[-1], seg.committed() if seg else _HEADER_SIZE)
+        return (indexes[0], _HEADER_SIZE)
+
+    def _read_next(self, receiver_id: int) -> Tuple[int, Any] | None:
+        """
+        Return (sender_id, payload) at the receiver's position, advancing it.
+        """
+        if receiver_id not in self._offsets:
+            self._offsets[receiver_id] = self._start_position()
+        index, offset = self._offsets[receiver_id]
+
+        while True:
+            seg = self._open_segment(index)
+            if seg is None:
+                # Segment was removed by retention: skip to the oldest kept one
+                indexes = [i for i in self._segment_indexes() if i > index]
+                if not indexes:
+                    return None
+                index, offset = indexes[0], _HEADER_SIZE
+                continue
+
+            if offset < seg.committed():
+                length, sender_id = _RECORD.unpack_from(seg.map, offset)
+                start = offset + _RECORD.size
+                payload = pickle.loads(seg.map[start : start + length])
+                self._offsets[receiver_id] = (index, start + length)
+                return sender_id, payload
+
+            if not seg.sealed():
+                self._offsets[receiver_id] = (index, offset)
+                return None
+
+            # Reached the end of a sealed segment
+            if index != self._write_index:
+                self._drop_segment(index)
+            index, offset = index + 1, _HEADER_SIZE
+
+    # ------------------------------------------------------------------ #
+    # Public API                                                         #
+    # ------------------------------------------------------------------ #
+
+    def send_message(self, sender_id: int, payload: Any) -> bool:
+        """
+        Append a message to the log if the sender is authorized.
+        """
+        if not self.security_manager.validate_sender(
+            channel_name=self.name,
+            sender_id=sender_id,
+            allowed_senders=self.allowed_senders,
+        ):
+            return False
+
+        try:
+            data = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+            needed = _RECORD.size + len(data)
+            if _HEADER_SIZE + needed > self.segment_size:
+                self.logger.error(
+                    f"[MmapLog:{self.name}] Message of {len(data)} bytes exceeds "
+                    f"segment size {self.segment_size}"
+                )
+                return False
+
+            with self._lock, self._writer_lock():
+                seg = self._current_write_segment()
+                offset = seg.committed()
+                if offset + needed > seg.size:
+                    seg = self._roll_over(seg)
+                    offset = seg.committed()
+
+                _RECORD.pack_into(seg.map, offset, len(data), sender_id)
+                start = offset + _RECORD.size
+                seg.map[start : start + len(data)] = data
+                # Publish only after the record is complete
+                seg.commit(offset + needed)
+
+            self.logger.info(
+                f"[MmapLog:{self.name}] Sender {sender_id} -> appended payload: {payload!r}"
+            )
+            return True
+        except Exception as exc:
+            self.logger.error(
+                f"[MmapLog:{self.name}] Failed to append from {sender_id}: {exc!r}"
+            )
+            return False
+
+    def receive_message(
+        self,
+        receiver_id: int,
+        block: bool = False,
+        timeout: float | None = None,
+    ) -> Any | None:
+        """
+        Read the next message at this receiver's position.
+
+        If block=False and the receiver is caught up, returns None.
+        """
+        if not self.security_manager.validate_receiver(
+            channel_name=self.name,
+            receiver_id=receiver_id,
+            allowed_receivers=self.allowed_receivers,
+        ):
+            return None
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while True:
+                with self._lock:
+                    record = self._read_next(receiver_id)
+                if record is not None:
+                    sender_id, msg = record
+                    self.logger.info(
+                        f"[MmapLog:{self.name}] Receiver {receiver_id} <- read payload "
+                        f"from {sender_id}: {msg!r}"
+                    )
+                    return msg
+                if not block or (deadline is not None and time.monotonic() >= deadline):
+                    return None
+                time.sleep(_POLL_INTERVAL)
+        except Exception as exc:
+            self.logger.error(
+                f"[MmapLog:{self.name}] Failed to read for {receiver_id}: {exc!r}"
+            )
+            return None
+
+    def tell(self, receiver_id: int) -> Tuple[int, int]:
+        """
+        Current (segment index, offset) of a receiver. Persist this to resume
+        after a restart.
+        """
+        with self._lock:
+            if receiver_id not in self._offsets:
+                self._offsets[receiver_id] = self._start_position()
+            return self._offsets[receiver_id]
+
+    def seek(self, receiver_id: int, position: Tuple[int, int] | None) -> None:
+        """
+        Move a receiver to a position returned by tell().
+        None resets it to the channel's start_at position.
+        """
+        with self._lock:
+            if position is None:
+                self._offsets.pop(receiver_id, None)
+            else:
+                self._offsets[receiver_id] = (int(position[0]), int(position[1]))
+
+    def flush(self) -> None:
+        """
+        Force written segments to disk (msync). Not needed for crash safety
+        of the process, only for surviving a host crash.
+        """
+        with self._lock:
+            seg = self._current_write_segment()
+            seg.map.flush()
+
+    def close(self, remove_files: bool = False) -> None:
+        """
+        Unmap all segments. Log files are kept unless remove_files=True.
+        """
+        with self._lock:
+            for index in list(self._segments):
+                self._drop_segment(index)
+            if self._lock_pid == os.getpid():
+                os.close(self._lock_fd)
+                self._lock_pid = 0
+
+            if remove_files:
+                for index in self._segment_indexes():
+                    try:
+                        os.remove(self._segment_path(index))
+                    except OSError:
+                        pass
+                try:
+                    os.remove(self._lock_path)
+                except OSError:
+                    pass
+
+        self.logger.info(f"[MmapLog:{self.name}] Channel closed (id={self.channel_id})")
@@ -0,0 +1,283 @@
+# ipc_project/core/channels/ndarray_channel.py
+
+from __future__ import annotations
+
+import struct
+from multiprocessing import Lock
+from typing import Any, List
+
+from core.utils.logger import AppLogger
+from core.security import SecurityManager
+from core.utils.shm_registry import create_segment, release_segment
+
+try:  # NumPy is optional: only this channel needs it
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on environment
+    np = None
+
+
+# Ring control block: write index, read index (monotonic counters)
+_CONTROL = struct.Struct("<QQ")
+
+# Per-slot header: nbytes, dtype string, ndim, shape[MAX_NDIM], strides[MAX_NDIM]
+MAX_NDIM = 8
+_SLOT_HEADER = struct.Struct(f"<Q16sB7x{MAX_NDIM}q{MAX_NDIM}q")
+
+# Keep array data cache-line aligned inside each slot
+_ALIGN = 64
+
+
+def _align(value: int) -> int:
+    return (value + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class NdArrayChannel:
+    """
+    Shared memory ring buffer for NumPy arrays.
+
+    - Each slot holds a small header (dtype, shape, strides) followed by
+      the raw array bytes.
+    - The receiver gets an np.ndarray view straight onto the slot, so no
+      pickling and no copy happen on the receive side.
+    - A view stays valid until the same receiver calls read_array() again
+      or release(); after that the writer may reuse the slot.
+    - Single consumer: the read index is shared by all receivers.
+    """
+
+    def __init__(
+        self,
+        channel_id: int,
+        name: str,
+        allowed_senders: List[int],
+        allowed_receivers: List[int],
+        logger: AppLogger,
+        security_manager: SecurityManager,
+        slot_size: int = 1 << 20,
+        slots: int = 4,
+    ) -> None:
+        if np is None:
+            raise ImportError("NdArrayChannel requires numpy")
+        if slots < 2:
+            raise ValueError("NdArrayChannel needs at least 2 slots")
+
+        self.channel_id = channel_id
+        self.name = name
+        self.allowed_senders = allowed_senders
+        self.allowed_receivers = allowed_receivers
+        self.logger = logger
+        self.security_manager = security_manager
+        self.slots = slots
+
+        self._data_offset = _align(_SLOT_HEADER.size)
+        self.slot_size = _align(self._data_offset + slot_size)
+        self.max_nbytes = self.slot_size - self._data_offset
+        self._ring_offset = _align(_CONTROL.size)
+        self.buffer_size = self._ring_offset + self.slot_size * self.slots
+
+        self._lock = Lock()
+        self._shm = create_segment(self.buffer_size, kind="ndarray")
+        _CONTROL.pack_into(self._shm.buf, 0, 0, 0)
+
+        # Slot handed out to the local receiver and not yet released
+        self._held = False
+
+        self.logger.info(
+            f"[NDArray:{self.name}] Shared memory created "
+            f"(id={self.channel_id}, slots={self.slots}, slot_bytes={self.max_nbytes})"
+        )
+
+    # ------------------------------------------------------------------ #
+    # Internal helpers                                                   #
+    # ------------------------------------------------------------------ #
+
+    def _slot_offset(self, index: int) -> int:
+        return self._ring_offset + (index % self.slots) * self.slot_size
+
+    def _release_held(self) -> None:
+        """
+        Advance the shared read index past the slot held by this process.
+        Caller must hold the lock.
+        """
+        if not self._held:
+            return
+        write_idx, read_idx = _CONTROL.unpack_from(self._shm.buf, 0)
+        _CONTROL.pack_into(self._shm.buf, 0, write_idx, read_idx + 1)
+        self._held = False
+
+    # ------------------------------------------------------------------ #
+    # Public API                                                         #
+    # ------------------------------------------------------------------ #
+
+    def write_array(self, sender_id: int, array: Any) -> bool:
+        """
+        Copy an array into the next free slot.
+
+        C- and Fortran-contiguous arrays keep their strides; anything else
+        is laid out C-contiguous in the slot. Either way the data is copied
+        once, straight from the array into shared memory.
+
+        Returns False if blocked, the ring is full or the array does not fit.
+        """
+        if not self.security_manager.validate_sender(
+            channel_name=self.name,
+            sender_id=sender_id,
+            allowed_senders=self.allowed_senders,
+        ):
+            return False
+
+        arr = np.asarray(array)
+        if arr.dtype.hasobject:
+            self.logger.error(
+                f"[NDArray:{self.name}] Object arrays cannot be shared (sender {sender_id})"
+            )
+            return False
+        if arr.dtype.fields is not None or np.dtype(arr.dtype.str) != arr.dtype:
+            # The header keeps only dtype.str, which loses field layouts
+            self.logger.error(
+                f"[NDArray:{self.name}] dtype {arr.dtype} cannot be described in the slot "
+                f"header (structured dtypes are not supported, sender {sender_id})"
+            )
+            return False
+        if arr.ndim > MAX_NDIM:
+            self.logger.error(
+                f"[NDArray:{self.name}] Array has {arr.ndim} dims, max is {MAX_NDIM}"
+            )
+            return False
+        if arr.nbytes > self.max_nbytes:
+            self.logger.error(
+                f"[NDArray:{self.name}] Array of {arr.nbytes} bytes exceeds slot size "
+                f"{self.max_nbytes}"
+            )
+            return False
+
+        dtype_str = arr.dtype.str.encode("ascii")
+        shape = tuple(arr.shape) + (0,) * (MAX_NDIM - arr.ndim)
+        # None lets np.ndarray() pick C-contiguous strides for the slot
+        layout = arr.strides if arr.flags.c_contiguous or arr.flags.f_contiguous else None
+
+        try:
+            with self._lock:
+                buf = self._shm.buf
+                write_idx, read_idx = _CONTROL.unpack_from(buf, 0)
+                if write_idx - read_idx >= self.slots:
+                    self.logger.warning(
+                        f"[NDArray:{self.name}] Ring full, sender {sender_id} must retry"
+                    )
+                    return False
+
+                offset = self._slot_offset(write_idx)
+                slot = np.ndarray(
+                    shape=arr.shape,
+                    dtype=arr.dtype,
+                    buffer=buf,
+                    offset=offset + self._data_offset,
+                    strides=layout,
+                )
+                np.copyto(slot, arr, casting="no")
+                strides = tuple(slot.strides) + (0,) * (MAX_NDIM - arr.ndim)
+                # Drop the export now: close() cannot release a buffer with views
+                del slot
+                _SLOT_HEADER.pack_into(
+                    buf, offset, arr.nbytes, dtype_str, arr.ndim, *shape, *strides
+                )
+                _CONTROL.pack_into(buf, 0, write_idx + 1, read_idx)
+
+            self.logger.info(
+                f"[NDArray:{self.name}] Sender {sender_id} -> wrote array "
+                f"shape={arr.shape} dtype={arr.dtype}"
+            )
+            return True
+        except Exception as exc:
+            self.logger.error(
+                f"[NDArray:{self.name}] Failed to write from {sender_id}: {exc!r}"
+            )
+            return False
+
+    def read_array(self, receiver_id: int, copy: bool = False) -> Any | None:
+        """
+        Return the next array, or None if the ring is empty / unauthorized.
+
+        With copy=False (default) the result is a read-only view onto shared
+        memory that is valid until the next read_array() or release() call.
+        """
+        if not self.security_manager.validate_receiver(
+            channel_name=self.name,
+            receiver_id=receiver_id,
+            allowed_receivers=self.allowed_receivers,
+        ):
+            return None
+
+        try:
+            with self._lock:
+                self._release_held()
+                buf = self._shm.buf
+                write_idx, read_idx = _CONTROL.unpack_from(buf, 0)
+                if read_idx == write_idx:
+                    return None
+
+                offset = self._slot_offset(read_idx)
+                fields = _SLOT_HEADER.unpack_from(buf, offset)
+                self._held = True
+
+            nbytes, dtype_raw, ndim = fields[0], fields[1], fields[2]
+            shape = fields[3 : 3 + ndim]
+            strides = fields[3 + MAX_NDIM : 3 + MAX_NDIM + ndim]
+            dtype = np.dtype(dtype_raw.rstrip(b"\x00").decode("ascii"))
+
+            view = np.ndarray(
+                shape=shape,
+                dtype=dtype,
+                buffer=buf,
+                offset=offset + self._data_offset,
+                strides=strides,
+            )
+            view.flags.writeable = False
+
+            self.logger.info(
+                f"[NDArray:{self.name}] Receiver {receiver_id} <- read array "
+                f"shape={view.shape} dtype={view.dtype} ({nbytes} bytes)"
+            )
+            if copy:
+                result = view.copy()
+                self.release(receiver_id)
+                return result
+            return view
+        except Exception as exc:
+            self.logger.error(
+                f"[NDArray:{self.name}] Failed to read for {receiver_id}: {exc!r}"
+            )
+            return None
+
+    def release(self, receiver_id: int) -> None:
+        """
+        Hand the slot behind the last returned view back to the writer.
+        """
+        with self._lock:
+            self._release_held()
+
+    def pending(self) -> int:
+        """
+        Number of arrays written but not yet consumed.
+        """
+        with self._lock:
+            write_idx, read_idx = _CONTROL.unpack_from(self._shm.buf, 0)
+        return write_idx - read_idx
+
+    def close(self) -> None:
+        """
+        Close and unlink the shared memory block.
+
+        Views still referencing the buffer keep the mapping alive until they
+        are garbage collected.
+        """
+        try:
+            self._shm.close()
+        except Exception:
+            pass
+
+        try:
+            release_segment(self._shm)
+        except Exception:
+            pass
+
+        self.logger.info(f"[NDArray:{self.name}] Channel closed (id={self.channel_id})")
@@ -2,12 +2,34 @@
 
 from __future__ import annotations
 
-from multiprocessing import Pipe
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from multiprocessing import BoundedSemaphore, Pipe
 from multiprocessing.connection import Connection
-from typing import List, Any
+from multiprocessing.reduction import ForkingPickler
+from typing import Any, Callable, Deque, List, Tuple
 
 from core.utils.logger import AppLogger
 from core.security import SecurityManager
+from core.utils.journal import MessageJournal
+from core.utils.serializer import AdaptiveCompressor
+from core.utils.tracing import TraceEnvelope, Tracer
+
+
+# Every PipeChannel in this process, for the after-fork reset
+_channels: "weakref.WeakSet[PipeChannel]" = weakref.WeakSet()
+
+
+def _reset_channels_after_fork() -> None:
+    for channel in list(_channels):
+        channel._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_channels_after_fork)
 
 
 class PipeChannel:
@@ -18,6 +40,24 @@ class PipeChannel:
     For now we treat this as a one-directional pipe:
     - 'sender' writes on the send endpoint
     - 'receiver' reads on the receive endpoint
+
+    The reverse direction of the duplex pipe is exposed as a reply path
+    (send_reply / receive_reply) for request/response protocols.
+
+    Optional credit-based flow control (flow_control_credits=N): every
+    message in flight holds one credit, returned when the receiver reads
+    it. A sender without credit never blocks on the OS pipe buffer: by
+    default (block=False) the message goes to a bounded sender-side
+    overflow buffer (or is refused when that is full). Choose N so that N typical messages
+    fit in the OS pipe buffer (about 64 KB on Linux). Buffered messages
+    are sent by a drain thread in the sending process as soon as credits
+    come back, so a burst does not stall until the next send; on_writable
+    is called from that thread once the buffer is empty.
+
+    With a tracer, send/receive record security check, serialize,
+    transport and deserialize spans, and messages carry their trace id
+    in a TraceEnvelope. Set the tracer before the worker processes start:
+    both ends must agree on the wire format.
     """
 
     def __init__(
@@ -28,6 +68,12 @@ class PipeChannel:
         allowed_receivers: List[int],
         logger: AppLogger,
         security_manager: SecurityManager,
+        journal: MessageJournal | None = None,
+        compressor: AdaptiveCompressor | None = None,
+        flow_control_credits: int | None = None,
+        overflow_limit: int = 1024,
+        on_writable: Callable[["PipeChannel"], None] | None = None,
+        tracer: Tracer | None = None,
     ) -> None:
         self.channel_id = channel_id
         self.name = name
@@ -35,22 +81,330 @@ class PipeChannel:
         self.allowed_receivers = allowed_receivers
         self.logger = logger
         self.security_manager = security_manager
+        # Optional binary record of every message sent (post-mortems/replay)
+        self.journal = journal
+        # Optional compression of large payloads
+        self.compressor = compressor
+
+        # Flow control: shared credit pool plus a local overflow buffer
+        self._credits = (
+            BoundedSemaphore(flow_control_credits) if flow_control_credits else None
+        )
+        self.overflow_limit = overflow_limit
+        self.on_writable = on_writable
+        self._overflow: Deque[Tuple[int, Any]] = deque()
+        # Guards _overflow and the send end against the drain thread
+        self._send_lock = threading.RLock()
+        self._drainer: threading.Thread | None = None
+        self._closed = False
+        _channels.add(self)
+
+        # Optional timing spans for every send/receive
+        self.tracer = tracer
+        self._trace_category = f"pipe:{name}"
 
         # Create underlying pipe (unidirectional semantics)
         send_conn, recv_conn = Pipe(duplex=True)
         self._send_conn: Connection = send_conn
         self._recv_conn: Connection = recv_conn
+        # Set when a receive hits EOF: the other end is closed everywhere
+        self.peer_closed = False
+
+    # ------------------------------------------------------------------ #
+    # Internal helpers                                                    #
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def _wait_readable(conn: Connection, block: bool, timeout: float | None) -> bool:
+        if not block:
+            # Non-blocking receive (poll(None) would wait forever)
+            return conn.poll(timeout or 0.0)
+        # Blocking with optional timeout
+        return timeout is None or conn.poll(timeout=timeout)
+
+    def _recv_on(
+        self,
+        conn: Connection,
+        receiver_id: int,
+        block: bool,
+        timeout: float | None,
+        verb: str,
+        release_credit: bool = False,
+        default: Any = None,
+    ) -> Any | None:
+        try:
+            if not self._wait_readable(conn, block, timeout):
+                return default
+
+            msg = conn.recv()
+            if release_credit and self._credits is not None:
+                self._release_credit()
+            if self.compressor is not None:
+                msg = self.compressor.decode(msg)
+            self.logger.info(
+                f"[Pipe:{self.name}] Receiver {receiver_id} <- {verb} payload: {msg!r}"
+            )
+            return msg
+        except (EOFError, OSError) as exc:
+            if isinstance(exc, EOFError):
+                self.peer_closed = True
+            self.logger.error(
+                f"[Pipe:{self.name}] Failed to receive for {receiver_id}: {exc!r}"
+            )
+            return default
+
+    def _release_credit(self) -> None:
+        try:
+            self._credits.release()
+        except ValueError:
+            # More releases than acquires (e.g. after a reset); ignore
+            pass
+
+    def _transmit(self, sender_id: int, payload: Any) -> bool:
+        try:
+            self._send_conn.send(
+                payload if self.compressor is None else self.compressor.encode(payload)
+            )
+        except Exception as exc:
+            # Nothing was queued (also for unpicklable payloads): return the credit
+            if self._credits is not None:
+                self._release_credit()
+            self.logger.error(
+                f"[Pipe:{self.name}] Failed to send from {sender_id}: {exc!r}"
+            )
+            return False
+
+        if self.journal is not None:
+            self.journal.record(sender_id, payload)
+        self.logger.info(
+            f"[Pipe:{self.name}] Sender {sender_id} -> sent payload: {payload!r}"
+        )
+        return True
+
+    def _transmit_traced(self, sender_id: int, envelope: TraceEnvelope) -> bool:
+        tracer, category = self.tracer, self._trace_category
+        payload = envelope.payload
+        try:
+            t0 = time.perf_counter_ns()
+            if self.compressor is not None:
+                envelope.payload = self.compressor.encode(payload)
+            envelope.sent_ns = t0
+            # Same bytes Connection.send() would write, timed separately
+            data = ForkingPickler.dumps(envelope)
+            t1 = time.perf_counter_ns()
+            self._send_conn.send_bytes(data)
+            t2 = time.perf_counter_ns()
+        except Exception as exc:
+            # Nothing was queued (also for unpicklable payloads): return the credit
+            if self._credits is not None:
+                self._release_credit()
+            self.logger.error(
+                f"[Pipe:{self.name}] Failed to send from {sender_id}: {exc!r}"
+            )
+            return False
+
+        trace_id = envelope.trace_id
+        tracer.complete("serialize", category, t0, t1, trace_id, {"bytes": len(data)})
+        tracer.complete("transport", category, t1, t2, trace_id)
+        tracer.flow_start(category, t1, trace_id)
+        if self.journal is not None:
+            self.journal.record(sender_id, payload)
+        self.logger.info(
+            f"[Pipe:{self.name}] Sender {sender_id} -> sent payload: {payload!r}"
+        )
+        return True
+
+    def _send_authorized(
+        self,
+        sender_id: int,
+        payload: Any,
+        block: bool,
+        timeout: float | None,
+        transmit: Callable[[int, Any], bool],
+    ) -> bool:
+        if self._credits is None:
+            return transmit(sender_id, payload)
+
+        with self._send_lock:
+            # Keep FIFO order: buffered messages go first
+            self.flush_pending()
+            queued = bool(self._overflow)
+            if not queued and self._credits.acquire(False):
+                return transmit(sender_id, payload)
+
+        # Wait for a credit without the lock, so the drain thread and other
+        # senders are not held up meanwhile
+        if block and not queued and self._credits.acquire(True, timeout):
+            with self._send_lock:
+                if not self._overflow:
+                    return transmit(sender_id, payload)
+                # Others were buffered meanwhile; this message goes after them
+                self._release_credit()
+
+        with self._send_lock:
+            if len(self._overflow) < self.overflow_limit:
+                self._overflow.append((sender_id, payload))
+                self._start_drainer()
+                return True
+
+        self.logger.warning(
+            f"[Pipe:{self.name}] Sender {sender_id} would block: no credits, "
+            f"overflow buffer full ({self.overflow_limit})"
+        )
+        return False
+
+    def _start_drainer(self) -> None:
+        # Called with _send_lock held
+        if self._drainer is not None:
+            return
+        self._drainer = threading.Thread(
+            target=self._drain_overflow, name=f"pipe-drain-{self.name}", daemon=True
+        )
+        self._drainer.start()
+
+    def _drain_overflow(self) -> None:
+        """
+        Drain thread: send buffered messages as credits come back, then exit.
+        """
+        while True:
+            with self._send_lock:
+                if not self._overflow or self._closed:
+                    self._drainer = None
+                    return
+            # Wait outside the lock so senders are not held up meanwhile
+            if not self._credits.acquire(timeout=0.1):
+                continue
+            with self._send_lock:
+                if not self._overflow or self._closed:
+                    self._release_credit()
+                    self._drainer = None
+                    return
+                sender_id, payload = self._overflow.popleft()
+                transmit = self._transmit if self.tracer is None else self._transmit_traced
+                transmit(sender_id, payload)
+                if not self._overflow:
+                    self._notify_writable()
+
+    def _after_fork(self) -> None:
+        """
+        In a forked child: the parent's drain thread does not exist here
+        and may have held _send_lock at fork time, and its buffered
+        messages are the parent's to send.
+        """
+        self._send_lock = threading.RLock()
+        self._overflow = deque()
+        self._drainer = None
+
+    def _notify_writable(self) -> None:
+        if self.on_writable is None:
+            return
+        try:
+            self.on_writable(self)
+        except Exception as exc:
+            self.logger.error(f"[Pipe:{self.name}] on_writable callback failed: {exc!r}")
+
+    def _send_traced(
+        self,
+        sender_id: int,
+        payload: Any,
+        block: bool,
+        timeout: float | None,
+    ) -> bool:
+        tracer = self.tracer
+        t0 = time.perf_counter_ns()
+        allowed = self.security_manager.validate_sender(
+            channel_name=self.name,
+            sender_id=sender_id,
+            allowed_senders=self.allowed_senders,
+        )
+        t1 = time.perf_counter_ns()
+        trace_id = tracer.new_trace_id()
+        tracer.complete("security_check", self._trace_category, t0, t1, trace_id)
+        if not allowed:
+            return False
+
+        return self._send_authorized(
+            sender_id, TraceEnvelope(trace_id, 0, payload), block, timeout, self._transmit_traced
+        )
+
+    def _receive_traced(
+        self,
+        receiver_id: int,
+        block: bool,
+        timeout: float | None,
+        default: Any = None,
+    ) -> Any | None:
+        tracer, category = self.tracer, self._trace_category
+        t0 = time.perf_counter_ns()
+        allowed = self.security_manager.validate_receiver(
+            channel_name=self.name,
+            receiver_id=receiver_id,
+            allowed_receivers=self.allowed_receivers,
+        )
+        t1 = time.perf_counter_ns()
+        if not allowed:
+            tracer.complete("security_check", category, t0, t1)
+            return default
+
+        try:
+            if not self._wait_readable(self._recv_conn, block, timeout):
+                return default
+            t2 = time.perf_counter_ns()
+            data = self._recv_conn.recv_bytes()
+            t3 = time.perf_counter_ns()
+            if self._credits is not None:
+                self._release_credit()
+            msg = ForkingPickler.loads(data)
+            trace_id, sent_ns = 0, 0
+            if isinstance(msg, TraceEnvelope):
+                trace_id, sent_ns, msg = msg.trace_id, msg.sent_ns, msg.payload
+            if self.compressor is not None:
+                msg = self.compressor.decode(msg)
+            t4 = time.perf_counter_ns()
+        except (EOFError, OSError) as exc:
+            if isinstance(exc, EOFError):
+                self.peer_closed = True
+            self.logger.error(
+                f"[Pipe:{self.name}] Failed to receive for {receiver_id}: {exc!r}"
+            )
+            return default
+
+        tracer.complete("security_check", category, t0, t1, trace_id)
+        tracer.complete(
+            "transport", category, t2, t3, trace_id,
+            {"in_flight_us": (t3 - sent_ns) / 1000.0} if sent_ns else None,
+        )
+        tracer.flow_end(category, t2, trace_id)
+        tracer.complete("deserialize", category, t3, t4, trace_id)
+        self.logger.info(
+            f"[Pipe:{self.name}] Receiver {receiver_id} <- received payload: {msg!r}"
+        )
+        return msg
 
     # ------------------------------------------------------------------ #
     # Public API                                                          #
     # ------------------------------------------------------------------ #
 
-    def send_message(self, sender_id: int, payload: Any) -> bool:
+    def send_message(
+        self,
+        sender_id: int,
+        payload: Any,
+        block: bool = False,
+        timeout: float | None = None,
+    ) -> bool:
         """
         Send a message through the pipe if the sender is authorized.
 
         Returns True on success, False if blocked by security layer.
+
+        With flow control enabled, a message without a credit is buffered
+        locally if there is room (True) or refused as "would block"
+        (False). block=True first waits up to `timeout` for a credit
+        (unless earlier messages are still buffered).
         """
+        if self.tracer is not None:
+            return self._send_traced(sender_id, payload, block, timeout)
+
         if not self.security_manager.validate_sender(
             channel_name=self.name,
             sender_id=sender_id,
@@ -59,63 +413,128 @@ class PipeChannel:
             # Security manager already logged the violation
             return False
 
-        try:
-            self._send_conn.send(payload)
-            self.logger.info(
-                f"[Pipe:{self.name}] Sender {sender_id} -> sent payload: {payload!r}"
-            )
-            return True
-        except (EOFError, OSError) as exc:
-            self.logger.error(
-                f"[Pipe:{self.name}] Failed to send from {sender_id}: {exc!r}"
-            )
-            return False
+        return self._send_authorized(sender_id, payload, block, timeout, self._transmit)
+
+    def flush_pending(self) -> int:
+        """
+        Send buffered messages for which credits are available now.
+        Calls on_writable once the overflow buffer has drained. The drain
+        thread does this on its own; calling it is optional.
+
+        Returns the number of messages sent.
+        """
+        if self._credits is None or not self._overflow:
+            return 0
+
+        transmit = self._transmit if self.tracer is None else self._transmit_traced
+        sent = 0
+        with self._send_lock:
+            while self._overflow and self._credits.acquire(False):
+                sender_id, payload = self._overflow.popleft()
+                if transmit(sender_id, payload):
+                    sent += 1
+
+            if not self._overflow:
+                self._notify_writable()
+        return sent
+
+    def pending_count(self) -> int:
+        """
+        Messages waiting in the local overflow buffer.
+        """
+        return len(self._overflow)
 
     def receive_message(
         self,
         receiver_id: int,
         block: bool = True,
         timeout: float | None = None,
+        *,
+        default: Any = None,
     ) -> Any | None:
         """
         Receive a message through the pipe if the receiver is authorized.
 
         If block is False and no message is available, returns None.
         If block is True, waits (optionally with timeout) until a message arrives.
+        Without a message, returns `default` instead of None if given, so
+        a None payload can be told apart.
         """
+        if self.tracer is not None:
+            return self._receive_traced(receiver_id, block, timeout, default)
+
         if not self.security_manager.validate_receiver(
             channel_name=self.name,
             receiver_id=receiver_id,
             allowed_receivers=self.allowed_receivers,
         ):
             # Security manager already logged the violation
-            return None
+            return default
+
+        return self._recv_on(
+            self._recv_conn, receiver_id, block, timeout, "received",
+            release_credit=True, default=default,
+        )
+
+    def send_reply(self, sender_id: int, payload: Any) -> bool:
+        """
+        Send a message back from the receiving side to the sending side.
+        Only processes allowed to receive on this channel may reply.
+        """
+        if not self.security_manager.validate_sender(
+            channel_name=self.name,
+            sender_id=sender_id,
+            allowed_senders=self.allowed_receivers,
+        ):
+            return False
 
         try:
-            if not block:
-                # Non-blocking receive
-                if not self._recv_conn.poll(timeout=timeout):
-                    return None
-            else:
-                # Blocking with optional timeout
-                if timeout is not None and not self._recv_conn.poll(timeout=timeout):
-                    return None
-
-            msg = self._recv_conn.recv()
+            self._recv_conn.send(payload)
             self.logger.info(
-                f"[Pipe:{self.name}] Receiver {receiver_id} <- received payload: {msg!r}"
+                f"[Pipe:{self.name}] Receiver {sender_id} -> replied payload: {payload!r}"
             )
-            return msg
+            return True
         except (EOFError, OSError) as exc:
             self.logger.error(
-                f"[Pipe:{self.name}] Failed to receive for {receiver_id}: {exc!r}"
+                f"[Pipe:{self.name}] Failed to reply from {sender_id}: {exc!r}"
             )
+            return False
+
+    def receive_reply(
+        self,
+        receiver_id: int,
+        block: bool = True,
+        timeout: float | None = None,
+    ) -> Any | None:
+        """
+        Receive a reply on the sending side. Only processes allowed to send
+        on this channel may read replies.
+        """
+        if not self.security_manager.validate_receiver(
+            channel_name=self.name,
+            receiver_id=receiver_id,
+            allowed_receivers=self.allowed_senders,
+        ):
             return None
 
+        return self._recv_on(self._send_conn, receiver_id, block, timeout, "reply")
+
+    def compression_stats(self) -> dict | None:
+        """
+        Compression ratio and CPU time for this process, or None if disabled.
+        """
+        return None if self.compressor is None else self.compressor.stats()
+
     def close(self) -> None:
         """
         Close underlying pipe connections.
         """
+        with self._send_lock:
+            self._closed = True
+
+        if self.journal is not None:
+            self.journal.close()
+
         try:
             self._send_conn.close()
         except Exception:
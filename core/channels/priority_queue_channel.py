@@ -0,0 +1,260 @@
+# ipc_project/core/channels/priority_queue_channel.py
+
+from __future__ import annotations
+
+import time
+from multiprocessing import Queue
+from multiprocessing.connection import wait
+from queue import Empty
+from typing import Any, Dict, List
+
+from core.utils.logger import AppLogger
+from core.security import SecurityManager
+from core.utils.expiry import DeadlineEnvelope, ExpiryCounter, resolve_deadline
+
+
+class PriorityQueueChannel:
+    """
+    Multi-lane queue channel: one multiprocessing.Queue per priority lane.
+
+    - Lane 0 is the most urgent; send_message(..., priority=n) picks the lane.
+    - mode="strict": always drain the most urgent non-empty lane first.
+    - mode="weighted": smooth weighted round-robin across non-empty lanes,
+      so bulk lanes still make progress under sustained urgent traffic.
+    - Each message carries its enqueue time, so receivers can report
+      per-lane wait times alongside lane depth.
+    - Messages may carry a TTL/deadline (or get the channel's
+      default_ttl); expired ones are skipped at dequeue without being
+      unpickled and counted per lane and in the shared `expired` counter.
+    """
+
+    def __init__(
+        self,
+        channel_id: int,
+        name: str,
+        allowed_senders: List[int],
+        allowed_receivers: List[int],
+        logger: AppLogger,
+        security_manager: SecurityManager,
+        lanes: int = 3,
+        mode: str = "strict",
+        weights: List[int] | None = None,
+        default_priority: int | None = None,
+        default_ttl: float | None = None,
+    ) -> None:
+        if lanes < 1:
+            raise ValueError("PriorityQueueChannel needs at least one lane")
+        if mode not in ("strict", "weighted"):
+            raise ValueError("mode must be 'strict' or 'weighted'")
+        if weights is None:
+            # Each lane twice as important as the next one
+            weights = [2 ** (lanes - 1 - i) for i in range(lanes)]
+        if len(weights) != lanes or any(w <= 0 for w in weights):
+            raise ValueError("weights must be one positive number per lane")
+
+        self.channel_id = channel_id
+        self.name = name
+        self.allowed_senders = allowed_senders
+        self.allowed_receivers = allowed_receivers
+        self.logger = logger
+        self.security_manager = security_manager
+        self.lanes = lanes
+        self.mode = mode
+        self.weights = list(weights)
+        self.default_priority = lanes - 1 if default_priority is None else default_priority
+        self.default_ttl = default_ttl
+        self.expired = ExpiryCounter()
+
+        self._queues: List[Queue] = [Queue() for _ in range(lanes)]
+
+        # Smooth weighted round-robin state (receiver side)
+        self._current = [0] * lanes
+
+        # Metrics, per process
+        self._sent = [0] * lanes
+        self._received = [0] * lanes
+        self._wait_total = [0.0] * lanes
+        self._wait_max = [0.0] * lanes
+        self._expired = [0] * lanes
+
+    # ------------------------------------------------------------------ #
+    # Internal helpers                                                   #
+    # ------------------------------------------------------------------ #
+
+    def _lane_order(self) -> List[int]:
+        """
+        Lanes to try, best first, among those that look non-empty.
+        """
+        ready = [i for i, q in enumerate(self._queues) if not q.empty()]
+        if self.mode == "strict" or len(ready) <= 1:
+            return ready
+
+        total = 0
+        for i in ready:
+            self._current[i] += self.weights[i]
+            total += self.weights[i]
+        best = max(ready, key=lambda i: self._current[i])
+        self._current[best] -= total
+        return [best] + [i for i in ready if i != best]
+
+    def _try_dequeue(self) -> tuple | None:
+        skipped = 0
+        try:
+            for lane in self._lane_order():
+                while True:
+                    try:
+                        enqueued_at, payload = self._queues[lane].get_nowait()
+                    except Empty:
+                        # Lane empty, or another consumer got there first
+                        break
+                    now = time.monotonic()
+                    if isinstance(payload, DeadlineEnvelope):
+                        if payload.deadline <= now:
+                            # Skip the whole stale run of this lane
+                            skipped += 1
+                            self._expired[lane] += 1
+                            continue
+                        payload = payload.unwrap()
+                    waited = now - enqueued_at
+                    self._received[lane] += 1
+                    self._wait_total[lane] += waited
+                    self._wait_max[lane] = max(self._wait_max[lane], waited)
+                    return lane, payload
+            return None
+        finally:
+            if skipped:
+                self.expired.add(skipped)
+                self.logger.warning(f"[PQueue:{self.name}] Dropped {skipped} expired message(s)")
+
+    # ------------------------------------------------------------------ #
+    # Public API                                                         #
+    # ------------------------------------------------------------------ #
+
+    def send_message(
+        self,
+        sender_id: int,
+        payload: Any,
+        priority: int | None = None,
+        ttl: float | None = None,
+        deadline: float | None = None,
+    ) -> bool:
+        """
+        Enqueue a message on the lane for `priority` (0 = most urgent).
+        Out-of-range priorities are clamped to the nearest lane.
+
+        ttl (seconds from now) or deadline (time.monotonic() value) makes
+        the message expire; receivers never see it after that.
+        """
+        if not self.security_manager.validate_sender(
+            channel_name=self.name,
+            sender_id=sender_id,
+            allowed_senders=self.allowed_senders,
+        ):
+            return False
+
+        lane = self.default_priority if priority is None else priority
+        lane = min(max(lane, 0), self.lanes - 1)
+
+        try:
+            deadline = resolve_deadline(ttl, deadline, self.default_ttl)
+            item = payload if deadline is None else DeadlineEnvelope.wrap(payload, deadline)
+            self._queues[lane].put((time.monotonic(), item))
+            self._sent[lane] += 1
+            self.logger.info(
+                f"[PQueue:{self.name}] Sender {sender_id} -> enqueued on lane {lane}: {payload!r}"
+            )
+            return True
+        except Exception as exc:
+            self.logger.error(
+                f"[PQueue:{self.name}] Failed to enqueue from {sender_id}: {exc!r}"
+            )
+            return False
+
+    def receive_message(
+        self,
+        receiver_id: int,
+        block: bool = False,
+        timeout: float | None = None,
+    ) -> Any | None:
+        """
+        Dequeue the next message according to the lane policy.
+
+        If block=False and all lanes are empty, returns None.
+        """
+        if not self.security_manager.validate_receiver(
+            channel_name=self.name,
+            receiver_id=receiver_id,
+            allowed_receivers=self.allowed_receivers,
+        ):
+            return None
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while True:
+                item = self._try_dequeue()
+                if item is not None:
+                    lane, msg = item
+                    self.logger.info(
+                        f"[PQueue:{self.name}] Receiver {receiver_id} <- dequeued from "
+                        f"lane {lane}: {msg!r}"
+                    )
+                    return msg
+
+                if not block:
+                    return None
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                # Sleep until any lane's pipe has data
+                wait([q._reader for q in self._queues], remaining)
+        except Exception as exc:
+            self.logger.error(
+                f"[PQueue:{self.name}] Failed to dequeue for {receiver_id}: {exc!r}"
+            )
+            return None
+
+    def lane_stats(self) -> List[Dict[str, Any]]:
+        """
+        Per-lane depth (shared) and send/receive/wait/expiry metrics (this
+        process); expired_count() is the channel-wide total.
+        """
+        stats = []
+        for lane, q in enumerate(self._queues):
+            try:
+                depth = q.qsize()
+            except NotImplementedError:
+                # macOS has no sem_getvalue()
+                depth = None
+            received = self._received[lane]
+            stats.append(
+                {
+                    "lane": lane,
+                    "weight": self.weights[lane],
+                    "depth": depth,
+                    "sent": self._sent[lane],
+                    "received": received,
+                    "avg_wait_ms": self._wait_total[lane] / received * 1000 if received else 0.0,
+                    "max_wait_ms": self._wait_max[lane] * 1000,
+                    "expired": self._expired[lane],
+                }
+            )
+        return stats
+
+    def expired_count(self) -> int:
+        """
+        Messages dropped as expired so far, across all receiving processes.
+        """
+        return self.expired.value
+
+    def close(self) -> None:
+        """
+        Close all lane queues.
+        """
+        for q in self._queues:
+            try:
+                q.close()
+                q.join_thread()
+            except Exception:
+                pass
+
+        self.logger.info(f"[PQueue:{self.name}] Channel closed (id={self.channel_id})")
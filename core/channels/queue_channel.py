@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
+import time
 from multiprocessing import Queue
+from multiprocessing.reduction import ForkingPickler
 from queue import Empty
 from typing import Any, List
 
 from core.utils.logger import AppLogger
 from core.security import SecurityManager
+from core.utils.expiry import DeadlineEnvelope, ExpiryCounter, resolve_deadline
+from core.utils.journal import MessageJournal
+from core.utils.serializer import AdaptiveCompressor
+from core.utils.tracing import TraceEnvelope, Tracer
 
 
 class QueueChannel:
@@ -15,6 +21,19 @@ class QueueChannel:
     Wrapper over multiprocessing.Queue with security checks and logging.
 
     Supports multiple producers and consumers.
+
+    With a tracer, messages are pickled on the calling thread (instead of
+    the queue's feeder thread) so serialize, transport and deserialize
+    can be timed separately; each message carries its trace id in a
+    TraceEnvelope. Set the tracer before the worker processes start.
+
+    Messages can expire: send_message(..., ttl=s) or deadline=<monotonic
+    time>, or a channel-wide default_ttl. Expiring messages travel in a
+    DeadlineEnvelope; receivers drop expired ones without unpickling
+    them, skip a whole stale run in one go and count them in `expired`
+    (shared by all processes). After a stall the consumer therefore
+    catches up in time proportional to the backlog's envelope count, not
+    its payload work, and only sees messages someone still wants.
     """
 
     def __init__(
@@ -25,6 +44,10 @@ class QueueChannel:
         allowed_receivers: List[int],
         logger: AppLogger,
         security_manager: SecurityManager,
+        journal: MessageJournal | None = None,
+        compressor: AdaptiveCompressor | None = None,
+        tracer: Tracer | None = None,
+        default_ttl: float | None = None,
     ) -> None:
         self.channel_id = channel_id
         self.name = name
@@ -32,17 +55,165 @@ class QueueChannel:
         self.allowed_receivers = allowed_receivers
         self.logger = logger
         self.security_manager = security_manager
+        # Optional binary record of every message sent (post-mortems/replay)
+        self.journal = journal
+        # Optional compression of large payloads
+        self.compressor = compressor
+        # Optional timing spans for every send/receive
+        self.tracer = tracer
+        self._trace_category = f"queue:{name}"
+        # Seconds a message stays deliverable unless the sender says otherwise
+        self.default_ttl = default_ttl
+        self.expired = ExpiryCounter()
 
         self._queue: Queue[Any] = Queue()
 
+    # ------------------------------------------------------------------ #
+    # Internal helpers                                                    #
+    # ------------------------------------------------------------------ #
+
+    def _get(self, block: bool, timeout: float | None) -> tuple:
+        """
+        Next message that has not expired, as (item, wrapped); a wrapped
+        item is still the sender's pickled bytes. Raises Empty like
+        Queue.get().
+        """
+        end = None if not block or timeout is None else time.monotonic() + timeout
+        skipped = 0
+        try:
+            while True:
+                if not block:
+                    item = self._queue.get_nowait()
+                elif end is None:
+                    item = self._queue.get()
+                else:
+                    item = self._queue.get(timeout=max(0.0, end - time.monotonic()))
+                if not isinstance(item, DeadlineEnvelope):
+                    return item, False
+                if item.deadline > time.monotonic():
+                    return item.data, True
+                skipped += 1
+        finally:
+            if skipped:
+                # One count and one log line per stale run, not per message
+                self.expired.add(skipped)
+                self.logger.warning(f"[Queue:{self.name}] Dropped {skipped} expired message(s)")
+
+    def _send_traced(
+        self,
+        sender_id: int,
+        payload: Any,
+        ttl: float | None,
+        deadline: float | None,
+    ) -> bool:
+        tracer, category = self.tracer, self._trace_category
+        t0 = time.perf_counter_ns()
+        allowed = self.security_manager.validate_sender(
+            channel_name=self.name,
+            sender_id=sender_id,
+            allowed_senders=self.allowed_senders,
+        )
+        t1 = time.perf_counter_ns()
+        trace_id = tracer.new_trace_id()
+        tracer.complete("security_check", category, t0, t1, trace_id)
+        if not allowed:
+            return False
+
+        try:
+            wire = payload if self.compressor is None else self.compressor.encode(payload)
+            data = bytes(ForkingPickler.dumps(TraceEnvelope(trace_id, t1, wire)))
+            deadline = resolve_deadline(ttl, deadline, self.default_ttl)
+            t2 = time.perf_counter_ns()
+            # data is already pickled, so it can go into the envelope as is
+            self._queue.put(data if deadline is None else DeadlineEnvelope(deadline, data))
+            t3 = time.perf_counter_ns()
+        except Exception as exc:
+            self.logger.error(
+                f"[Queue:{self.name}] Failed to enqueue from {sender_id}: {exc!r}"
+            )
+            return False
+
+        tracer.complete("serialize", category, t1, t2, trace_id, {"bytes": len(data)})
+        tracer.complete("transport", category, t2, t3, trace_id)
+        tracer.flow_start(category, t2, trace_id)
+        if self.journal is not None:
+            self.journal.record(sender_id, payload)
+        self.logger.info(
+            f"[Queue:{self.name}] Sender {sender_id} -> enqueued payload: {payload!r}"
+        )
+        return True
+
+    def _receive_traced(
+        self,
+        receiver_id: int,
+        block: bool,
+        timeout: float | None,
+        default: Any = None,
+    ) -> Any | None:
+        tracer, category = self.tracer, self._trace_category
+        t0 = time.perf_counter_ns()
+        allowed = self.security_manager.validate_receiver(
+            channel_name=self.name,
+            receiver_id=receiver_id,
+            allowed_receivers=self.allowed_receivers,
+        )
+        t1 = time.perf_counter_ns()
+        if not allowed:
+            tracer.complete("security_check", category, t0, t1)
+            return default
+
+        try:
+            data, _wrapped = self._get(block, timeout)
+            t2 = time.perf_counter_ns()
+            msg = ForkingPickler.loads(data)
+            trace_id, sent_ns = 0, 0
+            if isinstance(msg, TraceEnvelope):
+                trace_id, sent_ns, msg = msg.trace_id, msg.sent_ns, msg.payload
+            if self.compressor is not None:
+                msg = self.compressor.decode(msg)
+            t3 = time.perf_counter_ns()
+        except Empty:
+            return default
+        except Exception as exc:
+            self.logger.error(
+                f"[Queue:{self.name}] Failed to dequeue for {receiver_id}: {exc!r}"
+            )
+            return default
+
+        tracer.complete("security_check", category, t0, t1, trace_id)
+        # Queue.get() unpickles the outer bytes object; the time spent
+        # waiting in the queue is reported as in_flight_us
+        tracer.complete(
+            "transport", category, t1, t2, trace_id,
+            {"in_flight_us": (t2 - sent_ns) / 1000.0} if sent_ns else None,
+        )
+        tracer.flow_end(category, t1, trace_id)
+        tracer.complete("deserialize", category, t2, t3, trace_id)
+        self.logger.info(
+            f"[Queue:{self.name}] Receiver {receiver_id} <- dequeued payload: {msg!r}"
+        )
+        return msg
+
     # ------------------------------------------------------------------ #
     # Public API                                                          #
     # ------------------------------------------------------------------ #
 
-    def send_message(self, sender_id: int, payload: Any) -> bool:
+    def send_message(
+        self,
+        sender_id: int,
+        payload: Any,
+        ttl: float | None = None,
+        deadline: float | None = None,
+    ) -> bool:
         """
         Enqueue a message if the sender is authorized.
+
+        ttl (seconds from now) or deadline (time.monotonic() value) makes
+        the message expire; receivers never see it after that.
         """
+        if self.tracer is not None:
+            return self._send_traced(sender_id, payload, ttl, deadline)
+
         if not self.security_manager.validate_sender(
             channel_name=self.name,
             sender_id=sender_id,
@@ -51,7 +222,11 @@ class QueueChannel:
             return False
 
         try:
-            self._queue.put(payload)
+            wire = payload if self.compressor is None else self.compressor.encode(payload)
+            deadline = resolve_deadline(ttl, deadline, self.default_ttl)
+            self._queue.put(wire if deadline is None else DeadlineEnvelope.wrap(wire, deadline))
+            if self.journal is not None:
+                self.journal.record(sender_id, payload)
             self.logger.info(
                 f"[Queue:{self.name}] Sender {sender_id} -> enqueued payload: {payload!r}"
             )
@@ -67,24 +242,32 @@ class QueueChannel:
         receiver_id: int,
         block: bool = False,
         timeout: float | None = None,
+        *,
+        default: Any = None,
     ) -> Any | None:
         """
         Dequeue a message if the receiver is authorized.
 
-        If block=False and queue is empty, returns None.
+        If block=False and queue is empty, returns None (or `default`, so
+        a None payload can be told apart). Expired messages are skipped
+        (see `expired`).
         """
+        if self.tracer is not None:
+            return self._receive_traced(receiver_id, block, timeout, default)
+
         if not self.security_manager.validate_receiver(
             channel_name=self.name,
             receiver_id=receiver_id,
             allowed_receivers=self.allowed_receivers,
         ):
-            return None
+            return default
 
         try:
-            if block:
-                msg = self._queue.get(timeout=timeout) if timeout is not None else self._queue.get()
-            else:
-                msg = self._queue.get_nowait()
+            msg, wrapped = self._get(block, timeout)
+            if wrapped:
+                msg = ForkingPickler.loads(msg)
+            if self.compressor is not None:
+                msg = self.compressor.decode(msg)
 
             self.logger.info(
                 f"[Queue:{self.name}] Receiver {receiver_id} <- dequeued payload: {msg!r}"
@@ -92,17 +275,32 @@ class QueueChannel:
             return msg
         except Empty:
             # No message available
-            return None
+            return default
         except Exception as exc:
             self.logger.error(
                 f"[Queue:{self.name}] Failed to dequeue for {receiver_id}: {exc!r}"
             )
-            return None
+            return default
+
+    def expired_count(self) -> int:
+        """
+        Messages dropped as expired so far, across all receiving processes.
+        """
+        return self.expired.value
+
+    def compression_stats(self) -> dict | None:
+        """
+        Compression ratio and CPU time for this process, or None if disabled.
+        """
+        return None if self.compressor is None else self.compressor.stats()
 
     def close(self) -> None:
         """
         Close underlying queue.
         """
+        if self.journal is not None:
+            self.journal.close()
+
         try:
             self._queue.close()
             self._queue.join_thread()
@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
-from multiprocessing import shared_memory, Lock
+import time
+from multiprocessing import Lock, Value
 from typing import List, Any
 
 from core.utils.logger import AppLogger
 from core.security import SecurityManager
+from core.utils.notifier import WakeupNotifier
+from core.utils.shm_registry import create_segment, release_segment
 
 
 class SharedMemoryChannel:
@@ -16,6 +19,13 @@ class SharedMemoryChannel:
     - Uses a fixed-size byte buffer.
     - Stores UTF-8 encoded text (truncated if too long).
     - Uses a Lock to provide safe, atomic read/write.
+    - Keeps a write counter so readers can detect updates cheaply.
+    - Optionally (notify_readers=N) keeps N wakeup notifiers (eventfd, or
+      a pipe) that every write signals, so readers can block in
+      wait_for_update() or register notifier(i).fileno() with a selector
+      or event loop instead of polling. Give each concurrently waiting
+      reader its own index: readers sharing one can clear each other's
+      wakeups.
     """
 
     def __init__(
@@ -27,6 +37,7 @@ class SharedMemoryChannel:
         logger: AppLogger,
         security_manager: SecurityManager,
         buffer_size: int = 256,
+        notify_readers: int = 0,
     ) -> None:
         self.channel_id = channel_id
         self.name = name
@@ -37,9 +48,13 @@ class SharedMemoryChannel:
         self.buffer_size = buffer_size
 
         self._lock = Lock()
+        # Incremented on every write; guarded by self._lock
+        self._version = Value("Q", 0, lock=False)
         # Create a new shared memory block
-        self._shm = shared_memory.SharedMemory(create=True, size=self.buffer_size)
+        self._shm = create_segment(self.buffer_size, kind="shared_memory")
         self._clear_buffer()
+        # Created before any worker forks, so every process shares them
+        self._notifiers = [WakeupNotifier() for _ in range(notify_readers)]
 
         self.logger.info(
             f"[SHM:{self.name}] Shared memory created (id={self.channel_id}, size={self.buffer_size})"
@@ -85,6 +100,10 @@ class SharedMemoryChannel:
                 buf[:] = b"\x00" * self.buffer_size
                 # Write data
                 buf[: len(encoded)] = encoded
+                self._version.value += 1
+            # After the lock: a woken reader must see the new version
+            for notifier in self._notifiers:
+                notifier.signal()
 
             self.logger.info(
                 f"[SHM:{self.name}] Sender {sender_id} -> wrote value: {text!r}"
@@ -96,12 +115,61 @@ class SharedMemoryChannel:
             )
             return False
 
+    def version(self) -> int:
+        """
+        Number of writes so far. No security check or logging, meant for
+        change detection before calling read_value().
+        """
+        return self._version.value
+
+    def notifier(self, index: int = 0) -> WakeupNotifier | None:
+        """
+        Wakeup notifier `index`, or None if the channel has none.
+        """
+        if index < len(self._notifiers):
+            return self._notifiers[index]
+        return None
+
+    def wait_for_update(
+        self,
+        last_version: int,
+        timeout: float | None = None,
+        index: int = 0,
+    ) -> int:
+        """
+        Block until version() differs from `last_version` or `timeout`
+        seconds pass; returns the current version either way. Sleeps on
+        notifier `index`, so the channel needs notify_readers > index.
+        """
+        notifier = self.notifier(index)
+        if notifier is None:
+            raise ValueError(f"channel '{self.name}' has no notifier {index}")
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            # Clear before checking, so a write in between stays signalled
+            notifier.clear()
+            version = self._version.value
+            if version != last_version:
+                return version
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return version
+            notifier.wait(remaining)
+
     def read_value(self, receiver_id: int) -> str | None:
         """
         Read the current string value from shared memory.
 
         Returns the string or None on error / unauthorized.
         """
+        read = self.read_versioned(receiver_id)
+        return None if read is None else read[1]
+
+    def read_versioned(self, receiver_id: int) -> tuple[int, str] | None:
+        """
+        Like read_value(), but returns (version, value) taken under the
+        same lock, so the value is exactly the one written by that version.
+        """
         if not self.security_manager.validate_receiver(
             channel_name=self.name,
             receiver_id=receiver_id,
@@ -114,6 +182,7 @@ class SharedMemoryChannel:
                 buf = self._shm.buf
                 # Read up to first null byte
                 raw = bytes(buf[:])
+                version = self._version.value
             # split at first null
             if b"\x00" in raw:
                 raw = raw.split(b"\x00", 1)[0]
@@ -126,7 +195,7 @@ class SharedMemoryChannel:
             self.logger.info(
                 f"[SHM:{self.name}] Receiver {receiver_id} <- read value: {value!r}"
             )
-            return value
+            return version, value
         except Exception as exc:
             self.logger.error(
                 f"[SHM:{self.name}] Failed to read for {receiver_id}: {exc!r}"
@@ -143,8 +212,11 @@ class SharedMemoryChannel:
             pass
 
         try:
-            self._shm.unlink()
+            release_segment(self._shm)
         except Exception:
             pass
 
+        for notifier in self._notifiers:
+            notifier.close()
+
         self.logger.info(f"[SHM:{self.name}] Channel closed (id={self.channel_id})")
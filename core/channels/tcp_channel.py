@@ -0,0 +1,554 @@
+# ipc_project/core/channels/tcp_channel.py
+
+from __future__ import annotations
+
+import hmac
+import ipaddress
+import itertools
+import os
+import pickle
+import socket
+import struct
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Tuple
+
+from core.utils.logger import AppLogger
+from core.security import SecurityManager
+
+# Frame: 4-byte big-endian length, then a pickled list of operations.
+# Every frame carries a batch; a single op is just a batch of one.
+_FRAME = struct.Struct("!I")
+PICKLE_PROTOCOL = 5
+
+# Connection handshake (as in multiprocessing.connection): each side
+# proves it knows the shared authkey by answering a random challenge
+# with an HMAC, before any pickle is read from the peer
+AUTHKEY_ENV = "IPC_NODE_AUTHKEY"
+_CHALLENGE = b"#CHALLENGE#"
+_WELCOME = b"#WELCOME#"
+_FAILURE = b"#FAILURE#"
+_NONCE_SIZE = 32
+_MAX_HANDSHAKE = 256
+HANDSHAKE_TIMEOUT = 5.0
+
+Address = Tuple[str, int]
+
+
+class RemoteError(RuntimeError):
+    """
+    The node agent rejected or failed a request.
+    """
+
+
+class AuthenticationError(ConnectionError):
+    """
+    The peer did not prove knowledge of the authkey.
+    """
+
+
+def _authkey_from_env() -> bytes | None:
+    value = os.environ.get(AUTHKEY_ENV)
+    return value.encode("utf-8") if value else None
+
+
+# Cluster-wide key used by connections and agents that are not given one;
+# inherited by forked workers
+_authkey: bytes | None = _authkey_from_env()
+
+
+def set_authkey(authkey: bytes | None) -> None:
+    """
+    Key for node connections made from this process (and processes
+    forked after the call). Defaults to $IPC_NODE_AUTHKEY.
+    """
+    global _authkey
+    _authkey = authkey
+
+
+def get_authkey() -> bytes | None:
+    return _authkey
+
+
+def is_loopback(host: str) -> bool:
+    """
+    True if `host` (name or address) only accepts local connections.
+    """
+    try:
+        return ipaddress.ip_address(socket.gethostbyname(host)).is_loopback if host else False
+    except (OSError, ValueError):
+        return False
+
+
+def parse_address(address) -> Address:
+    """
+    "host:port" or (host, port) -> (host, port).
+    """
+    if isinstance(address, str):
+        host, _, port = address.rpartition(":")
+        return host or "127.0.0.1", int(port)
+    host, port = address
+    return host, int(port)
+
+
+def tune_socket(sock: socket.socket) -> None:
+    # Batching happens in user space; Nagle would only add latency
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+
+def send_frame(sock: socket.socket, ops: List[Any]) -> None:
+    data = pickle.dumps(ops, protocol=PICKLE_PROTOCOL)
+    # Header and body as two iovecs, no concatenation
+    sent = sock.sendmsg([_FRAME.pack(len(data)), data])
+    if sent < _FRAME.size + len(data):
+        sock.sendall(memoryview(_FRAME.pack(len(data)) + data)[sent:])
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytearray:
+    buf = bytearray(size)
+    view = memoryview(buf)
+    got = 0
+    while got < size:
+        n = sock.recv_into(view[got:])
+        if n == 0:
+            raise EOFError("connection closed")
+        got += n
+    return buf
+
+
+def recv_frame(sock: socket.socket) -> List[Any]:
+    (size,) = _FRAME.unpack(_recv_exact(sock, _FRAME.size))
+    return pickle.loads(_recv_exact(sock, size))
+
+
+def _send_raw(sock: socket.socket, data: bytes) -> None:
+    sock.sendall(_FRAME.pack(len(data)) + data)
+
+
+def _recv_raw(sock: socket.socket) -> bytes:
+    (size,) = _FRAME.unpack(_recv_exact(sock, _FRAME.size))
+    if size > _MAX_HANDSHAKE:
+        raise AuthenticationError(f"handshake message too long ({size} bytes)")
+    return bytes(_recv_exact(sock, size))
+
+
+def _digest(authkey: bytes, nonce: bytes) -> bytes:
+    return hmac.new(authkey, nonce, "sha256").digest()
+
+
+def _deliver_challenge(sock: socket.socket, authkey: bytes) -> None:
+    nonce = os.urandom(_NONCE_SIZE)
+    _send_raw(sock, _CHALLENGE + nonce)
+    if hmac.compare_digest(_recv_raw(sock), _digest(authkey, nonce)):
+        _send_raw(sock, _WELCOME)
+        return
+    _send_raw(sock, _FAILURE)
+    raise AuthenticationError("digest received was wrong")
+
+
+def _answer_challenge(sock: socket.socket, authkey: bytes) -> None:
+    message = _recv_raw(sock)
+    if not message.startswith(_CHALLENGE):
+        raise AuthenticationError("expected a challenge")
+    _send_raw(sock, _digest(authkey, message[len(_CHALLENGE):]))
+    if _recv_raw(sock) != _WELCOME:
+        raise AuthenticationError("digest sent was rejected")
+
+
+def authenticate(sock: socket.socket, authkey: bytes | None, server: bool) -> None:
+    """
+    Mutual authkey handshake; both sides must use the same key (or both
+    none). Raises AuthenticationError, or OSError/EOFError on a broken
+    or timed-out connection.
+    """
+    if authkey is None:
+        return
+    sock.settimeout(HANDSHAKE_TIMEOUT)
+    if server:
+        _deliver_challenge(sock, authkey)
+        _answer_challenge(sock, authkey)
+    else:
+        _answer_challenge(sock, authkey)
+        _deliver_challenge(sock, authkey)
+    sock.settimeout(None)
+
+
+class _Waiter:
+    __slots__ = ("event", "ok", "result")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.ok = False
+        self.result: Any = None
+
+
+class NodeConnection:
+    """
+    One TCP connection from this process to a node agent, shared by every
+    channel and control call to that node.
+
+    - post() queues a one-way op; a flusher thread sends everything queued
+      within `linger` seconds (or as soon as `max_batch` ops pile up) as
+      one frame.
+    - call() queues a request, flushes immediately (so earlier posts go
+      first, keeping order) and waits for the reply, which a reader
+      thread matches by request id.
+    """
+
+    def __init__(
+        self,
+        address: Address,
+        linger: float = 0.0005,
+        max_batch: int = 256,
+        authkey: bytes | None = None,
+    ) -> None:
+        self.address = address
+        self.linger = linger
+        self.max_batch = max_batch
+
+        self._sock = socket.create_connection(address, timeout=5.0)
+        try:
+            authenticate(self._sock, authkey if authkey is not None else _authkey, server=False)
+        except (OSError, EOFError):
+            self._sock.close()
+            raise
+        self._sock.settimeout(None)
+        tune_socket(self._sock)
+
+        self._pending: List[Any] = []
+        self._cond = threading.Condition()
+        self._waiters: Dict[int, _Waiter] = {}
+        self._ids = itertools.count(1)
+        self.closed = False
+
+        self.frames_sent = 0
+        self.ops_sent = 0
+
+        threading.Thread(target=self._read_loop, name=f"tcp-read-{address}", daemon=True).start()
+        threading.Thread(target=self._flush_loop, name=f"tcp-flush-{address}", daemon=True).start()
+
+    # ------------------------------------------------------------------ #
+    # Internal helpers                                                   #
+    # ------------------------------------------------------------------ #
+
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        ops, self._pending = self._pending, []
+        send_frame(self._sock, ops)
+        self.frames_sent += 1
+        self.ops_sent += len(ops)
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self.closed:
+                    self._cond.wait()
+                if self.closed:
+                    return
+            # Let a burst of sends accumulate into one frame
+            time.sleep(self.linger)
+            with self._cond:
+                try:
+                    self._flush_locked()
+                except OSError:
+                    self._fail()
+                    return
+
+    def _read_loop(self) -> None:
+        try:
+            while True:
+                for req_id, ok, result in recv_frame(self._sock):
+                    waiter = self._waiters.pop(req_id, None)
+                    if waiter is not None:
+                        waiter.ok, waiter.result = ok, result
+                        waiter.event.set()
+        except (EOFError, OSError, pickle.UnpicklingError):
+            self._fail()
+
+    def _fail(self) -> None:
+        self.closed = True
+        with self._cond:
+            self._cond.notify_all()
+        for waiter in list(self._waiters.values()):
+            waiter.ok, waiter.result = False, "connection lost"
+            waiter.event.set()
+        self._waiters.clear()
+
+    # ------------------------------------------------------------------ #
+    # Public API                                                         #
+    # ------------------------------------------------------------------ #
+
+    def post(self, op: tuple) -> None:
+        if self.closed:
+            raise ConnectionError(f"connection to {self.address} is closed")
+        with self._cond:
+            self._pending.append(op)
+            if len(self._pending) >= self.max_batch:
+                self._flush_locked()
+            else:
+                self._cond.notify()
+
+    def call(self, name: str, *args, timeout: float | None = 30.0) -> Any:
+        if self.closed:
+            raise ConnectionError(f"connection to {self.address} is closed")
+        req_id = next(self._ids)
+        waiter = _Waiter()
+        self._waiters[req_id] = waiter
+        with self._cond:
+            self._pending.append((name, req_id) + args)
+            self._flush_locked()
+        if not waiter.event.wait(timeout):
+            self._waiters.pop(req_id, None)
+            raise TimeoutError(f"{name} on {self.address} timed out")
+        if not waiter.ok:
+            raise RemoteError(waiter.result)
+        return waiter.result
+
+    def flush(self) -> None:
+        with self._cond:
+            self._flush_locked()
+
+    def close(self) -> None:
+        with self._cond:
+            try:
+                self._flush_locked()
+            except OSError:
+                pass
+            self.closed = True
+            self._cond.notify_all()
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+
+
+# One connection per (process, node); reset after fork because the
+# parent's sockets, threads and lock state must not be used by the child
+_pool: Dict[Address, NodeConnection] = {}
+_pool_lock = threading.Lock()
+
+
+def _reset_pool_after_fork() -> None:
+    global _pool, _pool_lock
+    _pool = {}
+    _pool_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pool_after_fork)
+
+
+def get_connection(address) -> NodeConnection:
+    """
+    Pooled connection to the agent at `address` for this process.
+    """
+    address = parse_address(address)
+    with _pool_lock:
+        conn = _pool.get(address)
+        if conn is not None and not conn.closed:
+            return conn
+
+    # Connect and authenticate without the lock: that can take seconds and
+    # must not hold up connections to other nodes
+    conn = NodeConnection(address)
+    with _pool_lock:
+        pooled = _pool.get(address)
+        if pooled is None or pooled.closed:
+            _pool[address] = conn
+            return conn
+    # Another thread connected first; use its connection
+    conn.close()
+    return pooled
+
+
+def close_connections() -> None:
+    with _pool_lock:
+        connections = list(_pool.values())
+        _pool.clear()
+    for conn in connections:
+        conn.close()
+
+
+def _rebuild_tcp_channel(channel_id, name, allowed_senders, allowed_receivers, address, remote_name, prefetch):
+    logger = AppLogger()
+    return TcpChannel(
+        channel_id,
+        name,
+        allowed_senders,
+        allowed_receivers,
+        logger,
+        SecurityManager(logger),
+        address=address,
+        remote_name=remote_name,
+        prefetch=prefetch,
+    )
+
+
+class TcpChannel:
+    """
+    Queue-like channel whose messages live on a node agent (possibly on
+    another machine), reached over TCP.
+
+    - The ACL is checked in the calling process, as for every other
+      channel type.
+    - send_message() is one-way: the op is queued on this process's
+      pooled connection to the node and leaves in the next batch (see
+      NodeConnection), so a burst of sends costs one frame and one
+      syscall. flush() pushes queued sends out immediately.
+    - receive_message() fetches up to `prefetch` messages per round trip
+      and serves the rest locally. Prefetched messages are owned by this
+      process, so with several consumers keep prefetch small.
+    - The object can be pickled (e.g. sent to a node agent to start a
+      remote worker); the copy reconnects on first use.
+    """
+
+    def __init__(
+        self,
+        channel_id: int,
+        name: str,
+        allowed_senders: List[int],
+        allowed_receivers: List[int],
+        logger: AppLogger,
+        security_manager: SecurityManager,
+        address,
+        remote_name: str | None = None,
+        prefetch: int = 32,
+        owner: bool = False,
+    ) -> None:
+        self.channel_id = channel_id
+        self.name = name
+        self.allowed_senders = allowed_senders
+        self.allowed_receivers = allowed_receivers
+        self.logger = logger
+        self.security_manager = security_manager
+        self.address = parse_address(address)
+        # Name of the hosted queue on the agent
+        self.remote_name = remote_name or name
+        self.prefetch = max(1, prefetch)
+        # The creating side removes the hosted queue on close()
+        self.owner = owner
+
+        self._inbox: Deque[Any] = deque()
+        self._inbox_pid = os.getpid()
+
+    def __reduce__(self):
+        return (
+            _rebuild_tcp_channel,
+            (
+                self.channel_id,
+                self.name,
+                list(self.allowed_senders),
+                list(self.allowed_receivers),
+                self.address,
+                self.remote_name,
+                self.prefetch,
+            ),
+        )
+
+    # ------------------------------------------------------------------ #
+    # Internal helpers                                                   #
+    # ------------------------------------------------------------------ #
+
+    def _local_inbox(self) -> Deque[Any]:
+        if self._inbox_pid != os.getpid():
+            # Prefetched messages belong to the parent
+            self._inbox, self._inbox_pid = deque(), os.getpid()
+        return self._inbox
+
+    # ------------------------------------------------------------------ #
+    # Public API                                                         #
+    # ------------------------------------------------------------------ #
+
+    def send_message(self, sender_id: int, payload: Any) -> bool:
+        if not self.security_manager.validate_sender(
+            channel_name=self.name,
+            sender_id=sender_id,
+            allowed_senders=self.allowed_senders,
+        ):
+            return False
+
+        try:
+            get_connection(self.address).post(("send", self.remote_name, payload))
+            self.logger.info(
+                f"[Tcp:{self.name}] Sender {sender_id} -> queued payload: {payload!r}"
+            )
+            return True
+        except Exception as exc:
+            self.logger.error(
+                f"[Tcp:{self.name}] Failed to send from {sender_id}: {exc!r}"
+            )
+            return False
+
+    def receive_message(
+        self,
+        receiver_id: int,
+        block: bool = False,
+        timeout: float | None = None,
+    ) -> Any | None:
+        """
+        Next message, served from the prefetch buffer when possible.
+
+        If block=False and nothing is waiting, returns None.
+        """
+        if not self.security_manager.validate_receiver(
+            channel_name=self.name,
+            receiver_id=receiver_id,
+            allowed_receivers=self.allowed_receivers,
+        ):
+            return None
+
+        inbox = self._local_inbox()
+        if not inbox:
+            wait = 0.0 if not block else timeout
+            try:
+                conn = get_connection(self.address)
+                # A blocking wait without timeout becomes repeated long polls
+                while True:
+                    batch = conn.call(
+                        "recv", self.remote_name, self.prefetch,
+                        1.0 if wait is None else wait,
+                        timeout=(1.0 if wait is None else wait) + 30.0,
+                    )
+                    if batch or wait is not None:
+                        break
+                inbox.extend(batch)
+            except Exception as exc:
+                self.logger.error(
+                    f"[Tcp:{self.name}] Failed to receive for {receiver_id}: {exc!r}"
+                )
+                return None
+            if not inbox:
+                return None
+
+        msg = inbox.popleft()
+        self.logger.info(
+            f"[Tcp:{self.name}] Receiver {receiver_id} <- received payload: {msg!r}"
+        )
+        return msg
+
+    def flush(self) -> None:
+        get_connection(self.address).flush()
+
+    def depth(self) -> int:
+        """
+        Messages waiting on the node (not counting this process's prefetch).
+        """
+        return get_connection(self.address).call("depth", self.remote_name)
+
+    def close(self) -> None:
+        """
+        Flush queued sends; the owner also drops the hosted queue.
+        """
+        try:
+            conn = get_connection(self.address)
+            conn.flush()
+            if self.owner:
+                conn.call("close_channel", self.remote_name, timeout=5.0)
+        except Exception as exc:
+            self.logger.warning(f"[Tcp:{self.name}] Close on {self.address} failed: {exc!r}")
+
+        self.logger.info(f"[Tcp:{self.name}] Channel closed (id={self.channel_id})")
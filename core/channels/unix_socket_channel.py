@@ -0,0 +1,493 @@
+# ipc_project/core/channels/unix_socket_channel.py
+
+from __future__ import annotations
+
+import array
+import json
+import mmap
+import os
+import pickle
+import select
+import socket
+import struct
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, List, Sequence
+
+from core.utils.logger import AppLogger
+from core.security import SecurityManager
+
+# Wire format: one SOCK_SEQPACKET record per message, so the kernel keeps
+# message boundaries and no length prefix is needed.
+#
+#   header  <BBH   version, kind, number of out-of-band buffers (n)
+#           <nI    length of each out-of-band buffer
+#   body           raw bytes (KIND_BYTES) or a pickle, protocol 5 (KIND_PICKLE)
+#   buffers        the pickle's out-of-band buffers, back to back
+#
+# Parts are handed to sendmsg() as separate iovecs (scatter/gather), so
+# large bytes payloads and pickle buffers are never concatenated. File
+# descriptors travel alongside as SCM_RIGHTS ancillary data.
+WIRE_VERSION = 1
+KIND_BYTES = 0
+KIND_PICKLE = 1
+_HEADER = struct.Struct("<BBH")
+
+# Most descriptors one message can carry
+MAX_FDS = 16
+_FD_SPACE = socket.CMSG_SPACE(MAX_FDS * array.array("i").itemsize)
+
+ROLE_SEND = "send"
+ROLE_RECEIVE = "receive"
+
+
+def default_socket_dir() -> str:
+    return os.path.join(tempfile.gettempdir(), "ipc-control-room", "sock")
+
+
+@dataclass
+class FdMessage:
+    """
+    A received message that carried file descriptors. The receiver owns
+    the descriptors and must close them (close() or mmap()).
+    """
+
+    payload: Any
+    fds: List[int] = field(default_factory=list)
+
+    def mmap(self, index: int = 0, length: int = 0) -> mmap.mmap:
+        """
+        Map a passed shared-memory descriptor (e.g. a /dev/shm segment)
+        and close the descriptor; the mapping stays valid.
+        """
+        fd = self.fds[index]
+        try:
+            return mmap.mmap(fd, length)
+        finally:
+            os.close(fd)
+            self.fds[index] = -1
+
+    def close(self) -> None:
+        for fd in self.fds:
+            if fd >= 0:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self.fds = []
+
+
+# ---------------------------------------------------------------------- #
+# Record encoding                                                        #
+# ---------------------------------------------------------------------- #
+
+def _encode(payload: Any) -> List[Any]:
+    if isinstance(payload, (bytes, bytearray, memoryview)):
+        return [_HEADER.pack(WIRE_VERSION, KIND_BYTES, 0), payload]
+    buffers: List[pickle.PickleBuffer] = []
+    body = pickle.dumps(payload, protocol=5, buffer_callback=buffers.append)
+    raws = [buf.raw() for buf in buffers]
+    header = _HEADER.pack(WIRE_VERSION, KIND_PICKLE, len(raws))
+    if raws:
+        header += struct.pack(f"<{len(raws)}I", *(raw.nbytes for raw in raws))
+    return [header, body, *raws]
+
+
+def _decode(view: memoryview) -> Any:
+    version, kind, count = _HEADER.unpack_from(view)
+    if version != WIRE_VERSION:
+        raise ValueError(f"unsupported wire version {version}")
+    offset = _HEADER.size
+    lengths = struct.unpack_from(f"<{count}I", view, offset) if count else ()
+    offset += 4 * count
+    if kind == KIND_BYTES:
+        return bytes(view[offset:])
+    if kind != KIND_PICKLE:
+        raise ValueError(f"unknown message kind {kind}")
+
+    body_end = len(view) - sum(lengths)
+    buffers = []
+    start = body_end
+    for length in lengths:
+        # Copies, because the receive buffer is reused for the next message
+        buffers.append(bytearray(view[start : start + length]))
+        start += length
+    return pickle.loads(view[offset:body_end], buffers=buffers)
+
+
+def _send_record(sock: socket.socket, payload: Any, fds: Sequence[int] | None, block: bool) -> None:
+    ancdata = []
+    if fds:
+        ancdata = [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array("i", fds))]
+    sock.sendmsg(_encode(payload), ancdata, 0 if block else socket.MSG_DONTWAIT)
+
+
+def _fds_from(ancdata) -> List[int]:
+    fds: List[int] = []
+    for level, kind, data in ancdata:
+        if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+            received = array.array("i")
+            received.frombytes(data[: len(data) - (len(data) % received.itemsize)])
+            fds.extend(received)
+    return fds
+
+
+class _Endpoint:
+    """
+    Send/receive on one end of a SEQPACKET socket; shared by the channel
+    (control-room processes and forked workers) and by external clients.
+    """
+
+    def __init__(self, sock: socket.socket, max_message_size: int) -> None:
+        self.max_message_size = max_message_size
+        self._sock = sock
+        # One receive buffer per thread (and per process after fork)
+        self._local = threading.local()
+
+    def _buffer(self) -> bytearray:
+        buf = getattr(self._local, "buf", None)
+        if buf is None:
+            buf = self._local.buf = bytearray(self.max_message_size)
+        return buf
+
+    def _recv(self, block: bool, timeout: float | None) -> tuple:
+        """
+        (message, fds), or None if nothing arrived in time.
+        """
+        buf = self._buffer()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                nbytes, ancdata, flags, _addr = self._sock.recvmsg_into(
+                    [buf], _FD_SPACE, socket.MSG_DONTWAIT
+                )
+                break
+            except BlockingIOError:
+                if not block:
+                    return None
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return None
+            # Another reader may win the race; then loop and wait again.
+            # poll() rather than select(): descriptors may exceed 1024
+            poller = select.poll()
+            poller.register(self._sock, select.POLLIN)
+            poller.poll(None if remaining is None else remaining * 1000)
+
+        fds = _fds_from(ancdata)
+        if flags & socket.MSG_TRUNC:
+            for fd in fds:
+                os.close(fd)
+            raise ValueError(f"message larger than max_message_size ({self.max_message_size})")
+        if nbytes == 0:
+            raise EOFError("peer closed")
+        return _decode(memoryview(buf)[:nbytes]), fds
+
+    def fileno(self) -> int:
+        return self._sock.fileno()
+
+
+class UnixSocketEndpoint(_Endpoint):
+    """
+    One end of a UnixSocketChannel held by an external process, obtained
+    with connect_unix_channel(). The control room checked the ACL when it
+    handed the end over, so there is no per-message check here.
+    """
+
+    def __init__(self, sock: socket.socket, role: str, max_message_size: int) -> None:
+        super().__init__(sock, max_message_size)
+        self.role = role
+
+    def send_message(self, payload: Any, fds: Sequence[int] | None = None, block: bool = True) -> bool:
+        if self.role != ROLE_SEND:
+            raise ValueError("this endpoint was attached for receiving")
+        try:
+            _send_record(self._sock, payload, fds, block)
+            return True
+        except BlockingIOError:
+            return False
+
+    def receive_message(self, block: bool = False, timeout: float | None = None) -> Any | None:
+        if self.role != ROLE_RECEIVE:
+            raise ValueError("this endpoint was attached for sending")
+        item = self._recv(block, timeout)
+        if item is None:
+            return None
+        msg, fds = item
+        return FdMessage(msg, fds) if fds else msg
+
+    def close(self) -> None:
+        self._sock.close()
+
+
+def connect_unix_channel(
+    path: str,
+    participant_id: int,
+    role: str,
+    timeout: float = 5.0,
+) -> UnixSocketEndpoint:
+    """
+    Attach an unrelated process to a control-room UnixSocketChannel.
+
+    The control room checks `participant_id` against the channel's ACL
+    for `role` ("send" or "receive") and passes back the matching end of
+    the channel's socket, which is then used directly (no relay).
+    Raises PermissionError if refused.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_SEQPACKET) as control:
+        control.settimeout(timeout)
+        control.connect(path)
+        control.sendall(json.dumps({"participant": participant_id, "role": role}).encode())
+        reply, ancdata, _flags, _addr = control.recvmsg(4096, _FD_SPACE)
+    fds = _fds_from(ancdata)
+    answer = json.loads(reply or b"{}")
+    if not answer.get("ok") or not fds:
+        for fd in fds:
+            os.close(fd)
+        raise PermissionError(answer.get("error", "attach refused"))
+    sock = socket.socket(fileno=fds[0])
+    sock.setblocking(True)
+    return UnixSocketEndpoint(sock, role, int(answer["max_message_size"]))
+
+
+class UnixSocketChannel(_Endpoint):
+    """
+    Message channel over an AF_UNIX SOCK_SEQPACKET socket pair.
+
+    - Any number of senders write to one end and receivers read from the
+      other; each record is delivered whole to exactly one receiver, with
+      no user-space locking.
+    - Payloads go out with sendmsg() scatter/gather (see the wire format
+      above); bytes are sent as is, other objects as pickle protocol 5
+      with out-of-band buffers.
+    - send_message(..., fds=[...]) passes file descriptors, e.g. a
+      shared-memory segment, which the receiver gets as an FdMessage.
+    - The channel listens on `path`. External processes that did not
+      inherit anything from ProcessManager attach there with
+      connect_unix_channel(): after the ACL check they receive a
+      descriptor for the right end of the pair and then talk to the
+      other side directly, at the same speed as forked workers. Only
+      processes of the same user may attach.
+    """
+
+    def __init__(
+        self,
+        channel_id: int,
+        name: str,
+        allowed_senders: List[int],
+        allowed_receivers: List[int],
+        logger: AppLogger,
+        security_manager: SecurityManager,
+        path: str | None = None,
+        max_message_size: int = 1 << 20,
+    ) -> None:
+        self.channel_id = channel_id
+        self.name = name
+        self.allowed_senders = allowed_senders
+        self.allowed_receivers = allowed_receivers
+        self.logger = logger
+        self.security_manager = security_manager
+
+        self._send_sock, recv_sock = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        for sock in (self._send_sock, recv_sock):
+            try:
+                # A record must fit in the send buffer (capped by wmem_max)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 2 * max_message_size)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 2 * max_message_size)
+            except OSError:
+                pass
+        super().__init__(recv_sock, max_message_size)
+
+        self.path = path or os.path.join(default_socket_dir(), f"{name}.sock")
+        self._listener = self._listen(self.path)
+        self._stop = threading.Event()
+        self._owner_pid = os.getpid()
+        self._acceptor = threading.Thread(
+            target=self._accept_loop, name=f"unix-attach-{name}", daemon=True
+        )
+        self._acceptor.start()
+
+        self.logger.info(f"[Unix:{self.name}] Channel listening on {self.path} (id={self.channel_id})")
+
+    # ------------------------------------------------------------------ #
+    # Internal helpers                                                   #
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def _listen(path: str) -> socket.socket:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.exists(path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+            try:
+                probe.connect(path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # Left behind by a crashed run
+                os.unlink(path)
+            else:
+                raise FileExistsError(f"socket {path} is in use by another channel")
+            finally:
+                probe.close()
+
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        listener.bind(path)
+        os.chmod(path, 0o600)
+        listener.listen(16)
+        listener.settimeout(0.5)
+        return listener
+
+    def _accept_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                conn, _addr = self._listener.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            try:
+                conn.settimeout(2.0)
+                self._handle_attach(conn)
+            except Exception as exc:
+                self.logger.error(f"[Unix:{self.name}] Attach failed: {exc!r}")
+            finally:
+                conn.close()
+
+    def _handle_attach(self, conn: socket.socket) -> None:
+        pid, uid, _gid = struct.unpack(
+            "3i", conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+        )
+        request = json.loads(conn.recv(4096) or b"{}")
+        participant, role = request.get("participant"), request.get("role")
+
+        error = None
+        if uid != os.getuid() and os.getuid() != 0:
+            error = "different user"
+        elif role == ROLE_SEND:
+            if not self.security_manager.validate_sender(
+                channel_name=self.name,
+                sender_id=participant,
+                allowed_senders=self.allowed_senders,
+            ):
+                error = "not an allowed sender"
+        elif role == ROLE_RECEIVE:
+            if not self.security_manager.validate_receiver(
+                channel_name=self.name,
+                receiver_id=participant,
+                allowed_receivers=self.allowed_receivers,
+            ):
+                error = "not an allowed receiver"
+        else:
+            error = f"unknown role {role!r}"
+
+        if error is not None:
+            conn.sendall(json.dumps({"ok": False, "error": error}).encode())
+            self.logger.security(
+                f"[Unix:{self.name}] Refused attach of participant {participant} "
+                f"(pid {pid}) as {role}: {error}"
+            )
+            return
+
+        end = self._send_sock if role == ROLE_SEND else self._sock
+        reply = json.dumps({"ok": True, "max_message_size": self.max_message_size}).encode()
+        conn.sendmsg(
+            [reply], [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array("i", [end.fileno()]))]
+        )
+        self.logger.info(
+            f"[Unix:{self.name}] Participant {participant} (pid {pid}) attached as {role}"
+        )
+
+    # ------------------------------------------------------------------ #
+    # Public API                                                         #
+    # ------------------------------------------------------------------ #
+
+    def send_message(
+        self,
+        sender_id: int,
+        payload: Any,
+        fds: Sequence[int] | None = None,
+        block: bool = True,
+    ) -> bool:
+        """
+        Send one message (plus optional file descriptors, which stay open
+        on this side). With block=False a full socket buffer returns False.
+        """
+        if not self.security_manager.validate_sender(
+            channel_name=self.name,
+            sender_id=sender_id,
+            allowed_senders=self.allowed_senders,
+        ):
+            return False
+
+        try:
+            _send_record(self._send_sock, payload, fds, block)
+            self.logger.info(
+                f"[Unix:{self.name}] Sender {sender_id} -> sent payload: {payload!r}"
+            )
+            return True
+        except BlockingIOError:
+            self.logger.warning(f"[Unix:{self.name}] Socket full, message from {sender_id} refused")
+            return False
+        except Exception as exc:
+            self.logger.error(
+                f"[Unix:{self.name}] Failed to send from {sender_id}: {exc!r}"
+            )
+            return False
+
+    def receive_message(
+        self,
+        receiver_id: int,
+        block: bool = False,
+        timeout: float | None = None,
+    ) -> Any | None:
+        """
+        Receive one message; an FdMessage if descriptors came with it.
+
+        If block=False and nothing is waiting, returns None.
+        """
+        if not self.security_manager.validate_receiver(
+            channel_name=self.name,
+            receiver_id=receiver_id,
+            allowed_receivers=self.allowed_receivers,
+        ):
+            return None
+
+        try:
+            item = self._recv(block, timeout)
+            if item is None:
+                return None
+            msg, fds = item
+            self.logger.info(
+                f"[Unix:{self.name}] Receiver {receiver_id} <- received payload: {msg!r}"
+            )
+            return FdMessage(msg, fds) if fds else msg
+        except Exception as exc:
+            self.logger.error(
+                f"[Unix:{self.name}] Failed to receive for {receiver_id}: {exc!r}"
+            )
+            return None
+
+    def close(self) -> None:
+        """
+        Stop accepting attachments, remove the socket file and close both
+        ends (in this process; other holders keep theirs).
+        """
+        self._stop.set()
+        if os.getpid() == self._owner_pid:
+            try:
+                self._listener.close()
+            except OSError:
+                pass
+            if self._acceptor.is_alive():
+                self._acceptor.join(timeout=1.0)
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+        for sock in (self._send_sock, self._sock):
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+        self.logger.info(f"[Unix:{self.name}] Channel closed (id={self.channel_id})")
@@ -2,22 +2,35 @@
 
 from __future__ import annotations
 
+import secrets
 from dataclasses import dataclass
-from typing import Dict, List, Any
+from typing import Any, Dict, Iterable, Iterator, List
 
 from core.utils.logger import AppLogger
 from core.security import SecurityManager
+from core.utils.journal import MessageJournal
+from core.utils.serializer import AdaptiveCompressor
+from core.utils.tracing import Tracer, merge_traces
+from core.utils.shm_registry import ReapReport, ShmReaper, live_segments
 from core.channels.pipe_channel import PipeChannel
 from core.channels.queue_channel import QueueChannel
 #FINAAL BRICK 
 from core.channels.shm_channel import SharedMemoryChannel
+from core.channels.ndarray_channel import NdArrayChannel
+from core.channels.mmap_channel import MmapLogChannel
+from core.channels.priority_queue_channel import PriorityQueueChannel
+from core.channels.unix_socket_channel import UnixSocketChannel
+from core.channels.tcp_channel import TcpChannel, close_connections
+from core.node_agent import NodeAgent, NodeClient
 
 
 
 @dataclass
 class IPCChannelInfo:
     id: int
-    channel_type: str  # "pipe", "queue", "shared_memory"
+    # "pipe", "queue", "shared_memory", "ndarray", "mmap_log", "priority_queue",
+    # "unix_socket", "tcp"
+    channel_type: str
     name: str
     allowed_senders: List[int]
     allowed_receivers: List[int]
@@ -27,7 +40,16 @@ class IPCManager:
     """
     Central registry for IPC channels.
 
-    Currently supports PipeChannel and QueueChannel.
+    Currently supports PipeChannel, QueueChannel, SharedMemoryChannel,
+    NdArrayChannel, MmapLogChannel, PriorityQueueChannel,
+    UnixSocketChannel and TcpChannel. TcpChannels live on node agents
+    (see add_node), which lets workers on other machines take part.
+
+    Besides the id-keyed registry, channels are indexed by name, type,
+    allowed sender and allowed receiver. Indexes are updated on create and
+    close, so lookups like "channels process 42 may send on" cost O(result)
+    instead of a scan. The iter_* queries yield from the live indexes
+    without copying; do not create or close channels while iterating.
     """
 
     def __init__(self, logger: AppLogger, security_manager: SecurityManager) -> None:
@@ -38,11 +60,84 @@ class IPCManager:
         self._channels_info: Dict[int, IPCChannelInfo] = {}
         self._channels_impl: Dict[int, Any] = {}
 
+        # Secondary indexes: key -> ordered set (dict) of channel ids.
+        # An empty ACL means "anyone", kept in the _open_* sets.
+        self._by_name: Dict[str, Dict[int, None]] = {}
+        self._by_type: Dict[str, Dict[int, None]] = {}
+        self._by_sender: Dict[int, Dict[int, None]] = {}
+        self._by_receiver: Dict[int, Dict[int, None]] = {}
+        self._open_senders: Dict[int, None] = {}
+        self._open_receivers: Dict[int, None] = {}
+
+        # Set by enable_tracing(); given to pipe/queue channels created after
+        self.tracer: Tracer | None = None
+
+        self._reaper: ShmReaper | None = None
+
+        # Node agents by name; "local" is started on demand for TCP
+        # channels created without a node
+        self._nodes: Dict[str, NodeClient] = {}
+        self._local_agent: NodeAgent | None = None
+        # Qualifies hosted queue names: channel ids are only unique per
+        # control room, and several may share an agent
+        self._node_token = secrets.token_hex(6)
+
     # ------------------------------------------------------------------ #
     # Internal helper                                                     #
     # ------------------------------------------------------------------ #
 
-    def _create_channel_info(
+    @staticmethod
+    def _index_add(index: Dict[Any, Dict[int, None]], key: Any, chan_id: int) -> None:
+        index.setdefault(key, {})[chan_id] = None
+
+    @staticmethod
+    def _index_remove(index: Dict[Any, Dict[int, None]], key: Any, chan_id: int) -> None:
+        ids = index.get(key)
+        if ids is None:
+            return
+        ids.pop(chan_id, None)
+        if not ids:
+            del index[key]
+
+    def _index_acl(self, info: IPCChannelInfo) -> None:
+        for sender in info.allowed_senders:
+            self._index_add(self._by_sender, sender, info.id)
+        if not info.allowed_senders:
+            self._open_senders[info.id] = None
+        for receiver in info.allowed_receivers:
+            self._index_add(self._by_receiver, receiver, info.id)
+        if not info.allowed_receivers:
+            self._open_receivers[info.id] = None
+
+    def _unindex_acl(self, info: IPCChannelInfo) -> None:
+        for sender in info.allowed_senders:
+            self._index_remove(self._by_sender, sender, info.id)
+        for receiver in info.allowed_receivers:
+            self._index_remove(self._by_receiver, receiver, info.id)
+        self._open_senders.pop(info.id, None)
+        self._open_receivers.pop(info.id, None)
+
+    def _register(self, info: IPCChannelInfo) -> None:
+        self._channels_info[info.id] = info
+        self._index_add(self._by_name, info.name, info.id)
+        self._index_add(self._by_type, info.channel_type, info.id)
+        self._index_acl(info)
+
+    def _unregister(self, chan_id: int) -> IPCChannelInfo | None:
+        info = self._channels_info.pop(chan_id, None)
+        if info is None:
+            return None
+        self._index_remove(self._by_name, info.name, chan_id)
+        self._index_remove(self._by_type, info.channel_type, chan_id)
+        self._unindex_acl(info)
+        return info
+
+    def _infos(self, ids: Iterable[int]) -> Iterator[IPCChannelInfo]:
+        infos = self._channels_info
+        for chan_id in ids:
+            yield infos[chan_id]
+
+    def _new_channel_info(
         self,
         channel_type: str,
         name: str,
@@ -64,12 +159,99 @@ class IPCManager:
             allowed_senders=allowed_senders,
             allowed_receivers=allowed_receivers,
         )
-        self._channels_info[chan_id] = info
+        return info
+
+    def _add_channel(self, info: IPCChannelInfo, channel: Any) -> Any:
+        """
+        Register a channel once it has been built, so a constructor that
+        raises leaves nothing behind in the registry.
+        """
+        self._register(info)
+        self._channels_impl[info.id] = channel
+        self.logger.bind(channel_id=info.id).info(
+            f"IPC channel created: id={info.id}, type={info.channel_type}, name={info.name}"
+        )
+        return channel
+
+    def _make_journal(self, journal_dir: str | None, name: str) -> MessageJournal | None:
+        if journal_dir is None:
+            return None
+        self.logger.info(f"Journaling channel '{name}' to {journal_dir}")
+        return MessageJournal(journal_dir, name)
+
+    @staticmethod
+    def _make_compressor(codec: str | None, threshold: int) -> AdaptiveCompressor | None:
+        if codec is None:
+            return None
+        return AdaptiveCompressor(codec=codec, threshold=threshold)
+
+    # ------------------------------------------------------------------ #
+    # Tracing                                                             #
+    # ------------------------------------------------------------------ #
+
+    def enable_tracing(self, directory: str) -> Tracer:
+        """
+        Record timing spans for pipe and queue channels created from now on.
+        Each process writes its own file into `directory`.
+        """
+        if self.tracer is None:
+            self.tracer = Tracer(directory)
+            self.logger.info(f"Channel tracing enabled, writing to {directory}")
+        return self.tracer
+
+    def export_trace(self, output_path: str) -> int:
+        """
+        Merge the per-process trace files into one Chrome/Perfetto JSON
+        file. Workers flush their buffers when they stop.
+
+        Returns the number of events written (0 if tracing is off).
+        """
+        if self.tracer is None:
+            return 0
+        self.tracer.flush()
+        count = merge_traces(self.tracer.directory, output_path, self.tracer.name)
+        self.logger.info(f"Trace exported: {count} events -> {output_path}")
+        return count
 
+    # ------------------------------------------------------------------ #
+    # Shared memory housekeeping                                          #
+    # ------------------------------------------------------------------ #
+
+    def _log_reap(self, report: ReapReport) -> None:
+        if report.reclaimed_segments:
+            self.logger.warning(
+                f"Reclaimed {report.reclaimed_segments} leaked shared memory segments "
+                f"({report.reclaimed_bytes / (1 << 20):.1f} MB); "
+                f"live: {report.live_segments} segments, {report.live_bytes / (1 << 20):.1f} MB"
+            )
+
+    def start_shm_reaper(self, interval: float = 60.0) -> ReapReport:
+        """
+        Unlink shared memory left behind by dead control rooms now, then
+        every `interval` seconds. Returns the startup report.
+        """
+        if self._reaper is None:
+            self._reaper = ShmReaper(interval=interval, on_report=self._log_reap)
+        report = self._reaper.start()
         self.logger.info(
-            f"IPC channel created: id={chan_id}, type={channel_type}, name={name}"
+            f"Shared memory: {report.live_segments} live segments "
+            f"({report.live_bytes / (1 << 20):.1f} MB), "
+            f"{report.reclaimed_bytes / (1 << 20):.1f} MB reclaimed at startup"
         )
-        return info
+        return report
+
+    def shm_usage(self) -> dict:
+        """
+        Segments owned by this process plus the reaper's totals.
+        """
+        own = live_segments()
+        reaper = self._reaper
+        return {
+            "own_segments": len(own),
+            "own_bytes": sum(info["size"] for info in own.values()),
+            "host_live_bytes": None if reaper is None else reaper.last_report.live_bytes,
+            "reclaimed_bytes_total": 0 if reaper is None else reaper.total_reclaimed_bytes,
+        }
 
     # ------------------------------------------------------------------ #
     # Pipe                                                                #
@@ -80,8 +262,13 @@ class IPCManager:
         name: str,
         allowed_senders: List[int] | None = None,
         allowed_receivers: List[int] | None = None,
+        journal_dir: str | None = None,
+        compression: str | None = None,
+        compression_threshold: int = 1024,
+        flow_control_credits: int | None = None,
+        overflow_limit: int = 1024,
     ) -> PipeChannel:
-        info = self._create_channel_info(
+        info = self._new_channel_info(
             channel_type="pipe",
             name=name,
             allowed_senders=allowed_senders,
@@ -93,12 +280,16 @@ class IPCManager:
             name=info.name,
             allowed_senders=info.allowed_senders,
             allowed_receivers=info.allowed_receivers,
-            logger=self.logger,
+            logger=self.logger.bind(channel_id=info.id),
             security_manager=self.security_manager,
+            journal=self._make_journal(journal_dir, info.name),
+            compressor=self._make_compressor(compression, compression_threshold),
+            flow_control_credits=flow_control_credits,
+            overflow_limit=overflow_limit,
+            tracer=self.tracer,
         )
 
-        self._channels_impl[info.id] = pipe
-        return pipe
+        return self._add_channel(info, pipe)
 
     # ------------------------------------------------------------------ #
     # Queue                                                               #
@@ -109,8 +300,12 @@ class IPCManager:
         name: str,
         allowed_senders: List[int] | None = None,
         allowed_receivers: List[int] | None = None,
+        journal_dir: str | None = None,
+        compression: str | None = None,
+        compression_threshold: int = 1024,
+        default_ttl: float | None = None,
     ) -> QueueChannel:
-        info = self._create_channel_info(
+        info = self._new_channel_info(
             channel_type="queue",
             name=name,
             allowed_senders=allowed_senders,
@@ -122,13 +317,53 @@ class IPCManager:
             name=info.name,
             allowed_senders=info.allowed_senders,
             allowed_receivers=info.allowed_receivers,
-            logger=self.logger,
+            logger=self.logger.bind(channel_id=info.id),
+            security_manager=self.security_manager,
+            journal=self._make_journal(journal_dir, info.name),
+            compressor=self._make_compressor(compression, compression_threshold),
+            tracer=self.tracer,
+            default_ttl=default_ttl,
+        )
+
+        return self._add_channel(info, q)
+
+    # ------------------------------------------------------------------ #
+    # Priority queue                                                      #
+    # ------------------------------------------------------------------ #
+
+    def create_priority_queue_channel(
+        self,
+        name: str,
+        allowed_senders: List[int] | None = None,
+        allowed_receivers: List[int] | None = None,
+        lanes: int = 3,
+        mode: str = "strict",
+        weights: List[int] | None = None,
+        default_ttl: float | None = None,
+    ) -> PriorityQueueChannel:
+        info = self._new_channel_info(
+            channel_type="priority_queue",
+            name=name,
+            allowed_senders=allowed_senders,
+            allowed_receivers=allowed_receivers,
+        )
+
+        pq = PriorityQueueChannel(
+            channel_id=info.id,
+            name=info.name,
+            allowed_senders=info.allowed_senders,
+            allowed_receivers=info.allowed_receivers,
+            logger=self.logger.bind(channel_id=info.id),
             security_manager=self.security_manager,
+            lanes=lanes,
+            mode=mode,
+            weights=weights,
+            default_ttl=default_ttl,
         )
 
-        self._channels_impl[info.id] = q
-        return q
-        # ------------------------------------------------------------------ #
+        return self._add_channel(info, pq)
+
+    # ------------------------------------------------------------------ #
     # Shared Memory                                                      #
     # ------------------------------------------------------------------ #
 
@@ -138,8 +373,9 @@ class IPCManager:
         allowed_senders: List[int] | None = None,
         allowed_receivers: List[int] | None = None,
         buffer_size: int = 256,
+        notify_readers: int = 0,
     ) -> SharedMemoryChannel:
-        info = self._create_channel_info(
+        info = self._new_channel_info(
             channel_type="shared_memory",
             name=name,
             allowed_senders=allowed_senders,
@@ -151,13 +387,195 @@ class IPCManager:
             name=info.name,
             allowed_senders=info.allowed_senders,
             allowed_receivers=info.allowed_receivers,
-            logger=self.logger,
+            logger=self.logger.bind(channel_id=info.id),
             security_manager=self.security_manager,
             buffer_size=buffer_size,
+            notify_readers=notify_readers,
+        )
+
+        return self._add_channel(info, shm)
+
+    # ------------------------------------------------------------------ #
+    # NumPy arrays over shared memory                                     #
+    # ------------------------------------------------------------------ #
+
+    def create_ndarray_channel(
+        self,
+        name: str,
+        allowed_senders: List[int] | None = None,
+        allowed_receivers: List[int] | None = None,
+        slot_size: int = 1 << 20,
+        slots: int = 4,
+    ) -> NdArrayChannel:
+        """
+        Requires numpy; raises ImportError otherwise.
+        """
+        info = self._new_channel_info(
+            channel_type="ndarray",
+            name=name,
+            allowed_senders=allowed_senders,
+            allowed_receivers=allowed_receivers,
         )
 
-        self._channels_impl[info.id] = shm
-        return shm
+        arr_chan = NdArrayChannel(
+            channel_id=info.id,
+            name=info.name,
+            allowed_senders=info.allowed_senders,
+            allowed_receivers=info.allowed_receivers,
+            logger=self.logger.bind(channel_id=info.id),
+            security_manager=self.security_manager,
+            slot_size=slot_size,
+            slots=slots,
+        )
+
+        return self._add_channel(info, arr_chan)
+
+    # ------------------------------------------------------------------ #
+    # Memory-mapped log                                                   #
+    # ------------------------------------------------------------------ #
+
+    def create_mmap_log_channel(
+        self,
+        name: str,
+        allowed_senders: List[int] | None = None,
+        allowed_receivers: List[int] | None = None,
+        directory: str | None = None,
+        segment_size: int = 4 << 20,
+        max_segments: int | None = None,
+        start_at: str = "earliest",
+    ) -> MmapLogChannel:
+        info = self._new_channel_info(
+            channel_type="mmap_log",
+            name=name,
+            allowed_senders=allowed_senders,
+            allowed_receivers=allowed_receivers,
+        )
+
+        log_chan = MmapLogChannel(
+            channel_id=info.id,
+            name=info.name,
+            allowed_senders=info.allowed_senders,
+            allowed_receivers=info.allowed_receivers,
+            logger=self.logger.bind(channel_id=info.id),
+            security_manager=self.security_manager,
+            directory=directory,
+            segment_size=segment_size,
+            max_segments=max_segments,
+            start_at=start_at,
+        )
+
+        return self._add_channel(info, log_chan)
+
+    # ------------------------------------------------------------------ #
+    # Unix domain socket                                                  #
+    # ------------------------------------------------------------------ #
+
+    def create_unix_socket_channel(
+        self,
+        name: str,
+        allowed_senders: List[int] | None = None,
+        allowed_receivers: List[int] | None = None,
+        path: str | None = None,
+        max_message_size: int = 1 << 20,
+    ) -> UnixSocketChannel:
+        """
+        External processes can attach at `path` (default
+        <tmp>/ipc-control-room/sock/<name>.sock) with
+        connect_unix_channel(). Raises FileExistsError if another live
+        channel owns the path.
+        """
+        info = self._new_channel_info(
+            channel_type="unix_socket",
+            name=name,
+            allowed_senders=allowed_senders,
+            allowed_receivers=allowed_receivers,
+        )
+
+        sock_chan = UnixSocketChannel(
+            channel_id=info.id,
+            name=info.name,
+            allowed_senders=info.allowed_senders,
+            allowed_receivers=info.allowed_receivers,
+            logger=self.logger.bind(channel_id=info.id),
+            security_manager=self.security_manager,
+            path=path,
+            max_message_size=max_message_size,
+        )
+
+        return self._add_channel(info, sock_chan)
+
+    # ------------------------------------------------------------------ #
+    # Nodes and TCP                                                       #
+    # ------------------------------------------------------------------ #
+
+    def add_node(self, name: str, address) -> NodeClient:
+        """
+        Register the node agent at `address` ("host:port") under `name`.
+        Connections authenticate with the cluster authkey (see
+        tcp_channel.set_authkey, default $IPC_NODE_AUTHKEY).
+        """
+        node = NodeClient(name, address)
+        self._nodes[name] = node
+        self.logger.info(f"Node '{name}' registered at {node.address[0]}:{node.address[1]}")
+        return node
+
+    def get_node(self, name: str) -> NodeClient | None:
+        return self._nodes.get(name)
+
+    def list_nodes(self) -> List[NodeClient]:
+        return list(self._nodes.values())
+
+    def start_local_agent(self, host: str = "127.0.0.1", port: int = 0) -> NodeClient:
+        """
+        Run a node agent inside this process (channel hosting only, no
+        workers) and register it as node "local".
+        """
+        if self._local_agent is None:
+            self._local_agent = NodeAgent(host, port, logger=self.logger)
+            self._local_agent.start()
+            self.add_node("local", self._local_agent.address)
+        return self._nodes["local"]
+
+    def create_tcp_channel(
+        self,
+        name: str,
+        allowed_senders: List[int] | None = None,
+        allowed_receivers: List[int] | None = None,
+        node: str | None = None,
+        prefetch: int = 32,
+    ) -> TcpChannel:
+        """
+        Channel hosted by node agent `node` (default: a local agent,
+        started on first use). Raises KeyError for an unknown node and
+        OSError/RuntimeError if the agent cannot be reached or already
+        hosts a queue of that name.
+        """
+        client = self.start_local_agent() if node is None else self._nodes[node]
+        info = self._new_channel_info(
+            channel_type="tcp",
+            name=name,
+            allowed_senders=allowed_senders,
+            allowed_receivers=allowed_receivers,
+        )
+
+        remote_name = f"{self._node_token}:{info.id}:{name}"
+        if not client.create_channel(remote_name):
+            raise RuntimeError(f"node '{client.name}' already hosts a channel '{remote_name}'")
+
+        tcp_chan = TcpChannel(
+            channel_id=info.id,
+            name=info.name,
+            allowed_senders=info.allowed_senders,
+            allowed_receivers=info.allowed_receivers,
+            logger=self.logger.bind(channel_id=info.id),
+            security_manager=self.security_manager,
+            address=client.address,
+            remote_name=remote_name,
+            prefetch=prefetch,
+            owner=True,
+        )
+
+        return self._add_channel(info, tcp_chan)
 
     # ------------------------------------------------------------------ #
     # Queries                                                             #
@@ -166,6 +584,109 @@ class IPCManager:
     def list_channels(self) -> List[IPCChannelInfo]:
         return list(self._channels_info.values())
 
+    def iter_channels(self, channel_type: str | None = None) -> Iterator[IPCChannelInfo]:
+        """
+        All channels, or all channels of one type, without copying.
+        """
+        if channel_type is None:
+            return iter(self._channels_info.values())
+        return self._infos(self._by_type.get(channel_type, ()))
+
+    def count_channels(self, channel_type: str | None = None) -> int:
+        if channel_type is None:
+            return len(self._channels_info)
+        return len(self._by_type.get(channel_type, ()))
+
+    def get_channel_info(self, channel_id: int) -> IPCChannelInfo | None:
+        return self._channels_info.get(channel_id)
+
+    def find_channel(self, name: str) -> IPCChannelInfo | None:
+        """
+        Channel with this name (the oldest one if the name is reused).
+        """
+        ids = self._by_name.get(name)
+        if not ids:
+            return None
+        return self._channels_info[next(iter(ids))]
+
+    def iter_channels_by_name(self, name: str) -> Iterator[IPCChannelInfo]:
+        return self._infos(self._by_name.get(name, ()))
+
+    def iter_sendable(self, proc_id: int, include_open: bool = True) -> Iterator[IPCChannelInfo]:
+        """
+        Channels `proc_id` may send on: listed explicitly, plus (with
+        include_open) channels whose sender list is empty.
+        """
+        yield from self._infos(self._by_sender.get(proc_id, ()))
+        if include_open:
+            yield from self._infos(self._open_senders)
+
+    def iter_receivable(self, proc_id: int, include_open: bool = True) -> Iterator[IPCChannelInfo]:
+        """
+        Channels `proc_id` may receive on (see iter_sendable).
+        """
+        yield from self._infos(self._by_receiver.get(proc_id, ()))
+        if include_open:
+            yield from self._infos(self._open_receivers)
+
+    def set_channel_acl(
+        self,
+        channel_id: int,
+        allowed_senders: List[int] | None = None,
+        allowed_receivers: List[int] | None = None,
+    ) -> bool:
+        """
+        Replace a channel's sender and/or receiver list and re-index it.
+
+        The lists are updated in place, so the channel object (which
+        shares them) enforces the new ACL in this process. Workers forked
+        earlier keep the ACL they started with.
+        """
+        info = self._channels_info.get(channel_id)
+        if info is None:
+            self.logger.warning(f"ACL update for unknown channel: {channel_id}")
+            return False
+        self._unindex_acl(info)
+        if allowed_senders is not None:
+            info.allowed_senders[:] = allowed_senders
+        if allowed_receivers is not None:
+            info.allowed_receivers[:] = allowed_receivers
+        self._index_acl(info)
+        return True
+
     def get_channel_impl(self, channel_id: int) -> Any | None:
         return self._channels_impl.get(channel_id)
+
+    def close_all(self) -> int:
+        """
+        Close every channel (unlinking shared memory). Returns the count.
+        """
+        channel_ids = list(self._channels_info)
+        for channel_id in channel_ids:
+            self.close_channel(channel_id)
+        if self._reaper is not None:
+            self._reaper.stop()
+            self._reaper = None
+        close_connections()
+        if self._local_agent is not None:
+            self._local_agent.stop()
+            self._local_agent = None
+            self._nodes.pop("local", None)
+        return len(channel_ids)
+
+    def close_channel(self, channel_id: int) -> bool:
+        """
+        Close a channel and remove it from the registry.
+        """
+        info = self._unregister(channel_id)
+        impl = self._channels_impl.pop(channel_id, None)
+        if info is None:
+            self.logger.warning(f"Close requested for unknown channel: {channel_id}")
+            return False
+        if impl is not None:
+            try:
+                impl.close()
+            except Exception as exc:
+                self.logger.error(f"Closing channel {channel_id} failed: {exc!r}")
+        return True
 # IPC manager supports extensible communication mechanisms
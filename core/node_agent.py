@@ -0,0 +1,385 @@
+# ipc_project/core/node_agent.py
+
+from __future__ import annotations
+
+import argparse
+import os
+import signal
+import socket
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List
+
+from core.channels.tcp_channel import (
+    AUTHKEY_ENV,
+    authenticate,
+    get_authkey,
+    get_connection,
+    is_loopback,
+    parse_address,
+    recv_frame,
+    send_frame,
+    set_authkey,
+    tune_socket,
+)
+from core.utils.logger import AppLogger
+
+
+class _HostedQueue:
+    """
+    Messages of one TcpChannel, held by the node that hosts it.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.items: Deque[Any] = deque()
+        self.cond = threading.Condition()
+        self.received = 0
+        self.delivered = 0
+
+    def put_many(self, payloads: List[Any]) -> None:
+        with self.cond:
+            self.items.extend(payloads)
+            self.received += len(payloads)
+            self.cond.notify_all()
+
+    def take(self, limit: int, wait: float) -> List[Any]:
+        with self.cond:
+            if not self.items and wait > 0:
+                self.cond.wait_for(lambda: self.items, wait)
+            batch = []
+            while self.items and len(batch) < limit:
+                batch.append(self.items.popleft())
+            self.delivered += len(batch)
+            return batch
+
+
+class _Direct:
+    """
+    Resolver for WORKER_ROLES builders when the entry already holds the
+    channel objects and participant ids.
+    """
+
+    @staticmethod
+    def channel(ref):
+        return ref
+
+    @staticmethod
+    def process(ref):
+        return ref
+
+
+class NodeAgent:
+    """
+    Per-node server: hosts TcpChannel queues and starts workers on its
+    machine on behalf of a coordinator.
+
+    - One thread per client connection reads batched frames; one-way
+      "send" ops of a frame are grouped per queue and appended under one
+      lock, and the replies of a frame go back as one frame.
+    - Blocking receives wait on a helper thread so they do not hold up
+      other traffic multiplexed on the same pooled connection.
+    - Workers are started through the agent's own ProcessManager (so they
+      get placement, supervision and hosting like local workers) and can
+      only use TcpChannels, which work from any node.
+
+    Peers must pass a mutual HMAC challenge on the shared authkey (as in
+    multiprocessing.connection) before any frame is unpickled: frames
+    are pickles and "spawn" starts code, so an unauthenticated peer
+    could run anything. Without a key the agent only binds to loopback.
+    Run one per machine with
+    `IPC_NODE_AUTHKEY=... python -m core.node_agent --host 0.0.0.0`.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        logger: AppLogger | None = None,
+        process_manager=None,
+        authkey: bytes | None = None,
+    ) -> None:
+        self.authkey = authkey if authkey is not None else get_authkey()
+        if self.authkey is None and not is_loopback(host):
+            raise ValueError(
+                f"refusing to listen on non-loopback address '{host}' without an authkey "
+                f"(set {AUTHKEY_ENV} or pass authkey=)"
+            )
+        self.logger = logger or AppLogger()
+        self.process_manager = process_manager
+        self._queues: Dict[str, _HostedQueue] = {}
+        self._queues_lock = threading.Lock()
+
+        self._listener = socket.create_server((host, port))
+        self.address = self._listener.getsockname()[:2]
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        self._handlers: Dict[str, Callable] = {
+            "create_channel": self._op_create_channel,
+            "close_channel": self._op_close_channel,
+            "depth": self._op_depth,
+            "spawn": self._op_spawn,
+            "terminate": self._op_terminate,
+            "info": self._op_info,
+        }
+
+    # ------------------------------------------------------------------ #
+    # Internal helpers                                                   #
+    # ------------------------------------------------------------------ #
+
+    def _queue(self, name: str) -> _HostedQueue:
+        queue = self._queues.get(name)
+        if queue is None:
+            raise KeyError(f"no channel '{name}' on this node")
+        return queue
+
+    def _op_create_channel(self, name: str) -> bool:
+        with self._queues_lock:
+            created = name not in self._queues
+            if created:
+                self._queues[name] = _HostedQueue(name)
+        if created:
+            self.logger.info(f"[Node:{self.address[1]}] Hosting channel '{name}'")
+        return created
+
+    def _op_close_channel(self, name: str) -> bool:
+        with self._queues_lock:
+            return self._queues.pop(name, None) is not None
+
+    def _op_depth(self, name: str) -> int:
+        return len(self._queue(name).items)
+
+    def _op_spawn(self, requests: List[tuple]) -> List[int]:
+        """
+        requests: [(role, name_prefix, entry)] with channel objects and
+        participant ids already resolved in `entry`.
+        """
+        if self.process_manager is None:
+            raise RuntimeError("this agent does not run workers")
+        from core.process_manager import WorkerRequest
+        from core.topology import WORKER_ROLES
+
+        worker_requests = []
+        for role, name_prefix, entry in requests:
+            if role not in WORKER_ROLES:
+                raise ValueError(f"unknown role '{role}'")
+            builder = WORKER_ROLES[role][1]
+            factory = builder(entry, _Direct())
+            worker_requests.append(
+                WorkerRequest(name_prefix, role, factory, hosted=bool(entry.get("hosted", False)))
+            )
+        return self.process_manager.spawn_workers(worker_requests, wait=10.0)
+
+    def _op_terminate(self, proc_ids: List[int]) -> int:
+        if self.process_manager is None:
+            return 0
+        return self.process_manager.terminate_processes(proc_ids)
+
+    def _op_info(self) -> dict:
+        workers = 0 if self.process_manager is None else len(self.process_manager.list_processes())
+        return {
+            "host": socket.gethostname(),
+            "pid": os.getpid(),
+            "cpus": os.cpu_count(),
+            "channels": len(self._queues),
+            "workers": workers,
+        }
+
+    def _reply(self, sock: socket.socket, lock: threading.Lock, replies: List[tuple]) -> None:
+        with lock:
+            send_frame(sock, replies)
+
+    def _wait_recv(self, sock, lock, req_id, queue: _HostedQueue, limit: int, wait: float) -> None:
+        try:
+            self._reply(sock, lock, [(req_id, True, queue.take(limit, wait))])
+        except OSError:
+            pass
+
+    def _serve(self, sock: socket.socket, peer) -> None:
+        try:
+            authenticate(sock, self.authkey, server=True)
+        except (OSError, EOFError) as exc:
+            self.logger.security(f"[Node:{self.address[1]}] Rejected connection from {peer[0]}: {exc!r}")
+            sock.close()
+            return
+        tune_socket(sock)
+        write_lock = threading.Lock()
+        try:
+            while not self._stop.is_set():
+                ops = recv_frame(sock)
+                replies = []
+                sends: Dict[str, List[Any]] = {}
+                for op in ops:
+                    if op[0] == "send":
+                        sends.setdefault(op[1], []).append(op[2])
+                        continue
+                    # Keep message order: apply sends queued before a request
+                    for name, payloads in sends.items():
+                        self._put(name, payloads)
+                    sends.clear()
+
+                    name, req_id, args = op[0], op[1], op[2:]
+                    try:
+                        if name == "recv":
+                            queue, limit, wait = self._queue(args[0]), args[1], args[2]
+                            if wait > 0 and not queue.items:
+                                threading.Thread(
+                                    target=self._wait_recv,
+                                    args=(sock, write_lock, req_id, queue, limit, wait),
+                                    daemon=True,
+                                ).start()
+                                continue
+                            replies.append((req_id, True, queue.take(limit, 0)))
+                        else:
+                            replies.append((req_id, True, self._handlers[name](*args)))
+                    except Exception as exc:
+                        replies.append((req_id, False, repr(exc)))
+                for name, payloads in sends.items():
+                    self._put(name, payloads)
+                if replies:
+                    self._reply(sock, write_lock, replies)
+        except (EOFError, OSError):
+            pass
+        finally:
+            sock.close()
+
+    def _put(self, name: str, payloads: List[Any]) -> None:
+        queue = self._queues.get(name)
+        if queue is None:
+            self.logger.warning(
+                f"[Node:{self.address[1]}] Dropped {len(payloads)} message(s) for unknown channel '{name}'"
+            )
+            return
+        queue.put_many(payloads)
+
+    def _accept_loop(self) -> None:
+        self._listener.settimeout(0.5)
+        while not self._stop.is_set():
+            try:
+                sock, addr = self._listener.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            sock.settimeout(None)
+            # Handshake on the connection's thread: a slow peer must not
+            # hold up accept()
+            threading.Thread(target=self._serve, args=(sock, addr), daemon=True).start()
+
+    # ------------------------------------------------------------------ #
+    # Public API                                                         #
+    # ------------------------------------------------------------------ #
+
+    def start(self) -> tuple:
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._accept_loop, name="node-agent", daemon=True)
+            self._thread.start()
+            self.logger.info(f"Node agent listening on {self.address[0]}:{self.address[1]}")
+        return self.address
+
+    def stop(self) -> None:
+        self._stop.set()
+        try:
+            self._listener.close()
+        except OSError:
+            pass
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        if self.process_manager is not None:
+            self.process_manager.shutdown()
+
+
+class NodeClient:
+    """
+    Coordinator-side proxy for one node agent. Uses the pooled
+    connection of this process, so control calls and channel traffic to
+    the node share one socket.
+    """
+
+    def __init__(self, name: str, address) -> None:
+        self.name = name
+        self.address = parse_address(address)
+
+    def _call(self, op: str, *args, timeout: float | None = 30.0):
+        return get_connection(self.address).call(op, *args, timeout=timeout)
+
+    def create_channel(self, remote_name: str) -> bool:
+        return self._call("create_channel", remote_name)
+
+    def close_channel(self, remote_name: str) -> bool:
+        return self._call("close_channel", remote_name)
+
+    def spawn(self, requests: List[tuple]) -> List[int]:
+        """
+        Start workers on the node: [(role, name_prefix, entry)] where
+        entry holds TcpChannel objects and participant ids. Returns the
+        node-local proc ids.
+        """
+        return self._call("spawn", requests, timeout=60.0)
+
+    def terminate(self, proc_ids: List[int]) -> int:
+        return self._call("terminate", list(proc_ids), timeout=60.0)
+
+    def info(self) -> dict:
+        return self._call("info")
+
+    def __repr__(self) -> str:
+        return f"NodeClient({self.name!r}, {self.address[0]}:{self.address[1]})"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="IPC Control Room node agent")
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="address to bind (default: loopback; others need an authkey)",
+    )
+    parser.add_argument(
+        "--authkey-file",
+        help=f"file holding the shared authkey (default: ${AUTHKEY_ENV})",
+    )
+    parser.add_argument("--port", type=int, default=7400)
+    parser.add_argument("--placement", default="none", help="CPU placement policy for workers")
+    parser.add_argument(
+        "--compute-roles",
+        help='comma-separated roles "isolate_compute" gives dedicated cores (default: rpc)',
+    )
+    args = parser.parse_args()
+
+    if args.authkey_file:
+        with open(args.authkey_file, "rb") as fh:
+            # Also used by this node's workers when they connect to other nodes
+            set_authkey(fh.read().strip())
+    if get_authkey() is None and not is_loopback(args.host):
+        parser.error(f"--host {args.host} needs an authkey: set {AUTHKEY_ENV} or --authkey-file")
+
+    from core.process_manager import ProcessManager
+
+    logger = AppLogger()
+    logger.register_sink(lambda message, level: print(f"[{level}] {message}", flush=True))
+    compute_roles = args.compute_roles.split(",") if args.compute_roles else None
+    process_manager = ProcessManager(
+        logger=logger, placement=args.placement, compute_roles=compute_roles
+    )
+    process_manager.output.start(interval=0.05)
+    process_manager.start_supervisor()
+
+    agent = NodeAgent(args.host, args.port, logger=logger, process_manager=process_manager)
+    agent.start()
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    try:
+        while not stop.wait(0.5):
+            pass
+    except KeyboardInterrupt:
+        pass
+    finally:
+        agent.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+# ipc_project/core/output_drain.py
+
+from __future__ import annotations
+
+import queue
+import selectors
+import threading
+import time
+from collections import deque
+from multiprocessing import Queue
+from typing import Any, Callable, Deque, Dict, Set
+
+
+# sink(proc_id, message) for every item a worker put on its out_queue
+OutputSink = Callable[[int, Any], None]
+
+
+class OutputDrainer:
+    """
+    Drains every worker's out_queue from one scheduler.
+
+    - Each queue's reader end (the pipe inside multiprocessing.Queue) is
+      registered with an epoll/poll selector, so a tick only touches
+      queues that actually have data, however many idle workers exist.
+    - Ready queues sit in a round-robin ring. A visit takes at most
+      `quantum` items before moving on, and a tick stops once its time or
+      item budget is spent. Queues not reached keep their place for the
+      next tick, so a chatty worker cannot starve the others, and the
+      caller (e.g. the Tk event loop) gets control back on time.
+    - drain() is driven by the dashboard's after() loop or, headless, by
+      the thread from start().
+    """
+
+    def __init__(
+        self,
+        sink: OutputSink,
+        time_budget: float = 0.005,
+        item_budget: int = 1000,
+        quantum: int = 16,
+    ) -> None:
+        self.sink = sink
+        self.time_budget = time_budget
+        self.item_budget = item_budget
+        self.quantum = quantum
+
+        self._queues: Dict[int, Queue] = {}
+        self._ready: Deque[int] = deque()
+        self._in_ready: Set[int] = set()
+        self._selector = selectors.DefaultSelector()
+        self._lock = threading.Lock()
+
+        # Counters for the stats readout
+        self.delivered = 0
+        self.budget_hits = 0
+
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # ------------------------------------------------------------------ #
+    # Internal helpers                                                   #
+    # ------------------------------------------------------------------ #
+
+    def _poll_ready(self) -> None:
+        """
+        Append queues that became readable to the end of the ring.
+        """
+        for key, _events in self._selector.select(0):
+            proc_id = key.data
+            if proc_id not in self._in_ready:
+                self._in_ready.add(proc_id)
+                self._ready.append(proc_id)
+
+    def _take(self, proc_id: int, limit: int) -> tuple[int, bool]:
+        """
+        Deliver up to `limit` items from one queue. Returns (count,
+        drained) where drained means the queue ran empty.
+        """
+        q = self._queues.get(proc_id)
+        if q is None:
+            return 0, True
+        count = 0
+        while count < limit:
+            try:
+                item = q.get_nowait()
+            except queue.Empty:
+                return count, True
+            except (OSError, EOFError, ValueError):
+                # Closed queue; treat as drained
+                return count, True
+            count += 1
+            try:
+                if isinstance(item, tuple) and len(item) == 2:
+                    self.sink(item[0], item[1])
+                else:
+                    self.sink(proc_id, item)
+            except Exception:
+                # A faulty sink must not stall the scheduler
+                pass
+        return count, False
+
+    def _run(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                # Keep going without sleeping while a tick hits its budget
+                while self.drain() and not self._stop.is_set():
+                    pass
+            except Exception:
+                pass
+
+    # ------------------------------------------------------------------ #
+    # Public API                                                         #
+    # ------------------------------------------------------------------ #
+
+    def add(self, proc_id: int, out_queue: Queue) -> None:
+        with self._lock:
+            if proc_id in self._queues:
+                return
+            self._queues[proc_id] = out_queue
+            self._selector.register(out_queue._reader, selectors.EVENT_READ, proc_id)
+
+    def remove(self, proc_id: int, flush: bool = True) -> int:
+        """
+        Stop draining a queue, delivering what is left in it first.
+        Returns the number of items flushed.
+        """
+        flushed = self.flush(proc_id) if flush else 0
+        with self._lock:
+            out_queue = self._queues.pop(proc_id, None)
+            if out_queue is not None:
+                try:
+                    self._selector.unregister(out_queue._reader)
+                except (KeyError, ValueError):
+                    pass
+            if proc_id in self._in_ready:
+                self._in_ready.discard(proc_id)
+                try:
+                    self._ready.remove(proc_id)
+                except ValueError:
+                    pass
+        return flushed
+
+    def flush(self, proc_id: int, limit: int = 10_000) -> int:
+        """
+        Drain one queue now, outside the budget (used while a worker is
+        being stopped, so its feeder thread is never stuck on a full pipe).
+        """
+        with self._lock:
+            return self._take(proc_id, limit)[0]
+
+    def drain(self) -> bool:
+        """
+        One scheduler tick. Returns True if the budget ran out with data
+        still pending, False if every ready queue was emptied.
+        """
+        with self._lock:
+            self._poll_ready()
+            deadline = time.perf_counter() + self.time_budget
+            remaining = self.item_budget
+
+            while self._ready and remaining > 0:
+                proc_id = self._ready.popleft()
+                count, drained = self._take(proc_id, min(self.quantum, remaining))
+                remaining -= count
+                self.delivered += count
+                if drained:
+                    # Level-triggered: the selector reports it again once
+                    # the worker puts more
+                    self._in_ready.discard(proc_id)
+                else:
+                    self._ready.append(proc_id)
+                if time.perf_counter() >= deadline:
+                    break
+
+            if self._ready:
+                self.budget_hits += 1
+                return True
+            return False
+
+    def pending(self) -> int:
+        """
+        Queues known to hold data that a previous tick did not reach.
+        """
+        return len(self._ready)
+
+    def __len__(self) -> int:
+        return len(self._queues)
+
+    def start(self, interval: float = 0.05) -> None:
+        """
+        Headless mode: drain from a background thread every `interval` s.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(interval,), name="output-drain", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def close(self) -> None:
+        self.stop()
+        with self._lock:
+            self._selector.close()
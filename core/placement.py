@@ -0,0 +1,157 @@
+# ipc_project/core/placement.py
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Set
+
+from core.utils.cpu_topology import CpuTopology
+
+
+PLACEMENT_POLICIES = ("none", "pin", "spread", "pack_pairs", "isolate_compute")
+
+# Default roles that get dedicated cores under "isolate_compute": RPC
+# servers do the per-request work, ping/echo only forward messages
+COMPUTE_ROLES = frozenset({"rpc"})
+
+
+class CpuPlacer:
+    """
+    Chooses a CPU set for each new worker according to a placement policy.
+
+    - none:            no affinity, the scheduler decides.
+    - pin:             one CPU per worker, round-robin in CPU order.
+    - spread:          one CPU per worker, balancing load across packages,
+                       then cores, then SMT siblings.
+    - pack_pairs:      a worker started with a partner goes on the partner's
+                       SMT sibling (or at least its package) so they share
+                       cache; unpaired workers are spread. Hosted workers
+                       are placed as their WorkerHost process: their own
+                       partner is ignored, and a worker paired with one is
+                       packed next to its host.
+    - isolate_compute: `compute_roles` (default COMPUTE_ROLES) get a whole
+                       core to themselves; all other workers share the
+                       remaining CPUs.
+    """
+
+    def __init__(
+        self,
+        topology: CpuTopology,
+        policy: str = "none",
+        compute_roles: Iterable[str] | None = None,
+    ) -> None:
+        if policy not in PLACEMENT_POLICIES:
+            raise ValueError(f"Unknown placement policy '{policy}'")
+        self.topology = topology
+        self.policy = policy
+        self.compute_roles = frozenset(COMPUTE_ROLES if compute_roles is None else compute_roles)
+
+        self._load: Dict[int, int] = {cpu: 0 for cpu in topology.cpu_ids()}
+        self._assigned: Dict[int, Set[int]] = {}
+        self._reserved: Set[int] = set()
+        # Workers whose CPUs were not added to the load counts
+        self._uncounted: Set[int] = set()
+        self._next_pin = 0
+
+    # ------------------------------------------------------------------ #
+    # Internal helpers                                                   #
+    # ------------------------------------------------------------------ #
+
+    def _least_loaded(self, candidates: List[int]) -> int:
+        topo = self.topology
+
+        def key(cpu: int):
+            info = topo.info(cpu)
+            package_load = sum(self._load[c] for c in topo.same_package(cpu)) + self._load[cpu]
+            core_load = sum(self._load[c] for c in topo.siblings(cpu)) + self._load[cpu]
+            return (self._load[cpu], core_load, package_load, info.package, cpu)
+
+        return min(candidates, key=key)
+
+    def _shared_cpus(self) -> List[int]:
+        shared = [cpu for cpu in self.topology.cpu_ids() if cpu not in self._reserved]
+        return shared or self.topology.cpu_ids()
+
+    def _spread(self) -> Set[int]:
+        return {self._least_loaded(self._shared_cpus())}
+
+    def _pin(self) -> Set[int]:
+        cpus = self._shared_cpus()
+        cpu = cpus[self._next_pin % len(cpus)]
+        self._next_pin += 1
+        return {cpu}
+
+    def _pack_with(self, partner: int | None) -> Set[int]:
+        partner_cpus = self._assigned.get(partner) if partner is not None else None
+        if not partner_cpus:
+            return self._spread()
+
+        anchor = min(partner_cpus)
+        siblings = [c for c in self.topology.siblings(anchor) if c not in self._reserved]
+        if siblings:
+            return {self._least_loaded(siblings)}
+        package = [c for c in self.topology.same_package(anchor) if c not in self._reserved]
+        if package:
+            return {self._least_loaded(package)}
+        # Single CPU package without SMT: share the partner's CPU
+        return {anchor}
+
+    def _isolate(self, role: str) -> Set[int]:
+        if role not in self.compute_roles:
+            return set(self._shared_cpus())
+
+        # Reserve the first core that is not reserved yet
+        for cpus in self.topology.cores().values():
+            if any(c in self._reserved for c in cpus):
+                continue
+            if len(self._reserved) + len(cpus) >= len(self._load):
+                # Always leave something for the other workers
+                break
+            self._reserved.update(cpus)
+            return set(cpus)
+        return self._spread()
+
+    # ------------------------------------------------------------------ #
+    # Public API                                                         #
+    # ------------------------------------------------------------------ #
+
+    def place(self, proc_id: int, role: str, partner: int | None = None) -> Set[int] | None:
+        """
+        CPU set for a new worker, or None if no affinity should be applied.
+        """
+        if self.policy == "none":
+            return None
+        if self.policy == "pin":
+            cpus = self._pin()
+        elif self.policy == "spread":
+            cpus = self._spread()
+        elif self.policy == "pack_pairs":
+            cpus = self._pack_with(partner)
+        else:
+            cpus = self._isolate(role)
+
+        self._assigned[proc_id] = cpus
+        if self.policy == "isolate_compute" and role not in self.compute_roles:
+            # Shared workers float over the shared set; they add no load
+            self._uncounted.add(proc_id)
+            return cpus
+        for cpu in cpus:
+            self._load[cpu] += 1
+        return cpus
+
+    def shared_cpus(self) -> Set[int]:
+        """
+        CPUs not reserved for compute workers.
+        """
+        return set(self._shared_cpus())
+
+    def release(self, proc_id: int) -> None:
+        cpus = self._assigned.pop(proc_id, None)
+        if not cpus:
+            return
+        if proc_id in self._uncounted:
+            self._uncounted.discard(proc_id)
+            return
+        for cpu in cpus:
+            self._load[cpu] = max(0, self._load[cpu] - 1)
+        if cpus <= self._reserved:
+            self._reserved.difference_update(cpus)
@@ -2,15 +2,42 @@
 
 from __future__ import annotations
 
+import os
+import threading
+import time
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Callable, Dict, Iterable, List
 
 from core.utils.logger import AppLogger
+from core.utils.proc_stats import ProcSampler, WorkerStats
+from core.utils.cpu_topology import CpuTopology
+from core.placement import CpuPlacer
+from core.output_drain import OutputDrainer
+from core.status_table import (
+    STATE_FAILED,
+    STATE_RUNNING,
+    STATE_STARTING,
+    WorkerStatusTable,
+)
 from multiprocessing import Queue
+from processes.base_process import BaseWorker
 from processes.ping_process import PingWorker
 from processes.echo_process import EchoWorker
+from processes.rpc_process import RpcServerWorker
+from processes.worker_host import WorkerHost
 
 
+# Builds a fresh worker from (proc_id, name, cmd_queue, out_queue); kept
+# so the supervisor can restart the worker with the same arguments
+WorkerFactory = Callable[[int, str, Queue, Queue], BaseWorker]
+
+# listener(event, info) with event "added", "updated" or "removed"
+ProcessListener = Callable[[str, "ProcessInfo"], None]
+
+# Roles that may run hosted (WorkerRequest.hosted): their run_loop only
+# waits in receives bounded by receive_timeout, which WorkerHost sets to 0
+LIGHTWEIGHT_ROLES = frozenset({"ping", "echo"})
+
 
 @dataclass
 class ProcessInfo:
@@ -18,34 +45,351 @@ class ProcessInfo:
     name: str
     role: str
     status: str = "created"
+    pid: int | None = None
+    slot: int | None = None
+    restarts: int = 0
+    cpus: List[int] | None = None
+    # Proc id of the WorkerHost running this worker (None: own process)
+    host: int | None = None
+
+
+@dataclass
+class WorkerRequest:
+    """
+    One worker for ProcessManager.spawn_workers().
+    """
+
+    name_prefix: str
+    role: str
+    factory: WorkerFactory
+    # Index of an earlier request in the same batch that this worker
+    # talks to (placement hint for "pack_pairs")
+    partner_index: int | None = None
+    # Run as a logical worker in a shared WorkerHost (LIGHTWEIGHT_ROLES only)
+    hosted: bool = False
+
+
+@dataclass
+class _WorkerRecord:
+    worker: BaseWorker
+    factory: WorkerFactory
+    cmd_q: Queue
+    out_q: Queue
 
 
 class ProcessManager:
     """
-    Manages processes (for now: logical/test processes).
-    Later, this will spawn actual multiprocessing.Process workers.
+    Manages processes: logical/test entries and real BaseWorker processes.
+
+    Workers get a slot in a shared-memory WorkerStatusTable and heartbeat
+    into it. An optional supervisor thread scans the table and restarts
+    workers whose heartbeat has lapsed or that died with an error.
+
+    New workers are pinned to CPUs according to a placement policy (see
+    CpuPlacer); the default "none" leaves placement to the OS scheduler.
+    `compute_roles` picks the roles "isolate_compute" gives dedicated
+    cores (default: placement.COMPUTE_ROLES).
+
+    Worker out_queues are read by one OutputDrainer (self.output), which
+    the dashboard ticks from its event loop; headless callers start its
+    thread. Messages end up in the logger, tagged with the process id.
+
+    spawn_workers() runs requests marked `hosted` as logical workers, up
+    to `host_capacity` per WorkerHost process (0 disables hosting). They
+    keep their own proc ids, commands and output; the host is what gets
+    a status slot, CPU placement, supervision and /proc sampling
+    (get_worker_stats() of a hosted worker returns its host's). A hosted
+    worker's partner_index is ignored; a worker paired with a hosted one
+    is placed next to its host.
+
+    Listeners registered with register_listener() are told about every
+    added, updated and removed process, so views can apply diffs instead
+    of re-reading list_processes().
     """
 
-    def __init__(self, logger: AppLogger) -> None:
+    def __init__(
+        self,
+        logger: AppLogger,
+        max_workers: int = 1024,
+        placement: str = "none",
+        host_capacity: int = 256,
+        compute_roles: Iterable[str] | None = None,
+    ) -> None:
         self.logger = logger
         self._next_id: int = 1
         self._processes: Dict[int, ProcessInfo] = {}
+        self._workers: Dict[int, _WorkerRecord] = {}
+        self._lock = threading.RLock()
+        self._listeners: List[ProcessListener] = []
+
+        self.host_capacity = host_capacity
+        # host proc id -> {member proc id: (name, factory)}
+        self._hosts: Dict[int, Dict[int, tuple]] = {}
+        # member proc id -> host proc id
+        self._hosted: Dict[int, int] = {}
+
+        self.status_table = WorkerStatusTable(capacity=max_workers)
+
+        self._supervisor: threading.Thread | None = None
+        self._supervisor_stop = threading.Event()
+
+        self._sampler: ProcSampler | None = None
+
+        self.topology = CpuTopology.detect()
+        self.placer = CpuPlacer(self.topology, placement, compute_roles)
+
+        self.output = OutputDrainer(self._on_worker_output)
+
+    # ------------------------------------------------------------------ #
+    # Internal helpers                                                    #
+    # ------------------------------------------------------------------ #
+
+    def _allocate_id(self) -> int:
+        with self._lock:
+            proc_id = self._next_id
+            self._next_id += 1
+        return proc_id
+
+    def _notify(self, event: str, info: ProcessInfo) -> None:
+        # Called from whichever thread made the change
+        for listener in self._listeners:
+            try:
+                listener(event, info)
+            except Exception:
+                # A faulty view must not break process management
+                pass
+
+    def _on_worker_output(self, proc_id: int, message) -> None:
+        self.logger.bind(proc_id=proc_id).info("[Worker:%d] %s", proc_id, message)
+
+    def _start_worker(self, info: ProcessInfo, record: _WorkerRecord) -> None:
+        worker = record.worker
+        worker.status_table = self.status_table if info.slot is not None else None
+        worker.status_slot = info.slot
+        worker.cpu_affinity = set(info.cpus) if info.cpus else None
+        worker.start()
+        info.pid = worker.pid
+        info.status = "running"
+        self._notify("updated", info)
+
+        for member_id in self._hosts.get(info.id, ()):
+            member = self._processes[member_id]
+            member.pid = info.pid
+            member.status = "running"
+            self._notify("updated", member)
+
+    def _place(self, info: ProcessInfo, partner: int | None) -> None:
+        cpus = self.placer.place(info.id, info.role, partner)
+        info.cpus = sorted(cpus) if cpus else None
+        if not cpus:
+            return
+        self.logger.bind(proc_id=info.id).info(
+            f"Process {info.id} ({info.role}) placed on CPUs {info.cpus}"
+        )
+
+        if self.placer.policy == "isolate_compute" and info.role in self.placer.compute_roles:
+            # Move shared workers off the newly reserved core
+            self._apply_shared_cpus(exclude=info.id)
+
+    def _apply_shared_cpus(self, exclude: int | None = None) -> None:
+        """
+        Give every placed shared worker the current shared CPU set. Those
+        prepared but not started yet only get info.cpus (applied at start).
+        """
+        shared = self.placer.shared_cpus()
+        for other in self._processes.values():
+            if (
+                other.role in self.placer.compute_roles
+                or other.cpus is None
+                or other.id == exclude
+            ):
+                continue
+            other.cpus = sorted(shared)
+            if other.pid is None:
+                continue
+            try:
+                os.sched_setaffinity(other.pid, shared)
+            except (AttributeError, OSError):
+                pass
+
+    def _release_cpus(self, info: ProcessInfo) -> None:
+        widened = (
+            info.role in self.placer.compute_roles and self.placer.policy == "isolate_compute"
+        )
+        self.placer.release(info.id)
+        if widened:
+            # Let shared workers use the core the compute worker gave back
+            self._apply_shared_cpus()
+
+    def _prepare(
+        self,
+        name_prefix: str,
+        role: str,
+        factory: WorkerFactory,
+        partner: int | None = None,
+    ):
+        """
+        Build and register a worker without starting it.
+        """
+        proc_id = self._allocate_id()
+        name = f"{name_prefix}_{proc_id}"
+
+        cmd_q = Queue()
+        out_q = Queue()
+        worker = factory(proc_id, name, cmd_q, out_q)
+
+        with self._lock:
+            slot = self.status_table.claim_slot(proc_id)
+            if slot is None:
+                self.logger.warning(
+                    f"Status table full, process {proc_id} will not be supervised"
+                )
+            info = ProcessInfo(id=proc_id, name=name, role=role, slot=slot)
+            self._place(info, partner)
+            record = _WorkerRecord(worker, factory, cmd_q, out_q)
+            self._processes[proc_id] = info
+            self._workers[proc_id] = record
+        self.output.add(proc_id, out_q)
+        self._notify("added", info)
+        return info, record
+
+    def _prepare_host(self, requests: List[WorkerRequest]):
+        """
+        Register logical workers for `requests` and build (not start) the
+        WorkerHost that runs them.
+        """
+        members: Dict[int, tuple] = {}
+        infos = []
+        for req in requests:
+            member_id = self._allocate_id()
+            name = f"{req.name_prefix}_{member_id}"
+            members[member_id] = (name, req.factory)
+            infos.append(ProcessInfo(id=member_id, name=name, role=req.role))
+
+        def factory(proc_id, name, cmd_q, out_q):
+            # Also used on restart, with whichever members are still alive
+            return WorkerHost(
+                proc_id, name, cmd_q, out_q,
+                [(member_id, n, f) for member_id, (n, f) in members.items()],
+            )
+
+        host_info, record = self._prepare("Host", "host", factory)
+        with self._lock:
+            self._hosts[host_info.id] = members
+            for info in infos:
+                info.host = host_info.id
+                self._processes[info.id] = info
+                self._hosted[info.id] = host_info.id
+        for info in infos:
+            self._notify("added", info)
+        return host_info, record, infos
+
+    def _spawn(self, name_prefix: str, role: str, factory: WorkerFactory, partner: int | None = None):
+        info, record = self._prepare(name_prefix, role, factory, partner)
+        with self._lock:
+            self._start_worker(info, record)
+        return info.id, record.worker, record.out_q
+
+    def _join_draining(self, proc_id: int, worker: BaseWorker, deadline: float) -> None:
+        """
+        Join a worker while draining its out_queue: the worker's queue
+        feeder thread cannot finish (and so the worker cannot exit) while
+        the pipe behind the queue is full.
+        """
+        while worker.is_alive():
+            self.output.flush(proc_id)
+            left = deadline - time.monotonic()
+            if left <= 0:
+                break
+            worker.join(min(0.05, left))
+
+    def _stop_worker(self, proc_id: int, worker: BaseWorker, cmd_q: Queue, timeout: float) -> None:
+        if worker.is_alive():
+            try:
+                cmd_q.put("stop")
+            except Exception:
+                pass
+            self._join_draining(proc_id, worker, time.monotonic() + timeout)
+            if worker.is_alive():
+                worker.terminate()
+                worker.join(timeout)
+        self.output.remove(proc_id)
+
+    def _restart(self, proc_id: int, reason: str) -> None:
+        with self._lock:
+            info = self._processes.get(proc_id)
+            record = self._workers.get(proc_id)
+            if info is None or record is None:
+                return
+
+            self.logger.bind(proc_id=proc_id).warning(
+                f"Restarting process {proc_id} ({info.name}): {reason}"
+            )
+            old = record.worker
+            if old.is_alive():
+                old.terminate()
+                old.join(1.0)
+
+            record.worker = record.factory(proc_id, info.name, record.cmd_q, record.out_q)
+            if info.slot is not None:
+                self.status_table.release_slot(info.slot)
+                info.slot = self.status_table.claim_slot(proc_id)
+            info.restarts += 1
+            self._start_worker(info, record)
+
+    def _supervise(self, interval: float, heartbeat_timeout: float, max_restarts: int) -> None:
+        while not self._supervisor_stop.wait(interval):
+            now = time.monotonic()
+            # One copy of the whole table per check
+            for status in self.status_table.scan():
+                reason = None
+                if status.state == STATE_FAILED:
+                    reason = f"worker reported error {status.last_error}"
+                elif (
+                    status.state in (STATE_RUNNING, STATE_STARTING)
+                    and now - status.heartbeat > heartbeat_timeout
+                ):
+                    reason = f"no heartbeat for {now - status.heartbeat:.1f}s"
+                if reason is None:
+                    continue
+
+                info = self._processes.get(status.proc_id)
+                if info is None or info.status != "running":
+                    continue
+                if info.restarts >= max_restarts:
+                    info.status = "failed"
+                    self._notify("updated", info)
+                    self.logger.bind(proc_id=info.id).error(
+                        f"Process {info.id} ({info.name}) exceeded {max_restarts} restarts: {reason}"
+                    )
+                    continue
+                try:
+                    self._restart(status.proc_id, reason)
+                except Exception as exc:
+                    self.logger.bind(proc_id=status.proc_id).error(
+                        f"Restart of process {status.proc_id} failed: {exc!r}"
+                    )
+
+    # ------------------------------------------------------------------ #
+    # Public API                                                          #
+    # ------------------------------------------------------------------ #
 
     def create_dummy_process(self, name: str | None = None, role: str = "Test") -> Dict:
         """
         For early GUI work: create a fake process entry and return its info as dict.
         Later, replace with real process spawning.
         """
-        proc_id = self._next_id
-        self._next_id += 1
+        proc_id = self._allocate_id()
 
         if name is None:
             name = f"proc_{proc_id}"
 
         info = ProcessInfo(id=proc_id, name=name, role=role, status="running")
-        self._processes[proc_id] = info
+        with self._lock:
+            self._processes[proc_id] = info
+        self._notify("added", info)
 
-        self.logger.info(f"Process registered: id={proc_id}, name={name}, role={role}")
+        self.logger.bind(proc_id=proc_id).info(f"Process registered: id={proc_id}, name={name}, role={role}")
         return {
             "id": proc_id,
             "name": name,
@@ -53,55 +397,349 @@ class ProcessManager:
             "status": info.status,
         }
 
+    def register_listener(self, listener: ProcessListener) -> None:
+        """
+        Register a change callback: listener(event, info), event being
+        "added", "updated" or "removed". It runs on the thread that made
+        the change (GUI thread, supervisor, ...), so keep it cheap.
+        """
+        self._listeners.append(listener)
+
+    def unregister_listener(self, listener: ProcessListener) -> None:
+        try:
+            self._listeners.remove(listener)
+        except ValueError:
+            pass
+
     def list_processes(self) -> List[ProcessInfo]:
-        return list(self._processes.values())
+        with self._lock:
+            return list(self._processes.values())
 
-    def terminate_process(self, proc_id: int) -> bool:
+    def get_worker(self, proc_id: int) -> BaseWorker | None:
+        record = self._workers.get(proc_id)
+        return None if record is None else record.worker
+
+    def send_command(self, proc_id: int, cmd) -> bool:
         """
-        Placeholder for termination logic.
+        Put a command on a worker's cmd_queue.
         """
-        info = self._processes.get(proc_id)
-        if not info:
-            self.logger.warning(f"Terminate requested for unknown process: {proc_id}")
+        host_id = self._hosted.get(proc_id)
+        if host_id is not None:
+            # The host routes (proc_id, cmd) to the logical worker
+            proc_id, cmd = host_id, (proc_id, cmd)
+        record = self._workers.get(proc_id)
+        if record is None:
+            self.logger.warning(f"Command for unknown worker: {proc_id}")
             return False
+        record.cmd_q.put(cmd)
+        return True
+
+    def start_profiling(self, proc_id: int, mode: str = "cprofile") -> bool:
+        """
+        Ask a running worker to start profiling itself ("cprofile" or
+        "sampler"). The worker reports on its out_queue.
+        """
+        self.logger.info(f"Profiling process {proc_id} ({mode})")
+        return self.send_command(proc_id, f"profile start {mode}")
+
+    def stop_profiling(self, proc_id: int) -> bool:
+        """
+        Ask a worker to stop profiling; it writes a .pstats file and sends
+        a summary of the hottest functions on its out_queue.
+        """
+        return self.send_command(proc_id, "profile stop")
+
+    def spawn_workers(self, requests: List[WorkerRequest], wait: float | None = None) -> List[int]:
+        """
+        Bulk start: build, register and place every worker first, then
+        fork them back-to-back so they initialise concurrently. With
+        `wait`, block up to that many seconds until all report running.
+
+        Requests marked `hosted` are packed into WorkerHost processes (see
+        host_capacity); their ids are still returned in request order.
+        Raises ValueError for a hosted request whose role is not in
+        LIGHTWEIGHT_ROLES.
+
+        Returns the proc ids in request order. If building or starting
+        any worker fails, the ones already prepared or started are
+        terminated before the exception propagates.
+        """
+        for req in requests:
+            if req.hosted and req.role not in LIGHTWEIGHT_ROLES:
+                raise ValueError(f"role '{req.role}' cannot be hosted")
+
+        proc_ids: List[int | None] = [None] * len(requests)
+        prepared = []
+        try:
+            # Hosts first, so workers paired with a hosted worker can be
+            # placed next to its host
+            hosted = [i for i, req in enumerate(requests) if req.hosted and self.host_capacity > 0]
+            for start in range(0, len(hosted), self.host_capacity or 1):
+                chunk = hosted[start : start + self.host_capacity]
+                host_info, record, members = self._prepare_host([requests[i] for i in chunk])
+                prepared.append((host_info, record))
+                for index, member in zip(chunk, members):
+                    proc_ids[index] = member.id
+
+            for index, req in enumerate(requests):
+                if proc_ids[index] is not None:
+                    continue
+                partner = None
+                if req.partner_index is not None:
+                    # None while the partner is a later, not yet prepared request
+                    partner = proc_ids[req.partner_index]
+                    partner = self._hosted.get(partner, partner)
+                info, record = self._prepare(req.name_prefix, req.role, req.factory, partner)
+                prepared.append((info, record))
+                proc_ids[index] = info.id
+
+            started = time.monotonic()
+            with self._lock:
+                for info, record in prepared:
+                    self._start_worker(info, record)
+            self.logger.info(
+                f"Started {len(proc_ids)} workers ({len(prepared)} processes) "
+                f"in {time.monotonic() - started:.2f}s"
+            )
+        except Exception as exc:
+            # The caller never gets these ids, so nobody else could stop them
+            self.logger.error(f"Bulk start failed after {len(prepared)} processes: {exc!r}")
+            self.terminate_processes([info.id for info, _record in prepared])
+            raise
 
-        info.status = "terminated"
-        self.logger.info(f"Process terminated: id={proc_id}, name={info.name}")
-        # Later, actually kill the underlying multiprocessing.Process
+        if wait is not None:
+            self.wait_running([info.id for info, _record in prepared], wait)
+        return proc_ids
+
+    def wait_running(self, proc_ids: List[int], timeout: float) -> bool:
+        """
+        Wait until the given workers have marked themselves running in the
+        status table (unsupervised workers count as running once started).
+        """
+        pending = {
+            self._processes[pid].slot
+            for pid in proc_ids
+            if pid in self._processes and self._processes[pid].slot is not None
+        }
+        deadline = time.monotonic() + timeout
+        while pending:
+            for status in self.status_table.scan():
+                if status.slot in pending and status.state != STATE_STARTING:
+                    pending.discard(status.slot)
+            if not pending or time.monotonic() >= deadline:
+                break
+            time.sleep(0.01)
+        if pending:
+            self.logger.warning(f"{len(pending)} workers not running after {timeout}s")
+        return not pending
+
+    def terminate_process(self, proc_id: int, timeout: float = 2.0) -> bool:
+        """
+        Stop a process: ask the worker to stop, then terminate it if it
+        does not exit within `timeout`.
+        """
+        if proc_id in self._hosted or proc_id in self._hosts:
+            return self.terminate_processes([proc_id], timeout) > 0
+
+        with self._lock:
+            info = self._processes.get(proc_id)
+            if not info:
+                self.logger.warning(f"Terminate requested for unknown process: {proc_id}")
+                return False
+            # Mark first so the supervisor does not restart it
+            info.status = "terminated"
+            record = self._workers.pop(proc_id, None)
+
+        if record is not None:
+            self._stop_worker(proc_id, record.worker, record.cmd_q, timeout)
+            self._release_cpus(info)
+            if info.slot is not None:
+                self.status_table.release_slot(info.slot)
+                info.slot = None
+
+        self._notify("removed", info)
+        self.logger.bind(proc_id=proc_id).info(f"Process terminated: id={proc_id}, name={info.name}")
         return True
-    def create_ping_process(self, channel, sender_id):
+
+    def terminate_processes(self, proc_ids: List[int], timeout: float = 2.0) -> int:
         """
-        Create a ping process that sends PING every second.
+        Stop many processes at once: every worker is asked to stop first,
+        then all are joined, so N workers take about one timeout instead
+        of N. Returns the number of known processes stopped.
+
+        Stopping a host stops its logical workers; a host whose last
+        logical worker is stopped is stopped too.
         """
-        proc_id = self._next_id
-        self._next_id += 1
+        stopping = []
+        emptied = []
+        host_stops: Dict[int, List[int]] = {}
+        with self._lock:
+            for proc_id in proc_ids:
+                info = self._processes.get(proc_id)
+                if info is None or info.status == "terminated":
+                    continue
+                host_id = self._hosted.pop(proc_id, None)
+                if host_id is not None:
+                    info.status = "terminated"
+                    self._hosts.get(host_id, {}).pop(proc_id, None)
+                    host_stops.setdefault(host_id, []).append(proc_id)
+                    stopping.append((info, None))
+                    continue
 
-        cmd_q = Queue()
-        out_q = Queue()
+                for member_id in self._hosts.pop(proc_id, {}):
+                    member = self._processes[member_id]
+                    member.status = "terminated"
+                    self._hosted.pop(member_id, None)
+                    stopping.append((member, None))
 
-        worker = PingWorker(proc_id, f"Ping_{proc_id}", cmd_q, out_q, channel, sender_id)
-        worker.start()
+                info.status = "terminated"
+                record = self._workers.pop(proc_id, None)
+                stopping.append((info, record))
+                if record is not None and record.worker.is_alive():
+                    try:
+                        record.cmd_q.put("stop")
+                    except Exception:
+                        pass
 
-        self._processes[proc_id] = worker
+            for host_id, member_ids in host_stops.items():
+                host = self._workers.get(host_id)
+                if host is None:
+                    continue
+                if self._hosts.get(host_id):
+                    for member_id in member_ids:
+                        host.cmd_q.put((member_id, "stop"))
+                elif host_id not in proc_ids:
+                    # Last member gone: stop the whole host instead
+                    emptied.append(host_id)
 
-        self.logger.info(f"Ping process started (id={proc_id})")
-        return proc_id, worker, out_q
+        deadline = time.monotonic() + timeout
+        for info, record in stopping:
+            if record is not None:
+                self._join_draining(info.id, record.worker, deadline)
+        for info, record in stopping:
+            if record is not None:
+                if record.worker.is_alive():
+                    record.worker.terminate()
+                    record.worker.join(timeout)
+                self.output.remove(info.id)
+                self._release_cpus(info)
+            if info.slot is not None:
+                self.status_table.release_slot(info.slot)
+                info.slot = None
+            self._notify("removed", info)
+
+        if stopping:
+            self.logger.info(f"Terminated {len(stopping)} processes")
+        if emptied:
+            self.terminate_processes(emptied, timeout)
+        return len(stopping)
+
+    def start_supervisor(
+        self,
+        interval: float = 1.0,
+        heartbeat_timeout: float = 5.0,
+        max_restarts: int = 5,
+    ) -> None:
+        """
+        Start the background thread that restarts dead or hung workers.
+        """
+        if self._supervisor is not None and self._supervisor.is_alive():
+            return
+        self._supervisor_stop.clear()
+        self._supervisor = threading.Thread(
+            target=self._supervise,
+            args=(interval, heartbeat_timeout, max_restarts),
+            name="process-supervisor",
+            daemon=True,
+        )
+        self._supervisor.start()
+        self.logger.info(
+            f"Supervisor started (interval={interval}s, heartbeat timeout={heartbeat_timeout}s)"
+        )
+
+    def stop_supervisor(self) -> None:
+        self._supervisor_stop.set()
+        if self._supervisor is not None:
+            self._supervisor.join(timeout=5.0)
+            self._supervisor = None
+
+    def _sample_targets(self):
+        with self._lock:
+            return [
+                (info.id, info.pid)
+                for info in self._processes.values()
+                if info.pid is not None and info.status == "running" and info.host is None
+            ]
+
+    def start_sampler(self, interval: float = 1.0, history: int = 120) -> None:
+        """
+        Start sampling CPU%, RSS and context switches of running workers
+        from /proc every `interval` seconds, keeping `history` samples.
+        """
+        if self._sampler is not None:
+            return
+        self._sampler = ProcSampler(self._sample_targets, interval=interval, history=history)
+        self._sampler.start()
+        self.logger.info(f"Process sampler started (interval={interval}s)")
+
+    def get_worker_stats(self, proc_id: int) -> WorkerStats | None:
+        """
+        Sampled stats of a worker; for a hosted worker, those of the host
+        process it shares with the other members.
+        """
+        if self._sampler is None:
+            return None
+        return self._sampler.get(self._hosted.get(proc_id, proc_id))
+
+    def shutdown(self, timeout: float = 2.0) -> None:
+        """
+        Stop the supervisor, sampler, output drain and all workers, then
+        free the status table.
+        """
+        self.stop_supervisor()
+        if self._sampler is not None:
+            self._sampler.stop()
+            self._sampler = None
+        self.terminate_processes(list(self._hosted) + list(self._workers), timeout)
+        self.output.close()
+        self.status_table.close()
+
+    def create_ping_process(self, channel, sender_id):
+        """
+        Create a ping process that sends PING every second.
+        """
+        def factory(proc_id, name, cmd_q, out_q):
+            return PingWorker(proc_id, name, cmd_q, out_q, channel, sender_id)
 
+        proc_id, worker, out_q = self._spawn("Ping", "ping", factory)
+
+        self.logger.bind(proc_id=proc_id).info(f"Ping process started (id={proc_id})")
+        return proc_id, worker, out_q
 
-    def create_echo_process(self, channel, receiver_id, sender_id):
+    def create_echo_process(self, channel, receiver_id, sender_id, pair_with=None):
         """
         Create an echo worker that echoes messages it receives.
+
+        pair_with: proc id of the worker it talks to (e.g. the Ping
+        worker); the "pack_pairs" placement policy puts them on sibling CPUs.
         """
-        proc_id = self._next_id
-        self._next_id += 1
+        def factory(proc_id, name, cmd_q, out_q):
+            return EchoWorker(proc_id, name, cmd_q, out_q, channel, receiver_id, sender_id)
 
-        cmd_q = Queue()
-        out_q = Queue()
+        proc_id, worker, out_q = self._spawn("Echo", "echo", factory, partner=pair_with)
 
-        worker = EchoWorker(proc_id, f"Echo_{proc_id}", cmd_q, out_q, channel, receiver_id, sender_id)
-        worker.start()
+        self.logger.bind(proc_id=proc_id).info(f"Echo process started (id={proc_id})")
+        return proc_id, worker, out_q
+
+    def create_rpc_server_process(self, channel, server_id, worker_cls=RpcServerWorker, reply_channel=None):
+        """
+        Create an RPC server worker (RpcServerWorker or a subclass) that
+        answers RpcClient requests arriving on the channel.
+        """
+        def factory(proc_id, name, cmd_q, out_q):
+            return worker_cls(proc_id, name, cmd_q, out_q, channel, server_id, reply_channel)
 
-        self._processes[proc_id] = worker
+        proc_id, worker, out_q = self._spawn("Rpc", "rpc", factory)
 
-        self.logger.info(f"Echo process started (id={proc_id})")
+        self.logger.bind(proc_id=proc_id).info(f"RPC server process started (id={proc_id})")
         return proc_id, worker, out_q
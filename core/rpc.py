@@ -0,0 +1,208 @@
+# ipc_project/core/rpc.py
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+
+@dataclass
+class RpcRequest:
+    call_id: int
+    client_id: int
+    method: str
+    args: Tuple[Any, ...] = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class RpcResponse:
+    call_id: int
+    ok: bool
+    result: Any = None
+    error: str | None = None
+
+
+class RpcError(Exception):
+    """
+    Raised on the caller side when the remote handler failed.
+    """
+
+
+class RpcClient:
+    """
+    Caller side of the request/response protocol.
+
+    - Every request carries a call_id; replies are matched back to the
+      caller's Future, so many calls can be in flight on one connection.
+    - Requests go out on `channel`; replies are read from the reverse
+      direction of a PipeChannel, or from `reply_channel` if given.
+    - A background thread reads replies and fails calls whose timeout
+      has expired with TimeoutError.
+
+    One client per connection: replies for unknown call ids are dropped.
+    """
+
+    def __init__(
+        self,
+        channel: Any,
+        client_id: int,
+        reply_channel: Any | None = None,
+        default_timeout: float | None = 5.0,
+    ) -> None:
+        self.channel = channel
+        self.client_id = client_id
+        self.reply_channel = reply_channel
+        self.default_timeout = default_timeout
+        self.logger = channel.logger
+
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        # call_id -> (future, deadline or None)
+        self._pending: Dict[int, Tuple[Future, float | None]] = {}
+        # (deadline, call_id); entries for answered calls are skipped lazily
+        self._deadlines: List[Tuple[float, int]] = []
+
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._reply_loop,
+            name=f"rpc-client-{channel.name}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    # ------------------------------------------------------------------ #
+    # Internal helpers                                                   #
+    # ------------------------------------------------------------------ #
+
+    def _receive_reply(self, timeout: float) -> Any | None:
+        if self.reply_channel is not None:
+            return self.reply_channel.receive_message(
+                self.client_id, block=True, timeout=timeout
+            )
+        return self.channel.receive_reply(self.client_id, block=True, timeout=timeout)
+
+    def _resolve(
+        self,
+        call_id: int,
+        fut: Future,
+        result: Any = None,
+        error: BaseException | None = None,
+    ) -> None:
+        """
+        Complete a call's future. The caller may have cancelled it; that
+        must not end the reply thread, which also runs the timeouts.
+        """
+        if fut.done():
+            return
+        try:
+            if error is None:
+                fut.set_result(result)
+            else:
+                fut.set_exception(error)
+        except Exception as exc:
+            # Cancelled between done() and the set
+            self.logger.warning(
+                f"[RPC:{self.channel.name}] Could not complete call {call_id}: {exc!r}"
+            )
+
+    def _expire(self, now: float) -> float:
+        """
+        Fail expired calls; return seconds until the next deadline.
+        """
+        expired = []
+        with self._lock:
+            heap = self._deadlines
+            while heap and heap[0][0] <= now:
+                _, call_id = heapq.heappop(heap)
+                entry = self._pending.pop(call_id, None)
+                if entry is not None:
+                    expired.append((call_id, entry[0]))
+            wait = min(0.05, heap[0][0] - now) if heap else 0.05
+
+        for call_id, fut in expired:
+            self._resolve(call_id, fut, error=TimeoutError(f"RPC call {call_id} timed out"))
+        return max(wait, 0.001)
+
+    def _reply_loop(self) -> None:
+        while self._running:
+            wait = self._expire(time.monotonic())
+            msg = self._receive_reply(wait)
+            if msg is None:
+                continue
+            if not isinstance(msg, RpcResponse):
+                self.logger.warning(
+                    f"[RPC:{self.channel.name}] Ignoring non-RPC reply: {msg!r}"
+                )
+                continue
+
+            with self._lock:
+                entry = self._pending.pop(msg.call_id, None)
+            if entry is None:
+                # Late reply for a call that already timed out
+                continue
+            if msg.ok:
+                self._resolve(msg.call_id, entry[0], msg.result)
+            else:
+                self._resolve(msg.call_id, entry[0], error=RpcError(msg.error))
+
+    # ------------------------------------------------------------------ #
+    # Public API                                                         #
+    # ------------------------------------------------------------------ #
+
+    def call_async(
+        self,
+        method: str,
+        *args: Any,
+        timeout: float | None = None,
+        **kwargs: Any,
+    ) -> Future:
+        """
+        Send a request without waiting; the Future resolves with the result.
+        """
+        fut: Future = Future()
+        call_id = next(self._ids)
+        timeout = self.default_timeout if timeout is None else timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._lock:
+            self._pending[call_id] = (fut, deadline)
+            if deadline is not None:
+                heapq.heappush(self._deadlines, (deadline, call_id))
+
+        request = RpcRequest(call_id, self.client_id, method, args, kwargs)
+        with self._send_lock:
+            sent = self.channel.send_message(self.client_id, request)
+        if not sent:
+            with self._lock:
+                self._pending.pop(call_id, None)
+            self._resolve(call_id, fut, error=RpcError(f"Could not send request for '{method}'"))
+        return fut
+
+    def call(self, method: str, *args: Any, timeout: float | None = None, **kwargs: Any) -> Any:
+        """
+        Blocking call: send and wait for the result.
+        """
+        return self.call_async(method, *args, timeout=timeout, **kwargs).result()
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def close(self) -> None:
+        """
+        Stop the reply thread and fail all outstanding calls.
+        """
+        self._running = False
+        self._thread.join(timeout=1.0)
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._deadlines = []
+        for call_id, (fut, _) in pending.items():
+            self._resolve(call_id, fut, error=RpcError("RPC client closed"))
@@ -0,0 +1,153 @@
+# ipc_project/core/status_table.py
+
+from __future__ import annotations
+
+import struct
+import time
+from dataclasses import dataclass
+from typing import List
+
+from core.utils.shm_registry import create_segment, release_segment
+
+
+# Slot states
+STATE_FREE = 0
+STATE_STARTING = 1
+STATE_RUNNING = 2
+STATE_STOPPED = 3
+STATE_FAILED = 4
+
+STATE_NAMES = {
+    STATE_FREE: "free",
+    STATE_STARTING: "starting",
+    STATE_RUNNING: "running",
+    STATE_STOPPED: "stopped",
+    STATE_FAILED: "failed",
+}
+
+# Error codes written by workers
+ERROR_NONE = 0
+ERROR_EXCEPTION = 1
+
+# heartbeat (monotonic s), loop count, proc id, pid, state, last error code.
+# 8-byte fields first so heartbeat/loop count are naturally aligned.
+_SLOT = struct.Struct("<dQiiB3xi")
+_HEARTBEAT = struct.Struct("<dQ")
+_PID_OFFSET = 20
+_STATE_OFFSET = 24
+_ERROR_OFFSET = 28
+
+
+@dataclass
+class SlotStatus:
+    slot: int
+    proc_id: int
+    pid: int
+    state: int
+    heartbeat: float
+    loop_count: int
+    last_error: int
+
+    @property
+    def state_name(self) -> str:
+        return STATE_NAMES.get(self.state, "unknown")
+
+
+class WorkerStatusTable:
+    """
+    Fixed-layout worker status table in shared memory.
+
+    One slot per worker. Each worker writes only its own slot (plain
+    stores, no locks, no messages). The manager reads the whole table
+    with a single memory copy, so checking 1000 workers costs one scan.
+
+    heartbeat uses time.monotonic(), which is a system-wide clock on
+    Linux and therefore comparable across processes.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self.capacity = capacity
+        self.slot_size = _SLOT.size
+        self._shm = create_segment(capacity * self.slot_size, kind="status_table")
+        self._shm.buf[:] = b"\x00" * (capacity * self.slot_size)
+        # Slot allocation lives in the managing process only
+        self._free: List[int] = list(range(capacity - 1, -1, -1))
+
+    # ------------------------------------------------------------------ #
+    # Manager side                                                       #
+    # ------------------------------------------------------------------ #
+
+    def claim_slot(self, proc_id: int) -> int | None:
+        """
+        Reserve a slot for a worker; None if the table is full.
+        """
+        if not self._free:
+            return None
+        slot = self._free.pop()
+        _SLOT.pack_into(
+            self._shm.buf,
+            slot * self.slot_size,
+            time.monotonic(),
+            0,
+            proc_id,
+            0,
+            STATE_STARTING,
+            ERROR_NONE,
+        )
+        return slot
+
+    def release_slot(self, slot: int) -> None:
+        offset = slot * self.slot_size
+        self._shm.buf[offset : offset + self.slot_size] = b"\x00" * self.slot_size
+        self._free.append(slot)
+
+    def scan(self, include_free: bool = False) -> List[SlotStatus]:
+        """
+        Snapshot of all slots from one copy of the table.
+        """
+        raw = bytes(self._shm.buf)
+        result = []
+        for slot, (hb, loops, proc_id, pid, state, err) in enumerate(_SLOT.iter_unpack(raw)):
+            if state == STATE_FREE and not include_free:
+                continue
+            result.append(SlotStatus(slot, proc_id, pid, state, hb, loops, err))
+        return result
+
+    def read(self, slot: int) -> SlotStatus:
+        hb, loops, proc_id, pid, state, err = _SLOT.unpack_from(
+            self._shm.buf, slot * self.slot_size
+        )
+        return SlotStatus(slot, proc_id, pid, state, hb, loops, err)
+
+    # ------------------------------------------------------------------ #
+    # Worker side                                                        #
+    # ------------------------------------------------------------------ #
+
+    def mark_started(self, slot: int, pid: int) -> None:
+        offset = slot * self.slot_size
+        struct.pack_into("<i", self._shm.buf, offset + _PID_OFFSET, pid)
+        _HEARTBEAT.pack_into(self._shm.buf, offset, time.monotonic(), 0)
+        self.set_state(slot, STATE_RUNNING)
+
+    def heartbeat(self, slot: int, loop_count: int) -> None:
+        _HEARTBEAT.pack_into(
+            self._shm.buf, slot * self.slot_size, time.monotonic(), loop_count
+        )
+
+    def set_state(self, slot: int, state: int) -> None:
+        struct.pack_into("<B", self._shm.buf, slot * self.slot_size + _STATE_OFFSET, state)
+
+    def set_error(self, slot: int, code: int) -> None:
+        struct.pack_into("<i", self._shm.buf, slot * self.slot_size + _ERROR_OFFSET, code)
+
+    def close(self, unlink: bool = True) -> None:
+        try:
+            self._shm.close()
+        except Exception:
+            pass
+
+        if unlink:
+            try:
+                release_segment(self._shm)
+            except Exception:
+                pass
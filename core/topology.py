@@ -0,0 +1,394 @@
+# ipc_project/core/topology.py
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+try:
+    import tomllib
+except ImportError:  # pragma: no cover - Python < 3.11
+    tomllib = None
+
+from core.ipc_manager import IPCManager
+from core.process_manager import LIGHTWEIGHT_ROLES, ProcessManager, WorkerRequest
+from processes.echo_process import EchoWorker
+from processes.ping_process import PingWorker
+from processes.rpc_process import RpcServerWorker
+
+
+# Spec "type" -> IPCManager factory method
+CHANNEL_TYPES: Dict[str, str] = {
+    "pipe": "create_pipe_channel",
+    "queue": "create_queue_channel",
+    "priority_queue": "create_priority_queue_channel",
+    "shared_memory": "create_shared_memory_channel",
+    "ndarray": "create_ndarray_channel",
+    "mmap_log": "create_mmap_log_channel",
+    "unix_socket": "create_unix_socket_channel",
+    "tcp": "create_tcp_channel",
+}
+
+
+def _ping_factory(entry, resolve):
+    channel, sender_id = resolve.channel(entry["channel"]), resolve.process(entry["sender"])
+
+    def factory(proc_id, name, cmd_q, out_q):
+        return PingWorker(proc_id, name, cmd_q, out_q, channel, sender_id)
+
+    return factory
+
+
+def _echo_factory(entry, resolve):
+    channel = resolve.channel(entry["channel"])
+    receiver_id, sender_id = resolve.process(entry["receiver"]), resolve.process(entry["sender"])
+    reply = resolve.channel(entry["reply_channel"]) if entry.get("reply_channel") else None
+
+    def factory(proc_id, name, cmd_q, out_q):
+        return EchoWorker(proc_id, name, cmd_q, out_q, channel, receiver_id, sender_id, reply)
+
+    return factory
+
+
+def _rpc_factory(entry, resolve):
+    channel, server_id = resolve.channel(entry["channel"]), resolve.process(entry["server"])
+    reply = resolve.channel(entry["reply_channel"]) if entry.get("reply_channel") else None
+
+    def factory(proc_id, name, cmd_q, out_q):
+        return RpcServerWorker(proc_id, name, cmd_q, out_q, channel, server_id, reply)
+
+    return factory
+
+
+# Worker role -> (required keys, builder(entry, resolve) -> WorkerFactory)
+WORKER_ROLES: Dict[str, tuple] = {
+    "ping": (("channel", "sender"), _ping_factory),
+    "echo": (("channel", "receiver", "sender"), _echo_factory),
+    "rpc": (("channel", "server"), _rpc_factory),
+}
+
+
+class TopologyError(ValueError):
+    """
+    The spec is malformed or references unknown names.
+    """
+
+
+@dataclass
+class Topology:
+    """
+    Handles of everything a spec created, keyed by spec name.
+    """
+
+    name: str
+    processes: Dict[str, int] = field(default_factory=dict)
+    channels: Dict[str, Any] = field(default_factory=dict)
+    workers: Dict[str, int] = field(default_factory=dict)
+    # Workers started on node agents: spec name -> (node, node-local proc id)
+    remote_workers: Dict[str, tuple] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+
+class _Resolver:
+    def __init__(self, topology: Topology) -> None:
+        self.topology = topology
+
+    def process(self, ref) -> int:
+        # Plain ints are raw participant ids
+        if isinstance(ref, int):
+            return ref
+        return self.topology.processes[ref]
+
+    def channel(self, ref: str):
+        return self.topology.channels[ref]
+
+
+# ---------------------------------------------------------------------- #
+# Spec parsing                                                           #
+# ---------------------------------------------------------------------- #
+
+def _substitute(value, i: int):
+    if isinstance(value, str):
+        return value.replace("{i}", str(i))
+    if isinstance(value, list):
+        return [_substitute(v, i) for v in value]
+    if isinstance(value, dict):
+        return {k: _substitute(v, i) for k, v in value.items()}
+    return value
+
+
+def _expand(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Entries with "count": N become N entries with "{i}" replaced by 0..N-1.
+    """
+    out = []
+    for entry in entries:
+        count = entry.get("count")
+        if count is None:
+            out.append(entry)
+            continue
+        template = {k: v for k, v in entry.items() if k != "count"}
+        out.extend(_substitute(template, i) for i in range(int(count)))
+    return out
+
+
+def read_spec(path: str) -> Dict[str, Any]:
+    """
+    Load a topology spec from a .json or .toml file.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".toml":
+        if tomllib is None:
+            raise TopologyError("TOML specs need Python 3.11+ (tomllib)")
+        with open(path, "rb") as fh:
+            return tomllib.load(fh)
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def normalize_spec(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Expand "count" entries and check every name and reference before
+    anything is created. Raises TopologyError listing all problems.
+    """
+    result = {
+        "name": spec.get("name", "topology"),
+        "processes": _expand(spec.get("processes", [])),
+        "channels": _expand(spec.get("channels", [])),
+        "workers": _expand(spec.get("workers", [])),
+        "nodes": spec.get("nodes", []),
+    }
+    errors: List[str] = []
+
+    def unique(section: str) -> set:
+        names = set()
+        for entry in result[section]:
+            name = entry.get("name")
+            if not name:
+                errors.append(f"{section}: entry without a name: {entry!r}")
+            elif name in names:
+                errors.append(f"{section}: duplicate name '{name}'")
+            names.add(name)
+        return names
+
+    processes, channels, workers = unique("processes"), unique("channels"), unique("workers")
+    nodes = unique("nodes")
+    for entry in result["nodes"]:
+        if not entry.get("address"):
+            errors.append(f"node '{entry.get('name')}': missing 'address'")
+    channel_types = {entry.get("name"): entry.get("type", "pipe") for entry in result["channels"]}
+
+    def check_process(owner: str, ref) -> None:
+        if not isinstance(ref, int) and ref not in processes:
+            errors.append(f"{owner}: unknown process '{ref}'")
+
+    for entry in result["channels"]:
+        owner = f"channel '{entry.get('name')}'"
+        if entry.get("type", "pipe") not in CHANNEL_TYPES:
+            errors.append(f"{owner}: unknown type '{entry.get('type')}'")
+        if entry.get("node") is not None:
+            if entry.get("type") != "tcp":
+                errors.append(f"{owner}: only tcp channels can be placed on a node")
+            elif entry["node"] not in nodes:
+                errors.append(f"{owner}: unknown node '{entry['node']}'")
+        for ref in entry.get("senders", []) + entry.get("receivers", []):
+            check_process(owner, ref)
+
+    for entry in result["workers"]:
+        owner = f"worker '{entry.get('name')}'"
+        role = entry.get("role")
+        if role not in WORKER_ROLES:
+            errors.append(f"{owner}: unknown role '{role}'")
+            continue
+        for key in WORKER_ROLES[role][0]:
+            if key not in entry:
+                errors.append(f"{owner}: missing '{key}'")
+            elif key in ("sender", "receiver", "server"):
+                check_process(owner, entry[key])
+            elif entry[key] not in channels:
+                errors.append(f"{owner}: unknown channel '{entry[key]}'")
+        if entry.get("reply_channel") and entry["reply_channel"] not in channels:
+            errors.append(f"{owner}: unknown channel '{entry['reply_channel']}'")
+        if entry.get("pair_with") and entry["pair_with"] not in workers:
+            errors.append(f"{owner}: unknown pair_with worker '{entry['pair_with']}'")
+        if entry.get("hosted") and role not in LIGHTWEIGHT_ROLES:
+            errors.append(f"{owner}: role '{role}' cannot be hosted")
+        if entry.get("node") is not None:
+            if entry["node"] not in nodes:
+                errors.append(f"{owner}: unknown node '{entry['node']}'")
+            # Only TCP channels are reachable from another machine
+            for key in ("channel", "reply_channel"):
+                ref = entry.get(key)
+                if ref in channel_types and channel_types[ref] != "tcp":
+                    errors.append(f"{owner}: remote worker needs a tcp channel, '{ref}' is {channel_types[ref]}")
+
+    if errors:
+        raise TopologyError("Invalid topology:\n  " + "\n  ".join(errors))
+    return result
+
+
+# ---------------------------------------------------------------------- #
+# Loader                                                                 #
+# ---------------------------------------------------------------------- #
+
+class TopologyLoader:
+    """
+    Instantiates a topology spec in bulk:
+
+    1. validate the whole spec (nothing is created if it is invalid);
+    2. register all processes (ACL identities);
+    3. create all channels, so every shared-memory segment exists
+       before any worker forks;
+    4. start all workers in one ProcessManager.spawn_workers() batch;
+       workers with a "node" are started by that node's agent instead,
+       one batch per node.
+
+    If a step fails, whatever was created is torn down again.
+
+    Spec layout (JSON or TOML):
+
+        name = "ping-mesh"
+        [[processes]]   name = "client{i}", count = 250
+        [[channels]]    name = "link{i}", count = 250, type = "pipe",
+                        senders = ["client{i}"], receivers = ["server{i}"],
+                        options = { flow_control_credits = 64 }
+        [[workers]]     name = "echo{i}", count = 250, role = "echo",
+                        channel = "link{i}", receiver = "server{i}",
+                        sender = "client{i}", pair_with = "ping{i}",
+                        hosted = true
+
+    hosted = true packs a ping/echo worker into a shared WorkerHost
+    process (see ProcessManager.spawn_workers). CPU placement applies to
+    the host: a hosted worker's pair_with is ignored, and a worker paired
+    with a hosted one is packed next to its host.
+
+    Scale-out across machines: list node agents, put tcp channels and
+    workers on them with "node" (remote workers may only use tcp
+    channels):
+
+        [[nodes]]       name = "b", address = "10.0.0.2:7400"
+        [[channels]]    name = "link", type = "tcp", node = "b"
+        [[workers]]     name = "echo", role = "echo", node = "b", ...
+    """
+
+    def __init__(self, ipc_manager: IPCManager, process_manager: ProcessManager) -> None:
+        self.ipc_manager = ipc_manager
+        self.process_manager = process_manager
+        self.logger = ipc_manager.logger
+
+    def load_file(self, path: str, wait: float | None = 10.0) -> Topology:
+        return self.load(read_spec(path), wait=wait)
+
+    def load(self, spec: Dict[str, Any], wait: float | None = 10.0) -> Topology:
+        spec = normalize_spec(spec)
+        started = time.monotonic()
+        topology = Topology(name=spec["name"])
+        resolve = _Resolver(topology)
+
+        try:
+            for entry in spec["processes"]:
+                info = self.process_manager.create_dummy_process(
+                    name=entry["name"], role=entry.get("role", "Test")
+                )
+                topology.processes[entry["name"]] = info["id"]
+
+            for entry in spec["nodes"]:
+                self.ipc_manager.add_node(entry["name"], entry["address"])
+
+            for entry in spec["channels"]:
+                create = getattr(self.ipc_manager, CHANNEL_TYPES[entry.get("type", "pipe")])
+                options = dict(entry.get("options", {}))
+                if entry.get("node") is not None:
+                    options["node"] = entry["node"]
+                topology.channels[entry["name"]] = create(
+                    entry["name"],
+                    allowed_senders=[resolve.process(r) for r in entry.get("senders", [])],
+                    allowed_receivers=[resolve.process(r) for r in entry.get("receivers", [])],
+                    **options,
+                )
+
+            local = [entry for entry in spec["workers"] if entry.get("node") is None]
+            self._spawn_remote(
+                topology, [entry for entry in spec["workers"] if entry.get("node") is not None], resolve
+            )
+
+            requests = []
+            index = {entry["name"]: i for i, entry in enumerate(local)}
+            for entry in local:
+                builder = WORKER_ROLES[entry["role"]][1]
+                requests.append(
+                    WorkerRequest(
+                        name_prefix=entry["name"],
+                        role=entry["role"],
+                        factory=builder(entry, resolve),
+                        partner_index=index.get(entry.get("pair_with")),
+                        hosted=bool(entry.get("hosted", False)),
+                    )
+                )
+            proc_ids = self.process_manager.spawn_workers(requests, wait=wait)
+            topology.workers = {
+                entry["name"]: proc_id for entry, proc_id in zip(local, proc_ids)
+            }
+        except Exception as exc:
+            self.logger.error(f"Loading topology '{topology.name}' failed: {exc!r}")
+            self.teardown(topology)
+            raise
+
+        topology.elapsed = time.monotonic() - started
+        self.logger.info(
+            f"Topology '{topology.name}' up in {topology.elapsed:.2f}s: "
+            f"{len(topology.processes)} processes, {len(topology.channels)} channels, "
+            f"{len(topology.workers)} workers, {len(topology.remote_workers)} remote"
+        )
+        return topology
+
+    def _spawn_remote(self, topology: Topology, entries: List[Dict[str, Any]], resolve) -> None:
+        """
+        Start workers on their node agents. The entries are sent with
+        channels and participant ids already resolved; the agent builds
+        the worker from WORKER_ROLES like a local spawn.
+        """
+        by_node: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in entries:
+            by_node.setdefault(entry["node"], []).append(entry)
+
+        for node_name, node_entries in by_node.items():
+            requests = []
+            for entry in node_entries:
+                resolved = dict(entry)
+                for key in WORKER_ROLES[entry["role"]][0] + ("reply_channel",):
+                    if not entry.get(key):
+                        continue
+                    if key in ("sender", "receiver", "server"):
+                        resolved[key] = resolve.process(entry[key])
+                    else:
+                        resolved[key] = resolve.channel(entry[key])
+                requests.append((entry["role"], entry["name"], resolved))
+            proc_ids = self.ipc_manager.get_node(node_name).spawn(requests)
+            for entry, proc_id in zip(node_entries, proc_ids):
+                topology.remote_workers[entry["name"]] = (node_name, proc_id)
+
+    def teardown(self, topology: Topology) -> None:
+        """
+        Stop the topology's workers, close its channels and drop its
+        process entries.
+        """
+        self.process_manager.terminate_processes(list(topology.workers.values()))
+        remote: Dict[str, List[int]] = {}
+        for node_name, proc_id in topology.remote_workers.values():
+            remote.setdefault(node_name, []).append(proc_id)
+        for node_name, proc_ids in remote.items():
+            try:
+                self.ipc_manager.get_node(node_name).terminate(proc_ids)
+            except Exception as exc:
+                self.logger.error(f"Stopping workers on node '{node_name}' failed: {exc!r}")
+        for channel in topology.channels.values():
+            self.ipc_manager.close_channel(channel.channel_id)
+        self.process_manager.terminate_processes(list(topology.processes.values()))
+        topology.workers.clear()
+        topology.remote_workers.clear()
+        topology.channels.clear()
+        topology.processes.clear()
@@ -0,0 +1,91 @@
+# ipc_project/core/utils/cpu_topology.py
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Set, Tuple
+
+SYSFS_CPU = "/sys/devices/system/cpu"
+
+
+@dataclass(frozen=True)
+class CpuInfo:
+    cpu: int
+    package: int
+    core: int
+
+
+def _read_int(path: str) -> int | None:
+    try:
+        with open(path) as fh:
+            return int(fh.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def _usable_cpus() -> List[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+class CpuTopology:
+    """
+    CPUs this process may run on, grouped by package (socket) and core.
+
+    Read from /sys/devices/system/cpu when available; otherwise every CPU
+    is treated as its own core on package 0.
+    """
+
+    def __init__(self, cpus: List[CpuInfo]) -> None:
+        self.cpus = sorted(cpus, key=lambda c: c.cpu)
+        self._by_cpu: Dict[int, CpuInfo] = {c.cpu: c for c in self.cpus}
+
+    @classmethod
+    def detect(cls, sysfs_root: str = SYSFS_CPU) -> "CpuTopology":
+        cpus = []
+        for cpu in _usable_cpus():
+            topo = os.path.join(sysfs_root, f"cpu{cpu}", "topology")
+            package = _read_int(os.path.join(topo, "physical_package_id"))
+            core = _read_int(os.path.join(topo, "core_id"))
+            if package is None or core is None:
+                package, core = 0, cpu
+            cpus.append(CpuInfo(cpu, package, core))
+        return cls(cpus)
+
+    def info(self, cpu: int) -> CpuInfo | None:
+        return self._by_cpu.get(cpu)
+
+    def cpu_ids(self) -> List[int]:
+        return [c.cpu for c in self.cpus]
+
+    def packages(self) -> List[int]:
+        return sorted({c.package for c in self.cpus})
+
+    def cores(self) -> Dict[Tuple[int, int], List[int]]:
+        """
+        (package, core) -> CPUs sharing that physical core (SMT siblings).
+        """
+        groups: Dict[Tuple[int, int], List[int]] = {}
+        for c in self.cpus:
+            groups.setdefault((c.package, c.core), []).append(c.cpu)
+        return groups
+
+    def siblings(self, cpu: int) -> Set[int]:
+        """
+        Other hardware threads on the same physical core.
+        """
+        me = self._by_cpu.get(cpu)
+        if me is None:
+            return set()
+        return {
+            c.cpu for c in self.cpus
+            if c.package == me.package and c.core == me.core and c.cpu != cpu
+        }
+
+    def same_package(self, cpu: int) -> Set[int]:
+        me = self._by_cpu.get(cpu)
+        if me is None:
+            return set()
+        return {c.cpu for c in self.cpus if c.package == me.package and c.cpu != cpu}
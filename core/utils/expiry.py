@@ -0,0 +1,71 @@
+# ipc_project/core/utils/expiry.py
+
+from __future__ import annotations
+
+import time
+from multiprocessing import Value
+from multiprocessing.reduction import ForkingPickler
+from typing import Any
+
+
+class DeadlineEnvelope:
+    """
+    Wire wrapper for a message that expires.
+
+    deadline is a time.monotonic() reading; on Linux that clock is
+    CLOCK_MONOTONIC, so deadlines set in one process can be checked in
+    another on the same host. The payload travels pre-pickled, so the
+    receiver can drop an expired message without unpickling it.
+    """
+
+    __slots__ = ("deadline", "data")
+
+    def __init__(self, deadline: float, data: bytes) -> None:
+        self.deadline = deadline
+        self.data = data
+
+    def __reduce__(self):
+        return (DeadlineEnvelope, (self.deadline, self.data))
+
+    @classmethod
+    def wrap(cls, payload: Any, deadline: float) -> "DeadlineEnvelope":
+        return cls(deadline, bytes(ForkingPickler.dumps(payload)))
+
+    def unwrap(self) -> Any:
+        return ForkingPickler.loads(self.data)
+
+
+def resolve_deadline(
+    ttl: float | None,
+    deadline: float | None,
+    default_ttl: float | None,
+) -> float | None:
+    """
+    Absolute deadline for a send: the explicit deadline, else now + ttl
+    (falling back to the channel's default TTL). None means no expiry.
+    With both ttl and deadline, the earlier one wins.
+    """
+    if ttl is None and deadline is None:
+        ttl = default_ttl
+    if ttl is not None:
+        by_ttl = time.monotonic() + ttl
+        deadline = by_ttl if deadline is None else min(deadline, by_ttl)
+    return deadline
+
+
+class ExpiryCounter:
+    """
+    Count of expired messages shared by every process using a channel.
+    Consumers add once per run of skipped messages, not per message.
+    """
+
+    def __init__(self) -> None:
+        self._value = Value("Q", 0)
+
+    def add(self, count: int) -> None:
+        with self._value.get_lock():
+            self._value.value += count
+
+    @property
+    def value(self) -> int:
+        return self._value.value
@@ -0,0 +1,258 @@
+# ipc_project/core/utils/journal.py
+
+from __future__ import annotations
+
+import bisect
+import glob
+import heapq
+import os
+import pickle
+import struct
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from multiprocessing import util
+from typing import Any, Deque, Iterator, List, Tuple
+
+
+# timestamp (ns since epoch), sender id, payload length
+_RECORD = struct.Struct("<qiI")
+# timestamp of first record in a batch, data file offset of that record
+_INDEX = struct.Struct("<qQ")
+
+
+@dataclass
+class JournalRecord:
+    timestamp_ns: int
+    sender_id: int
+    payload: Any
+
+
+class MessageJournal:
+    """
+    Append-only binary journal of the messages sent on one channel.
+
+    - record() only appends to an in-memory deque; a background thread
+      pickles and writes records in batches, so the send path never
+      touches the disk.
+    - Each process writes its own pair of files:
+      <name>.<pid>.jnl (records) and <name>.<pid>.idx (one index entry
+      per batch: first timestamp + data offset).
+    - Payloads are captured by reference and pickled on the writer
+      thread; do not mutate a payload after sending it.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        channel_name: str,
+        batch_size: int = 256,
+        flush_interval: float = 0.2,
+        max_pending: int = 100_000,
+    ) -> None:
+        self.directory = directory
+        self.channel_name = channel_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        self.recorded = 0
+        self.dropped = 0
+        self._pid = -1
+        self._start()
+
+    # ------------------------------------------------------------------ #
+    # Internal helpers                                                   #
+    # ------------------------------------------------------------------ #
+
+    def _start(self) -> None:
+        """
+        Open this process's files and start the writer thread. Called again
+        after fork, since threads and file positions are per process.
+        """
+        self._pid = os.getpid()
+        base = os.path.join(self.directory, f"{self.channel_name}.{self._pid}")
+        self._data = open(base + ".jnl", "ab", buffering=0)
+        self._index = open(base + ".idx", "ab", buffering=0)
+        self._offset = self._data.tell()
+
+        self._pending: Deque[Tuple[int, int, Any]] = deque()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._writer_loop,
+            name=f"journal-{self.channel_name}",
+            daemon=True,
+        )
+        self._thread.start()
+        # Flush on interpreter / worker process exit
+        util.Finalize(self, self.close, exitpriority=10)
+
+    def _writer_loop(self) -> None:
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self._write_batch()
+        self._write_batch()
+
+    def _write_batch(self) -> None:
+        pending = self._pending
+        if not pending:
+            return
+
+        chunks: List[bytes] = []
+        first_ts = pending[0][0]
+        # Bounded so a busy sender cannot keep one batch open forever
+        for _ in range(len(pending)):
+            ts, sender_id, payload = pending.popleft()
+            try:
+                data = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                data = pickle.dumps(repr(payload), protocol=pickle.HIGHEST_PROTOCOL)
+            chunks.append(_RECORD.pack(ts, sender_id, len(data)))
+            chunks.append(data)
+
+        blob = b"".join(chunks)
+        try:
+            self._data.write(blob)
+            self._index.write(_INDEX.pack(first_ts, self._offset))
+            self._offset += len(blob)
+        except (OSError, ValueError):
+            # Disk problems must not take the channel down
+            pass
+
+    # ------------------------------------------------------------------ #
+    # Public API                                                         #
+    # ------------------------------------------------------------------ #
+
+    def record(self, sender_id: int, payload: Any) -> None:
+        """
+        Queue one message for the journal. Never blocks on I/O.
+        """
+        if self._pid != os.getpid():
+            self._start()
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            return
+
+        self._pending.append((time.time_ns(), sender_id, payload))
+        self.recorded += 1
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    def close(self) -> None:
+        """
+        Write out everything still pending and close the files.
+        """
+        if self._closed or self._pid != os.getpid():
+            return
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join(timeout=5.0)
+
+        for fh in (self._data, self._index):
+            try:
+                fh.close()
+            except Exception:
+                pass
+
+
+class JournalReader:
+    """
+    Reads the journal files of one channel (all writer processes merged,
+    ordered by timestamp), with seek-by-time via the batch index.
+    """
+
+    def __init__(self, directory: str, channel_name: str) -> None:
+        self.directory = directory
+        self.channel_name = channel_name
+
+        pattern = os.path.join(glob.escape(directory), f"{glob.escape(channel_name)}.*.jnl")
+        self.files: List[str] = sorted(glob.glob(pattern))
+
+    @staticmethod
+    def _load_index(data_path: str) -> List[Tuple[int, int]]:
+        idx_path = data_path[: -len(".jnl")] + ".idx"
+        try:
+            with open(idx_path, "rb") as fh:
+                raw = fh.read()
+        except OSError:
+            return []
+        usable = len(raw) - len(raw) % _INDEX.size
+        return [entry for entry in _INDEX.iter_unpack(raw[:usable])]
+
+    def _iter_file(self, data_path: str, since_ns: int | None) -> Iterator[JournalRecord]:
+        start = 0
+        if since_ns is not None:
+            index = self._load_index(data_path)
+            # Last batch that starts at or before since_ns
+            pos = bisect.bisect_right([ts for ts, _ in index], since_ns) - 1
+            if pos >= 0:
+                start = index[pos][1]
+
+        with open(data_path, "rb") as fh:
+            fh.seek(start)
+            while True:
+                header = fh.read(_RECORD.size)
+                if len(header) < _RECORD.size:
+                    return
+                ts, sender_id, length = _RECORD.unpack(header)
+                data = fh.read(length)
+                if len(data) < length:
+                    # Partially written tail
+                    return
+                if since_ns is not None and ts < since_ns:
+                    continue
+                yield JournalRecord(ts, sender_id, pickle.loads(data))
+
+    def iter_records(
+        self,
+        since: float | None = None,
+        until: float | None = None,
+    ) -> Iterator[JournalRecord]:
+        """
+        Yield records in timestamp order. since/until are time.time() seconds.
+        """
+        since_ns = None if since is None else int(since * 1e9)
+        until_ns = None if until is None else int(until * 1e9)
+
+        merged = heapq.merge(
+            *(self._iter_file(path, since_ns) for path in self.files),
+            key=lambda rec: rec.timestamp_ns,
+        )
+        for rec in merged:
+            if until_ns is not None and rec.timestamp_ns > until_ns:
+                return
+            yield rec
+
+    def replay(
+        self,
+        channel: Any,
+        since: float | None = None,
+        until: float | None = None,
+        sender_id: int | None = None,
+        realtime: bool = False,
+    ) -> int:
+        """
+        Re-send journaled messages into a channel. Uses each record's
+        original sender unless sender_id is given. With realtime=True the
+        original spacing between messages is preserved.
+
+        Returns the number of messages sent successfully.
+        """
+        sent = 0
+        prev_ts: int | None = None
+        for rec in self.iter_records(since=since, until=until):
+            if realtime and prev_ts is not None:
+                delay = (rec.timestamp_ns - prev_ts) / 1e9
+                if delay > 0:
+                    time.sleep(delay)
+            prev_ts = rec.timestamp_ns
+
+            sid = rec.sender_id if sender_id is None else sender_id
+            if channel.send_message(sid, rec.payload):
+                sent += 1
+        return sent
@@ -0,0 +1,204 @@
+# ipc_project/core/utils/log_store.py
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterator, List, Tuple
+
+LEVELS = ("INFO", "WARN", "ERROR", "SECURITY")
+
+# Longer rendered messages are cut so one huge payload repr cannot pin memory
+MAX_MESSAGE_CHARS = 1024
+
+
+@dataclass
+class LogRecord:
+    seq: int
+    timestamp: float
+    level: str
+    template: str
+    args: Tuple
+    channel_id: int | None = None
+    proc_id: int | None = None
+
+    @property
+    def message(self) -> str:
+        if not self.args:
+            return self.template
+        try:
+            return self.template % self.args
+        except (TypeError, ValueError):
+            return f"{self.template} {self.args!r}"
+
+
+class LogStore:
+    """
+    Fixed-capacity ring of structured log records with per-level and
+    per-channel indexes.
+
+    - Records get increasing sequence numbers; the oldest record is
+      overwritten once `capacity` is reached.
+    - Each index is a deque of sequence numbers in arrival order. The
+      evicted record is always the oldest, so it sits at the left end of
+      its index deques and is removed in O(1).
+    - Queries walk the smallest matching index from the newest record
+      backwards and stop at the time bound, so "errors on channel 7 in
+      the last minute" never scans the whole store.
+    """
+
+    def __init__(self, capacity: int = 10_000) -> None:
+        self.capacity = capacity
+        self._slots: List[LogRecord | None] = [None] * capacity
+        self._next_seq = 0
+        self._by_level: Dict[str, Deque[int]] = {level: deque() for level in LEVELS}
+        self._by_channel: Dict[int, Deque[int]] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------ #
+    # Internal helpers                                                   #
+    # ------------------------------------------------------------------ #
+
+    def _evict(self, old: LogRecord) -> None:
+        level_index = self._by_level.get(old.level)
+        if level_index and level_index[0] == old.seq:
+            level_index.popleft()
+        if old.channel_id is not None:
+            channel_index = self._by_channel.get(old.channel_id)
+            if channel_index and channel_index[0] == old.seq:
+                channel_index.popleft()
+                if not channel_index:
+                    del self._by_channel[old.channel_id]
+
+    def _get(self, seq: int) -> LogRecord | None:
+        if seq < self._next_seq - self.capacity or seq >= self._next_seq:
+            return None
+        return self._slots[seq % self.capacity]
+
+    def _candidates(self, level: str | None, channel_id: int | None) -> Iterator[int]:
+        """
+        Sequence numbers to check, newest first.
+        """
+        indexes = []
+        if level is not None:
+            indexes.append(self._by_level.get(level, deque()))
+        if channel_id is not None:
+            indexes.append(self._by_channel.get(channel_id, deque()))
+        if not indexes:
+            yield from range(self._next_seq - 1, max(self._next_seq - self.capacity, 0) - 1, -1)
+            return
+
+        # Walk by position instead of iterating the deque, which other
+        # threads may append to / evict from meanwhile. An eviction shifts
+        # positions left, so skip anything not older than the last seq.
+        index = min(indexes, key=len)
+        pos = len(index) - 1
+        previous = None
+        while pos >= 0:
+            try:
+                seq = index[pos]
+            except IndexError:
+                pos = len(index) - 1
+                continue
+            pos -= 1
+            if previous is not None and seq >= previous:
+                continue
+            previous = seq
+            yield seq
+
+    # ------------------------------------------------------------------ #
+    # Public API                                                         #
+    # ------------------------------------------------------------------ #
+
+    def append(
+        self,
+        level: str,
+        template: str,
+        args: Tuple = (),
+        channel_id: int | None = None,
+        proc_id: int | None = None,
+        timestamp: float | None = None,
+    ) -> LogRecord:
+        if len(template) > MAX_MESSAGE_CHARS:
+            template = template[: MAX_MESSAGE_CHARS - 3] + "..."
+        with self._lock:
+            seq = self._next_seq
+            self._next_seq += 1
+            slot = seq % self.capacity
+            old = self._slots[slot]
+            if old is not None:
+                self._evict(old)
+
+            record = LogRecord(
+                seq=seq,
+                timestamp=time.time() if timestamp is None else timestamp,
+                level=level,
+                template=template,
+                args=args,
+                channel_id=channel_id,
+                proc_id=proc_id,
+            )
+            self._slots[slot] = record
+            self._by_level.setdefault(level, deque()).append(seq)
+            if channel_id is not None:
+                self._by_channel.setdefault(channel_id, deque()).append(seq)
+        return record
+
+    def query(
+        self,
+        level: str | None = None,
+        channel_id: int | None = None,
+        proc_id: int | None = None,
+        since: float | None = None,
+        after_seq: int | None = None,
+        text: str | None = None,
+        limit: int | None = None,
+    ) -> Iterator[LogRecord]:
+        """
+        Matching records, newest first. `since` is a time.time() bound,
+        `after_seq` returns only records newer than a sequence number
+        (for incremental views). Iterates lazily; nothing is copied.
+        """
+        found = 0
+        for seq in self._candidates(level, channel_id):
+            if after_seq is not None and seq <= after_seq:
+                return
+            record = self._get(seq)
+            if record is None or record.seq != seq:
+                # Evicted while iterating
+                return
+            if since is not None and record.timestamp < since:
+                return
+            if level is not None and record.level != level:
+                continue
+            if channel_id is not None and record.channel_id != channel_id:
+                continue
+            if proc_id is not None and record.proc_id != proc_id:
+                continue
+            if text is not None and text not in record.message:
+                continue
+            yield record
+            found += 1
+            if limit is not None and found >= limit:
+                return
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Records currently held per level.
+        """
+        return {level: len(index) for level, index in self._by_level.items()}
+
+    def channels(self) -> List[int]:
+        return sorted(self._by_channel)
+
+    @property
+    def last_seq(self) -> int:
+        """
+        Sequence number of the newest record (-1 when empty).
+        """
+        return self._next_seq - 1
+
+    def __len__(self) -> int:
+        return min(self._next_seq, self.capacity)
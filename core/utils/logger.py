@@ -2,16 +2,24 @@
 
 from __future__ import annotations
 
-from typing import Callable, List
+from typing import Callable, List, Tuple
+
+from core.utils.log_store import LogStore
 
 
 class AppLogger:
     """
     Central logger that sends log messages to registered sinks (e.g., GUI log panel).
+
+    Messages may be %-style templates with args (formatted only when a
+    sink needs the text). With a LogStore, every record is also kept as a
+    structured entry (level, channel id, process id, template + args)
+    that can be filtered without touching the sinks.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, store: LogStore | None = None) -> None:
         self._sinks: List[Callable[[str, str], None]] = []
+        self.store = store
 
     def register_sink(self, sink: Callable[[str, str], None]) -> None:
         """
@@ -19,7 +27,30 @@ class AppLogger:
         """
         self._sinks.append(sink)
 
-    def _emit(self, message: str, level: str) -> None:
+    def bind(self, channel_id: int | None = None, proc_id: int | None = None) -> "BoundLogger":
+        """
+        Logger with the same API that tags every record with a channel
+        and/or process id.
+        """
+        return BoundLogger(self, channel_id, proc_id)
+
+    def _emit(
+        self,
+        message: str,
+        level: str,
+        args: Tuple = (),
+        channel_id: int | None = None,
+        proc_id: int | None = None,
+    ) -> None:
+        if self.store is not None:
+            self.store.append(level, message, args, channel_id, proc_id)
+        if not self._sinks:
+            return
+        if args:
+            try:
+                message = message % args
+            except (TypeError, ValueError):
+                message = f"{message} {args!r}"
         for sink in self._sinks:
             try:
                 sink(message, level)
@@ -27,14 +58,44 @@ class AppLogger:
                 # Avoid crashing logger because of one faulty sink
                 pass
 
-    def info(self, message: str) -> None:
-        self._emit(message, "INFO")
+    def info(self, message: str, *args) -> None:
+        self._emit(message, "INFO", args)
+
+    def warning(self, message: str, *args) -> None:
+        self._emit(message, "WARN", args)
+
+    def error(self, message: str, *args) -> None:
+        self._emit(message, "ERROR", args)
+
+    def security(self, message: str, *args) -> None:
+        self._emit(message, "SECURITY", args)
+
+
+class BoundLogger:
+    """
+    AppLogger view returned by AppLogger.bind().
+    """
+
+    def __init__(self, parent: AppLogger, channel_id: int | None, proc_id: int | None) -> None:
+        self.parent = parent
+        self.channel_id = channel_id
+        self.proc_id = proc_id
+
+    def bind(self, channel_id: int | None = None, proc_id: int | None = None) -> "BoundLogger":
+        return BoundLogger(
+            self.parent,
+            self.channel_id if channel_id is None else channel_id,
+            self.proc_id if proc_id is None else proc_id,
+        )
+
+    def info(self, message: str, *args) -> None:
+        self.parent._emit(message, "INFO", args, self.channel_id, self.proc_id)
 
-    def warning(self, message: str) -> None:
-        self._emit(message, "WARN")
+    def warning(self, message: str, *args) -> None:
+        self.parent._emit(message, "WARN", args, self.channel_id, self.proc_id)
 
-    def error(self, message: str) -> None:
-        self._emit(message, "ERROR")
+    def error(self, message: str, *args) -> None:
+        self.parent._emit(message, "ERROR", args, self.channel_id, self.proc_id)
 
-    def security(self, message: str) -> None:
-        self._emit(message, "SECURITY")
+    def security(self, message: str, *args) -> None:
+        self.parent._emit(message, "SECURITY", args, self.channel_id, self.proc_id)
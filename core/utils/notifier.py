@@ -0,0 +1,74 @@
+# ipc_project/core/utils/notifier.py
+
+from __future__ import annotations
+
+import math
+import os
+import select
+
+
+class WakeupNotifier:
+    """
+    Cross-process wakeup signal: a Linux eventfd, or an os.pipe() where
+    eventfd is unavailable.
+
+    The writer calls signal(); readers poll/select on fileno() (or hand
+    it to an event loop) and call clear() once woken. Signals coalesce:
+    any number of signal() calls before a clear() make one wakeup, so it
+    says "something changed", never how often. Both descriptors are
+    non-blocking and inherited across fork, so create the notifier
+    before the workers that use it are started.
+    """
+
+    def __init__(self) -> None:
+        self.kind: str
+        if hasattr(os, "eventfd"):
+            fd = os.eventfd(0, os.EFD_NONBLOCK | os.EFD_CLOEXEC)
+            self._read_fd = self._write_fd = fd
+            self.kind = "eventfd"
+        else:
+            self._read_fd, self._write_fd = os.pipe()
+            os.set_blocking(self._read_fd, False)
+            os.set_blocking(self._write_fd, False)
+            self.kind = "pipe"
+        self.closed = False
+
+    def fileno(self) -> int:
+        return self._read_fd
+
+    def signal(self) -> None:
+        try:
+            if self.kind == "eventfd":
+                os.eventfd_write(self._write_fd, 1)
+            else:
+                os.write(self._write_fd, b"\x01")
+        except BlockingIOError:
+            # Counter or pipe full: it is readable already
+            pass
+
+    def clear(self) -> None:
+        try:
+            if self.kind == "eventfd":
+                os.eventfd_read(self._read_fd)
+            else:
+                while os.read(self._read_fd, 4096):
+                    pass
+        except BlockingIOError:
+            pass
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Block until signalled or `timeout` seconds pass. Does not clear.
+        """
+        poller = select.poll()
+        poller.register(self._read_fd, select.POLLIN)
+        events = poller.poll(None if timeout is None else max(0, math.ceil(timeout * 1000)))
+        return bool(events)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        os.close(self._read_fd)
+        if self._write_fd != self._read_fd:
+            os.close(self._write_fd)
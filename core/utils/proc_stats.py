@@ -0,0 +1,202 @@
+# ipc_project/core/utils/proc_stats.py
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Tuple
+
+try:
+    _CLK_TCK = os.sysconf("SC_CLK_TCK")
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):  # pragma: no cover - non-POSIX
+    _CLK_TCK = 100
+    _PAGE_SIZE = 4096
+
+
+class RingBuffer:
+    """
+    Fixed-capacity numeric history backed by a preallocated array.
+    Appending never allocates; old values are overwritten.
+    """
+
+    def __init__(self, capacity: int, typecode: str = "d") -> None:
+        self.capacity = capacity
+        self._data = array(typecode, [0] * capacity)
+        self._next = 0
+        self._size = 0
+
+    def append(self, value: float) -> None:
+        self._data[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def last(self, default: float = 0.0) -> float:
+        if not self._size:
+            return default
+        return self._data[(self._next - 1) % self.capacity]
+
+    def values(self) -> List[float]:
+        """
+        Oldest to newest.
+        """
+        if self._size < self.capacity:
+            return self._data[: self._size].tolist()
+        return self._data[self._next :].tolist() + self._data[: self._next].tolist()
+
+    def __len__(self) -> int:
+        return self._size
+
+
+@dataclass
+class ProcSample:
+    cpu_seconds: float
+    rss_bytes: int
+    voluntary_ctxt: int
+    involuntary_ctxt: int
+
+
+def _read_ctxt_switches(base: str) -> Tuple[int, int]:
+    """
+    Sum voluntary and involuntary context switches over every thread of
+    a process; /proc/<pid>/status only counts the main thread.
+    """
+    voluntary = involuntary = 0
+    for tid in os.listdir(f"{base}/task"):
+        try:
+            with open(f"{base}/task/{tid}/status", "rb") as fh:
+                for line in fh:
+                    if line.startswith(b"voluntary_ctxt_switches:"):
+                        voluntary += int(line.split()[1])
+                    elif line.startswith(b"nonvoluntary_ctxt_switches:"):
+                        involuntary += int(line.split()[1])
+        except (OSError, ValueError, IndexError):
+            # Thread exited between listdir() and open()
+            continue
+    return voluntary, involuntary
+
+
+def read_proc_sample(pid: int) -> ProcSample | None:
+    """
+    Read CPU time, RSS and context switch counters for a pid from /proc.
+    All threads count (Queue feeder threads, journal writers, ...).
+    Returns None if the process is gone or /proc is unavailable.
+    """
+    base = f"/proc/{pid}"
+    try:
+        with open(f"{base}/stat", "rb") as fh:
+            stat = fh.read()
+        # comm may contain spaces/parentheses: fields start after the last ')'
+        fields = stat[stat.rindex(b")") + 2 :].split()
+        # Process-wide and monotonic, including threads that have already
+        # exited; per-thread counters would drop when a thread goes away
+        utime, stime = int(fields[11]), int(fields[12])
+        rss_pages = int(fields[21])
+        voluntary, involuntary = _read_ctxt_switches(base)
+    except (OSError, ValueError, IndexError):
+        return None
+
+    cpu_seconds = (utime + stime) / _CLK_TCK
+    return ProcSample(cpu_seconds, rss_pages * _PAGE_SIZE, voluntary, involuntary)
+
+
+class WorkerStats:
+    """
+    Sampled history of one worker. Rates are per sampling interval.
+    """
+
+    def __init__(self, pid: int, history: int) -> None:
+        self.pid = pid
+        self.cpu_percent = RingBuffer(history)
+        self.rss_bytes = RingBuffer(history)
+        self.voluntary_per_s = RingBuffer(history)
+        self.involuntary_per_s = RingBuffer(history)
+        self.voluntary_total = 0
+        self.involuntary_total = 0
+        self._prev: ProcSample | None = None
+        self._prev_time = 0.0
+
+    def update(self, sample: ProcSample, now: float) -> None:
+        prev = self._prev
+        if prev is not None and now > self._prev_time:
+            elapsed = now - self._prev_time
+            self.cpu_percent.append((sample.cpu_seconds - prev.cpu_seconds) / elapsed * 100.0)
+            self.voluntary_per_s.append((sample.voluntary_ctxt - prev.voluntary_ctxt) / elapsed)
+            self.involuntary_per_s.append(
+                (sample.involuntary_ctxt - prev.involuntary_ctxt) / elapsed
+            )
+        self.rss_bytes.append(sample.rss_bytes)
+        self.voluntary_total = sample.voluntary_ctxt
+        self.involuntary_total = sample.involuntary_ctxt
+        self._prev = sample
+        self._prev_time = now
+
+
+class ProcSampler:
+    """
+    Periodically samples /proc for a set of worker pids.
+
+    `targets` returns the current (proc_id, pid) pairs; a changed pid
+    (e.g. after a restart) starts a fresh history for that worker.
+    """
+
+    def __init__(
+        self,
+        targets: Callable[[], Iterable[Tuple[int, int]]],
+        interval: float = 1.0,
+        history: int = 120,
+    ) -> None:
+        self.targets = targets
+        self.interval = interval
+        self.history = history
+
+        self._stats: Dict[int, WorkerStats] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def sample_once(self) -> None:
+        now = time.monotonic()
+        seen = set()
+        for proc_id, pid in self.targets():
+            seen.add(proc_id)
+            sample = read_proc_sample(pid)
+            if sample is None:
+                continue
+            stats = self._stats.get(proc_id)
+            if stats is None or stats.pid != pid:
+                stats = WorkerStats(pid, self.history)
+                self._stats[proc_id] = stats
+            stats.update(sample, now)
+
+        for proc_id in list(self._stats):
+            if proc_id not in seen:
+                del self._stats[proc_id]
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample_once()
+            except Exception:
+                # Sampling is best-effort; never kill the thread
+                pass
+
+    def get(self, proc_id: int) -> WorkerStats | None:
+        return self._stats.get(proc_id)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self.sample_once()
+        self._thread = threading.Thread(target=self._run, name="proc-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
@@ -0,0 +1,193 @@
+# ipc_project/core/utils/profiling.py
+
+from __future__ import annotations
+
+import cProfile
+import marshal
+import os
+import pstats
+import signal
+import tempfile
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+
+PROFILE_MODES = ("cprofile", "sampler")
+
+# pstats function key: (filename, first line, function name)
+_FuncKey = Tuple[str, int, str]
+
+
+def default_profile_dir() -> str:
+    return os.path.join(tempfile.gettempdir(), "ipc-profiles")
+
+
+class StackSampler:
+    """
+    Statistical profiler driven by SIGPROF.
+
+    Every `interval` seconds of CPU time the interrupted main-thread stack
+    is counted; nothing runs between samples, so overhead stays low and
+    idle time (sleeping, blocked in recv) is not sampled. Must be started
+    and stopped from the main thread.
+    """
+
+    def __init__(self, interval: float = 0.001) -> None:
+        self.interval = interval
+        self.samples: Counter[Tuple[_FuncKey, ...]] = Counter()
+        # CPU seconds per sample; the kernel may deliver SIGPROF less often
+        # than asked (timer tick granularity), so measured at stop()
+        self.seconds_per_sample = interval
+        self._previous_handler = None
+        self._cpu_start = 0.0
+
+    @staticmethod
+    def available() -> bool:
+        return hasattr(signal, "setitimer") and hasattr(signal, "SIGPROF")
+
+    def _on_signal(self, signum, frame) -> None:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+            frame = frame.f_back
+        if stack:
+            self.samples[tuple(stack)] += 1
+
+    def start(self) -> None:
+        self._previous_handler = signal.signal(signal.SIGPROF, self._on_signal)
+        self._cpu_start = time.process_time()
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self) -> None:
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self._previous_handler or signal.SIG_DFL)
+        total = sum(self.samples.values())
+        if total:
+            self.seconds_per_sample = (time.process_time() - self._cpu_start) / total
+
+    def to_pstats(self) -> Dict[_FuncKey, tuple]:
+        """
+        Samples converted to the dict layout pstats.Stats loads: sample
+        counts stand in for call counts, times are count * seconds_per_sample.
+        """
+        entries: Dict[_FuncKey, list] = {}
+
+        def entry(func: _FuncKey) -> list:
+            if func not in entries:
+                entries[func] = [0, 0, 0.0, 0.0, {}]
+            return entries[func]
+
+        for stack, count in self.samples.items():
+            spent = count * self.seconds_per_sample
+            entry(stack[0])[2] += spent
+            seen = set()
+            for depth, func in enumerate(stack):
+                e = entry(func)
+                if func not in seen:
+                    # Recursion: count each function once per sample
+                    seen.add(func)
+                    e[0] += count
+                    e[1] += count
+                    e[3] += spent
+                if depth + 1 < len(stack):
+                    caller = e[4].setdefault(stack[depth + 1], [0, 0, 0.0, 0.0])
+                    caller[0] += count
+                    caller[1] += count
+                    caller[2] += spent if depth == 0 else 0.0
+                    caller[3] += spent
+
+        return {
+            func: (cc, nc, tt, ct, {k: tuple(v) for k, v in callers.items()})
+            for func, (cc, nc, tt, ct, callers) in entries.items()
+        }
+
+
+class WorkerProfiler:
+    """
+    On-demand profiler for a running worker: start(), then stop() writes a
+    .pstats file (load with pstats.Stats) and returns a short summary.
+
+    Modes:
+    - "cprofile": deterministic, every call is timed; exact call counts,
+      noticeable overhead on call-heavy code.
+    - "sampler":  StackSampler; low overhead, statistical.
+    """
+
+    def __init__(self, name: str, directory: str | None = None) -> None:
+        self.name = name
+        self.directory = directory or default_profile_dir()
+        self.mode: str | None = None
+        self._profiler: cProfile.Profile | StackSampler | None = None
+        self._started = 0.0
+
+    @property
+    def active(self) -> bool:
+        return self._profiler is not None
+
+    def start(self, mode: str = "cprofile", interval: float = 0.001) -> str:
+        if self.active:
+            return f"{self.name}: profiler already running ({self.mode})"
+        if mode not in PROFILE_MODES:
+            return f"{self.name}: unknown profile mode '{mode}' (use {', '.join(PROFILE_MODES)})"
+        if mode == "sampler" and not StackSampler.available():
+            mode = "cprofile"
+
+        if mode == "cprofile":
+            profiler = cProfile.Profile()
+            profiler.enable()
+        else:
+            profiler = StackSampler(interval)
+            profiler.start()
+
+        self._profiler = profiler
+        self.mode = mode
+        self._started = time.monotonic()
+        return f"{self.name}: profiling started ({mode})"
+
+    def stop(self, top: int = 10) -> str:
+        profiler, mode = self._profiler, self.mode
+        if profiler is None:
+            return f"{self.name}: profiler is not running"
+        self._profiler = None
+        self.mode = None
+        elapsed = time.monotonic() - self._started
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(
+            self.directory,
+            f"{self.name}-{os.getpid()}-{time.strftime('%Y%m%d-%H%M%S')}-{mode}.pstats",
+        )
+        if isinstance(profiler, StackSampler):
+            profiler.stop()
+            with open(path, "wb") as fh:
+                marshal.dump(profiler.to_pstats(), fh)
+        else:
+            profiler.disable()
+            profiler.dump_stats(path)
+
+        lines = [f"{self.name}: profile ({mode}, {elapsed:.1f}s) written to {path}"]
+        if isinstance(profiler, StackSampler) and not profiler.samples:
+            # pstats refuses to load an empty profile
+            lines.append("  (no samples: the worker used no CPU)")
+        else:
+            lines.extend(summarize_pstats(path, top))
+        return "\n".join(lines)
+
+
+def summarize_pstats(path: str, top: int = 10) -> List[str]:
+    """
+    One line per function, highest own (non-cumulative) time first, since
+    outer frames like run() would otherwise fill the list.
+    """
+    try:
+        stats = pstats.Stats(path).stats
+    except Exception as exc:
+        return [f"  (cannot read profile: {exc!r})"]
+
+    rows = sorted(stats.items(), key=lambda item: (item[1][2], item[1][3]), reverse=True)[:top]
+    lines = ["      calls   tottime   cumtime  function"]
+    for (filename, lineno, funcname), (cc, nc, tt, ct, _callers) in rows:
+        where = funcname if filename == "~" else f"{funcname} ({os.path.basename(filename)}:{lineno})"
+        lines.append(f"  {nc:9d} {tt:8.3f}s {ct:8.3f}s  {where}")
+    return lines
@@ -0,0 +1,200 @@
+# ipc_project/core/utils/serializer.py
+
+from __future__ import annotations
+
+import bz2
+import lzma
+import pickle
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Tuple
+
+
+# codec name -> (compress(data, level), decompress(data))
+_CODECS: Dict[str, Tuple[Callable[[bytes, int | None], bytes], Callable[[bytes], bytes]]] = {
+    "zlib": (
+        lambda data, level: zlib.compress(data, 6 if level is None else level),
+        zlib.decompress,
+    ),
+    "bz2": (
+        lambda data, level: bz2.compress(data, 9 if level is None else level),
+        bz2.decompress,
+    ),
+    "lzma": (
+        lambda data, level: lzma.compress(data, preset=level),
+        lzma.decompress,
+    ),
+}
+
+
+@dataclass
+class CompressedPayload:
+    """
+    Wire marker for a pickled-then-compressed payload.
+    """
+
+    codec: str
+    data: bytes
+
+
+@dataclass
+class PickledPayload:
+    """
+    Wire marker for a payload that was pickled to be measured or
+    compressed but went out uncompressed; the transport sends these bytes
+    instead of pickling the object a second time.
+    """
+
+    data: bytes
+
+
+def _buffer_size(payload: Any) -> int | None:
+    """
+    Size of str/bytes-like payloads (and numpy arrays) without pickling
+    them; None for anything whose size needs a pickle to tell.
+    """
+    if isinstance(payload, (str, bytes, bytearray)):
+        return len(payload)
+    nbytes = getattr(payload, "nbytes", None)
+    return nbytes if isinstance(nbytes, int) else None
+
+
+class AdaptiveCompressor:
+    """
+    Opt-in payload compression for pipe/queue channels.
+
+    - Payloads whose pickled size is below `threshold` are sent untouched.
+      str/bytes-like payloads are measured with len(); other objects are
+      pickled once, and if they end up uncompressed those bytes go out as
+      a PickledPayload rather than being pickled again by the transport.
+    - The compression ratio is tracked as a moving average; after
+      `sample_size` attempts, compression switches itself off if it saves
+      less than `min_saving` of the bytes.
+    - While off, every `probe_interval`-th eligible payload starts a new
+      sample window, so compression comes back if the traffic changes.
+
+    Statistics are per process: a sender reports compression, a receiver
+    reports decompression.
+    """
+
+    def __init__(
+        self,
+        codec: str = "zlib",
+        threshold: int = 1024,
+        level: int | None = None,
+        min_saving: float = 0.1,
+        sample_size: int = 32,
+        probe_interval: int = 512,
+    ) -> None:
+        if codec not in _CODECS:
+            raise ValueError(f"Unknown compression codec '{codec}'")
+
+        self.codec = codec
+        self.threshold = threshold
+        self.level = level
+        self.min_saving = min_saving
+        self.sample_size = sample_size
+        self.probe_interval = probe_interval
+
+        self.enabled = True
+        self._ratio = 1.0
+        self._samples = 0
+        self._skipped = 0
+
+        self.messages_compressed = 0
+        self.messages_skipped = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.compress_cpu_ns = 0
+        self.decompress_cpu_ns = 0
+        self.messages_decompressed = 0
+
+    # ------------------------------------------------------------------ #
+    # Internal helpers                                                   #
+    # ------------------------------------------------------------------ #
+
+    def _sample(self, ratio: float) -> None:
+        self._samples += 1
+        # Exponential moving average, weighted to the current window
+        self._ratio += (ratio - self._ratio) * (2.0 / (self.sample_size + 1))
+        if self._samples >= self.sample_size and self._ratio > 1.0 - self.min_saving:
+            self.enabled = False
+            self._skipped = 0
+
+    @staticmethod
+    def _uncompressed(payload: Any, size: int | None, data: bytes) -> Any:
+        # Buffers re-pickle as a plain copy; other objects would be walked again
+        return payload if size is not None else PickledPayload(data)
+
+    # ------------------------------------------------------------------ #
+    # Public API                                                         #
+    # ------------------------------------------------------------------ #
+
+    def encode(self, payload: Any) -> Any:
+        """
+        Return a CompressedPayload, or the payload itself when compression
+        is off, the payload is small, or it did not shrink.
+        """
+        size = _buffer_size(payload)
+        if size is not None and size < self.threshold:
+            return payload
+
+        if not self.enabled:
+            self._skipped += 1
+            if self._skipped < self.probe_interval:
+                self.messages_skipped += 1
+                return payload
+            # Probe again with a fresh sample window
+            self.enabled = True
+            self._samples = 0
+
+        data = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) < self.threshold:
+            return self._uncompressed(payload, size, data)
+
+        start = time.thread_time_ns()
+        packed = _CODECS[self.codec][0](data, self.level)
+        self.compress_cpu_ns += time.thread_time_ns() - start
+
+        self._sample(len(packed) / len(data))
+        if len(packed) >= len(data):
+            self.messages_skipped += 1
+            return self._uncompressed(payload, size, data)
+
+        self.messages_compressed += 1
+        self.bytes_in += len(data)
+        self.bytes_out += len(packed)
+        return CompressedPayload(self.codec, packed)
+
+    def decode(self, msg: Any) -> Any:
+        """
+        Undo encode(); anything that is not a CompressedPayload or
+        PickledPayload passes through.
+        """
+        if isinstance(msg, PickledPayload):
+            return pickle.loads(msg.data)
+        if not isinstance(msg, CompressedPayload):
+            return msg
+
+        start = time.thread_time_ns()
+        data = _CODECS[msg.codec][1](msg.data)
+        self.decompress_cpu_ns += time.thread_time_ns() - start
+        self.messages_decompressed += 1
+        return pickle.loads(data)
+
+    def stats(self) -> Dict[str, Any]:
+        ratio = self.bytes_out / self.bytes_in if self.bytes_in else None
+        return {
+            "codec": self.codec,
+            "enabled": self.enabled,
+            "messages_compressed": self.messages_compressed,
+            "messages_skipped": self.messages_skipped,
+            "messages_decompressed": self.messages_decompressed,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "ratio": ratio,
+            "recent_ratio": self._ratio,
+            "compress_cpu_ms": self.compress_cpu_ns / 1e6,
+            "decompress_cpu_ms": self.decompress_cpu_ns / 1e6,
+        }
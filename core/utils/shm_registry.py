@@ -0,0 +1,313 @@
+# ipc_project/core/utils/shm_registry.py
+
+from __future__ import annotations
+
+import json
+import os
+import secrets
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Tuple
+
+# Every segment we create is named <prefix>_<owner pid>_<random>
+SEGMENT_PREFIX = "ipccr"
+DEV_SHM = "/dev/shm"
+
+
+def default_manifest_dir() -> str:
+    return os.path.join(tempfile.gettempdir(), "ipc-control-room", "shm")
+
+
+def _process_start_time(pid: int) -> int | None:
+    """
+    Start time (clock ticks since boot) from /proc, used to tell a live
+    owner from an unrelated process that reused its pid.
+    """
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as fh:
+            stat = fh.read()
+        return int(stat[stat.rindex(b")") + 2 :].split()[19])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _owner_alive(pid: int, start_time: int | None) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Exists, owned by someone else
+        pass
+    if start_time is not None:
+        current = _process_start_time(pid)
+        if current is not None and current != start_time:
+            return False
+    return True
+
+
+def _parse_owner(name: str) -> int | None:
+    parts = name.split("_")
+    if len(parts) != 3 or parts[0] != SEGMENT_PREFIX:
+        return None
+    try:
+        return int(parts[1])
+    except ValueError:
+        return None
+
+
+def _segment_size(name: str) -> int | None:
+    try:
+        return os.stat(os.path.join(DEV_SHM, name)).st_size
+    except OSError:
+        return None
+
+
+def _unlink(name: str) -> bool:
+    if os.path.isdir(DEV_SHM):
+        try:
+            os.unlink(os.path.join(DEV_SHM, name))
+            return True
+        except FileNotFoundError:
+            return False
+    try:
+        # Other POSIX systems have no browsable shm filesystem
+        shared_memory._posixshmem.shm_unlink("/" + name)
+        return True
+    except (AttributeError, OSError):
+        return False
+
+
+class _Manifest:
+    """
+    This process's record of the segments it created:
+    <manifest dir>/<pid>.json, rewritten atomically on every change.
+    """
+
+    def __init__(self) -> None:
+        self.directory = default_manifest_dir()
+        self._pid = -1
+        self._segments: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def _reset_after_fork(self) -> None:
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._segments = {}
+            self._lock = threading.Lock()
+
+    def _write(self) -> None:
+        path = os.path.join(self.directory, f"{self._pid}.json")
+        if not self._segments:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            return
+        data = {
+            "pid": self._pid,
+            "start_time": _process_start_time(self._pid),
+            "segments": self._segments,
+        }
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = f"{path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(data, fh)
+            os.replace(tmp, path)
+        except OSError:
+            # The name prefix still lets the reaper find the segment
+            pass
+
+    def add(self, name: str, size: int, kind: str) -> None:
+        self._reset_after_fork()
+        with self._lock:
+            self._segments[name] = {"size": size, "kind": kind, "created": time.time()}
+            self._write()
+
+    def remove(self, name: str) -> None:
+        self._reset_after_fork()
+        with self._lock:
+            if self._segments.pop(name, None) is not None:
+                self._write()
+
+    def live(self) -> Dict[str, dict]:
+        self._reset_after_fork()
+        return dict(self._segments)
+
+
+_manifest = _Manifest()
+
+
+def set_manifest_dir(directory: str) -> None:
+    """
+    Where manifests are written (call before creating segments).
+    """
+    _manifest.directory = directory
+
+
+def create_segment(size: int, kind: str = "shm") -> shared_memory.SharedMemory:
+    """
+    SharedMemory block named <prefix>_<pid>_<random>, recorded in this
+    process's manifest so a reaper can reclaim it if we crash.
+    """
+    pid = os.getpid()
+    for _ in range(8):
+        name = f"{SEGMENT_PREFIX}_{pid}_{secrets.token_hex(4)}"
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            continue
+        _manifest.add(shm.name, shm.size, kind)
+        return shm
+    raise FileExistsError("could not find a free shared memory name")
+
+
+def release_segment(shm: shared_memory.SharedMemory) -> None:
+    """
+    Unlink a block from create_segment() and drop it from the manifest.
+    Only the creating process should call this.
+    """
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+    finally:
+        _manifest.remove(shm.name)
+
+
+def live_segments() -> Dict[str, dict]:
+    """
+    Segments this process created and has not released: name -> info.
+    """
+    return _manifest.live()
+
+
+@dataclass
+class ReapReport:
+    reclaimed_segments: int = 0
+    reclaimed_bytes: int = 0
+    live_segments: int = 0
+    live_bytes: int = 0
+    reclaimed_names: List[str] = field(default_factory=list)
+
+
+class ShmReaper:
+    """
+    Unlinks segments whose owner process is gone.
+
+    Owners are found from the manifests and, on Linux, from the name of
+    every <prefix>_* entry in /dev/shm (covers a crash before the manifest
+    was written). Run it once at startup to reconcile, then on a timer.
+    """
+
+    def __init__(
+        self,
+        manifest_dir: str | None = None,
+        interval: float = 60.0,
+        on_report: Callable[[ReapReport], None] | None = None,
+    ) -> None:
+        self.manifest_dir = manifest_dir or _manifest.directory
+        self.interval = interval
+        self.on_report = on_report
+        self.last_report = ReapReport()
+        self.total_reclaimed_bytes = 0
+
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _owners(self) -> Tuple[Dict[str, Tuple[int, int | None, int]], List[str]]:
+        """
+        name -> (owner pid, owner start time, size), plus dead manifest paths.
+        """
+        segments: Dict[str, Tuple[int, int | None, int]] = {}
+        manifests: List[str] = []
+        try:
+            entries = os.listdir(self.manifest_dir)
+        except OSError:
+            entries = []
+        for entry in entries:
+            if not entry.endswith(".json"):
+                continue
+            path = os.path.join(self.manifest_dir, entry)
+            try:
+                with open(path, encoding="utf-8") as fh:
+                    data = json.load(fh)
+                pid, start_time = int(data["pid"]), data.get("start_time")
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+            for name, info in data.get("segments", {}).items():
+                segments[name] = (pid, start_time, int(info.get("size", 0)))
+            if not _owner_alive(pid, start_time):
+                manifests.append(path)
+
+        if os.path.isdir(DEV_SHM):
+            for name in os.listdir(DEV_SHM):
+                if name in segments:
+                    continue
+                pid = _parse_owner(name)
+                if pid is not None:
+                    segments[name] = (pid, None, 0)
+        return segments, manifests
+
+    def reap(self) -> ReapReport:
+        report = ReapReport()
+        me = os.getpid()
+        segments, dead_manifests = self._owners()
+
+        for name, (pid, start_time, size) in segments.items():
+            actual = _segment_size(name)
+            if actual is not None:
+                size = actual
+            if pid == me or _owner_alive(pid, start_time):
+                if actual is not None or not os.path.isdir(DEV_SHM):
+                    report.live_segments += 1
+                    report.live_bytes += size
+                continue
+            if _unlink(name):
+                report.reclaimed_segments += 1
+                report.reclaimed_bytes += size
+                report.reclaimed_names.append(name)
+
+        for path in dead_manifests:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+        self.total_reclaimed_bytes += report.reclaimed_bytes
+        self.last_report = report
+        if self.on_report is not None:
+            try:
+                self.on_report(report)
+            except Exception:
+                pass
+        return report
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.reap()
+            except Exception:
+                # Best-effort housekeeping; never kill the thread
+                pass
+
+    def start(self) -> ReapReport:
+        """
+        Reap once now (startup reconciliation), then every `interval` s.
+        """
+        report = self.reap()
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="shm-reaper", daemon=True)
+            self._thread.start()
+        return report
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
@@ -0,0 +1,209 @@
+# ipc_project/core/utils/tracing.py
+
+from __future__ import annotations
+
+import glob
+import itertools
+import json
+import multiprocessing
+import os
+import threading
+from multiprocessing import util
+from typing import Any, Dict, List, Tuple
+
+
+# (phase, name, category, timestamp ns, duration ns, thread id, trace id, args)
+_Event = Tuple[str, str, str, int, int, int, int, Dict[str, Any] | None]
+
+
+class TraceEnvelope:
+    """
+    Wire wrapper carrying trace context with a message.
+
+    sent_ns is a time.perf_counter_ns() reading; on Linux that clock is
+    CLOCK_MONOTONIC, so readings from different processes are comparable.
+    """
+
+    __slots__ = ("trace_id", "sent_ns", "payload")
+
+    def __init__(self, trace_id: int, sent_ns: int, payload: Any) -> None:
+        self.trace_id = trace_id
+        self.sent_ns = sent_ns
+        self.payload = payload
+
+    def __reduce__(self):
+        return (TraceEnvelope, (self.trace_id, self.sent_ns, self.payload))
+
+
+class Tracer:
+    """
+    Per-process buffered recorder of channel timing events.
+
+    - Events go into an in-memory list; the list is written to
+      <name>.<pid>.trace as JSON lines when it reaches `buffer_size`,
+      on flush(), and at process exit.
+    - A Tracer created before fork starts a fresh buffer and file in each
+      child, so every process writes only its own events.
+    - merge_traces() combines the per-process files into one
+      Chrome/Perfetto trace.
+
+    Channels hold an optional tracer and check it once per operation, so
+    a channel without one pays a single `is None` branch.
+    """
+
+    def __init__(self, directory: str, name: str = "trace", buffer_size: int = 8192) -> None:
+        self.directory = directory
+        self.name = name
+        self.buffer_size = buffer_size
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._pid = -1
+        self._start()
+
+    # ------------------------------------------------------------------ #
+    # Internal helpers                                                   #
+    # ------------------------------------------------------------------ #
+
+    def _start(self) -> None:
+        self._pid = os.getpid()
+        self._events: List[_Event] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._path = os.path.join(self.directory, f"{self.name}.{self._pid}.trace")
+        self._write_lines(
+            [
+                {
+                    "ph": "M",
+                    "name": "process_name",
+                    "pid": self._pid,
+                    "args": {"name": multiprocessing.current_process().name},
+                }
+            ]
+        )
+        # Flush on interpreter / worker process exit
+        util.Finalize(self, self.flush, exitpriority=10)
+
+    def _write_lines(self, records: List[dict]) -> None:
+        try:
+            with open(self._path, "a", encoding="utf-8") as fh:
+                for record in records:
+                    fh.write(json.dumps(record, separators=(",", ":")))
+                    fh.write("\n")
+        except OSError:
+            # Tracing must never take a channel down
+            pass
+
+    def _append(self, event: _Event) -> None:
+        if self._pid != os.getpid():
+            self._start()
+        self._events.append(event)
+        if len(self._events) >= self.buffer_size:
+            self.flush()
+
+    # ------------------------------------------------------------------ #
+    # Public API                                                         #
+    # ------------------------------------------------------------------ #
+
+    def new_trace_id(self) -> int:
+        """
+        Id unique across processes: pid in the high bits, counter below.
+        """
+        if self._pid != os.getpid():
+            self._start()
+        return (self._pid << 32) | (next(self._ids) & 0xFFFFFFFF)
+
+    def complete(
+        self,
+        name: str,
+        category: str,
+        start_ns: int,
+        end_ns: int,
+        trace_id: int = 0,
+        args: Dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Record a span that ran from start_ns to end_ns (perf_counter_ns).
+        """
+        self._append(
+            ("X", name, category, start_ns, end_ns - start_ns,
+             threading.get_native_id(), trace_id, args)
+        )
+
+    def flow_start(self, category: str, ts_ns: int, trace_id: int) -> None:
+        """
+        Start of a message's flow arrow (inside the sender's transport span).
+        """
+        self._append(("s", "message", category, ts_ns, 0, threading.get_native_id(), trace_id, None))
+
+    def flow_end(self, category: str, ts_ns: int, trace_id: int) -> None:
+        """
+        End of a message's flow arrow (inside the receiver's span).
+        """
+        self._append(("f", "message", category, ts_ns, 0, threading.get_native_id(), trace_id, None))
+
+    def flush(self) -> None:
+        """
+        Write buffered events of this process to its trace file.
+        """
+        if self._pid != os.getpid():
+            return
+        with self._lock:
+            events, self._events = self._events, []
+        if not events:
+            return
+
+        records = []
+        for phase, name, category, ts_ns, dur_ns, tid, trace_id, args in events:
+            record = {
+                "ph": phase,
+                "name": name,
+                "cat": category,
+                "ts": ts_ns / 1000.0,
+                "pid": self._pid,
+                "tid": tid,
+            }
+            if phase == "X":
+                record["dur"] = dur_ns / 1000.0
+                if trace_id or args:
+                    record["args"] = dict(args or {})
+                    if trace_id:
+                        record["args"]["trace_id"] = f"{trace_id:x}"
+            else:
+                # String ids: 64-bit ints lose precision in JavaScript
+                record["id"] = f"{trace_id:x}"
+                if phase == "f":
+                    # Bind to the enclosing slice rather than the next one
+                    record["bp"] = "e"
+            records.append(record)
+        self._write_lines(records)
+
+
+def merge_traces(directory: str, output_path: str, name: str = "trace") -> int:
+    """
+    Merge all <name>.<pid>.trace files in `directory` into one Chrome trace
+    JSON file (chrome://tracing, ui.perfetto.dev).
+
+    Returns the number of events written. Flush (or stop) the traced
+    processes first; events still buffered in them are not included.
+    """
+    events: List[dict] = []
+    for path in sorted(glob.glob(os.path.join(directory, f"{name}.*.trace"))):
+        try:
+            with open(path, encoding="utf-8") as fh:
+                for line in fh:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        events.append(json.loads(line))
+                    except ValueError:
+                        # Torn last line of a killed process
+                        continue
+        except OSError:
+            continue
+
+    events.sort(key=lambda e: e.get("ts", 0.0))
+    with open(output_path, "w", encoding="utf-8") as fh:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ns"}, fh)
+    return len(events)
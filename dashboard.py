@@ -1,10 +1,12 @@
 # ipc_project/gui/dashboard.py
 
+import time
 import tkinter as tk
 from tkinter import ttk
 
 from gui.theme import apply_dark_theme
 from gui.widgets.log_panel import LogPanel
+from gui.process_panel import ProcessPanel
 from core.process_manager import ProcessManager
 from core.ipc_manager import IPCManager
 from core.security import SecurityManager
@@ -16,6 +18,11 @@ class ControlRoomApp(tk.Tk):
     Main Tkinter application – the IPC Control Room.
     """
 
+    # Rows kept in the Logs tab view
+    LOG_VIEW_ROWS = 500
+    # Worker out_queue drain tick; each tick is time/item budgeted
+    OUTPUT_DRAIN_MS = 50
+
     def __init__(
         self,
         process_manager: ProcessManager,
@@ -44,6 +51,9 @@ class ControlRoomApp(tk.Tk):
         # Connect logger to log panel
         self.logger.register_sink(self.log_panel.append_entry)
 
+        # Worker output (out_queues) is drained from the Tk event loop
+        self.after(self.OUTPUT_DRAIN_MS, self._drain_worker_output)
+
         # Initial log entry
         self.logger.info("Control Room initialized.")
 
@@ -74,6 +84,15 @@ class ControlRoomApp(tk.Tk):
         )
         btn_kill_proc.pack(side=tk.RIGHT, padx=8, pady=8)
 
+        # Profile the selected worker in place (results arrive on its out_queue)
+        self.profile_button = ttk.Button(
+            top_frame,
+            text="Profile Selected",
+            command=self._on_toggle_profile,
+        )
+        self.profile_button.pack(side=tk.RIGHT, padx=8, pady=8)
+        self._profiling: set[int] = set()
+
         # Central paned window: left = process list, right = tabs
         center_paned = ttk.PanedWindow(self, orient=tk.HORIZONTAL)
         center_paned.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
@@ -89,13 +108,8 @@ class ControlRoomApp(tk.Tk):
         center_paned.add(self.tabs_frame, weight=3)
 
         self._create_tabs(self.tabs_frame)
-       
-        self._refresh_pipe_process_menus()
-        self._refresh_queue_process_menus()
-        self._refresh_shm_process_menus()
-
-
 
+        self._refresh_process_menus(self.process_panel.labels())
 
         # Bottom log panel
         self.log_panel = LogPanel(self)
@@ -107,24 +121,30 @@ class ControlRoomApp(tk.Tk):
         header = ttk.Label(parent, text="Processes", style="Header.TLabel")
         header.pack(side=tk.TOP, anchor="w", padx=8, pady=(8, 4))
 
-        self.process_listbox = tk.Listbox(
+        # Follows ProcessManager change events, including processes that
+        # already exist (e.g. loaded from a topology file)
+        self.process_panel = ProcessPanel(
             parent,
-            height=15,
-            activestyle="none",
-            bg="#151515",
-            fg="#f0f0f0",
-            selectbackground="#3aa8ff",
-            selectforeground="#000000",
-            borderwidth=0,
-            highlightthickness=0,
+            self.process_manager,
+            on_labels_changed=self._refresh_process_menus,
         )
-        self.process_listbox.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=8, pady=4)
+        self.process_panel.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=8, pady=4)
 
-        # Simple placeholder – in future connect to real processes
-        ttk.Label(
-            parent,
-            text="(Test processes will appear here)",
-        ).pack(side=tk.TOP, anchor="w", padx=8, pady=(4, 8))
+        # Live /proc stats of the selected worker
+        stats_frame = ttk.Frame(parent, style="Panel.TFrame")
+        stats_frame.pack(side=tk.TOP, fill=tk.X, padx=8, pady=(0, 8))
+
+        self.worker_stats_var = tk.StringVar(value="Select a worker to see CPU / RSS.")
+        ttk.Label(stats_frame, textvariable=self.worker_stats_var, justify=tk.LEFT).pack(
+            side=tk.TOP, anchor="w"
+        )
+
+        self.cpu_sparkline = tk.Canvas(stats_frame, height=28, bg="#000000", highlightthickness=0)
+        self.cpu_sparkline.pack(side=tk.TOP, fill=tk.X, pady=(4, 2))
+        self.rss_sparkline = tk.Canvas(stats_frame, height=28, bg="#000000", highlightthickness=0)
+        self.rss_sparkline.pack(side=tk.TOP, fill=tk.X, pady=(2, 0))
+
+        self.after(1000, self._refresh_worker_stats)
 
     # ----- Tabs -----
 
@@ -152,6 +172,11 @@ class ControlRoomApp(tk.Tk):
         notebook.add(test_tab, text="Test Programs")
         self._build_test_tab(test_tab)
 
+        # Log search tab (needs a LogStore on the logger)
+        logs_tab = ttk.Frame(notebook, style="Panel.TFrame")
+        notebook.add(logs_tab, text="Logs")
+        self._build_logs_tab(logs_tab)
+
         # Chaos mode tab
         chaos_tab = ttk.Frame(notebook, style="Panel.TFrame")
         notebook.add(chaos_tab, text="Chaos Mode")
@@ -418,6 +443,119 @@ class ControlRoomApp(tk.Tk):
 
 
 
+    def _build_logs_tab(self, parent: ttk.Frame) -> None:
+        """
+        Filtered view over logger.store:
+        - Level / channel id / process id / last N seconds / text filters
+        - Only records newer than the last refresh are appended
+        """
+        header = ttk.Label(parent, text="Log Search", style="Header.TLabel")
+        header.pack(anchor="w", padx=10, pady=(10, 6))
+
+        filter_frame = ttk.Frame(parent, style="Panel.TFrame")
+        filter_frame.pack(fill=tk.X, padx=10)
+
+        ttk.Label(filter_frame, text="Level:").grid(row=0, column=0, sticky="w")
+        self.log_level_var = tk.StringVar(value="ALL")
+        ttk.Combobox(
+            filter_frame,
+            textvariable=self.log_level_var,
+            values=["ALL", "INFO", "WARN", "ERROR", "SECURITY"],
+            width=10,
+            state="readonly",
+        ).grid(row=0, column=1, padx=6, pady=4)
+
+        ttk.Label(filter_frame, text="Channel id:").grid(row=0, column=2, sticky="w")
+        self.log_channel_var = tk.StringVar()
+        ttk.Entry(filter_frame, textvariable=self.log_channel_var, width=6).grid(
+            row=0, column=3, padx=6, pady=4
+        )
+
+        ttk.Label(filter_frame, text="Process id:").grid(row=0, column=4, sticky="w")
+        self.log_proc_var = tk.StringVar()
+        ttk.Entry(filter_frame, textvariable=self.log_proc_var, width=6).grid(
+            row=0, column=5, padx=6, pady=4
+        )
+
+        ttk.Label(filter_frame, text="Last seconds:").grid(row=1, column=0, sticky="w")
+        self.log_since_var = tk.StringVar()
+        ttk.Entry(filter_frame, textvariable=self.log_since_var, width=8).grid(
+            row=1, column=1, padx=6, pady=4
+        )
+
+        ttk.Label(filter_frame, text="Contains:").grid(row=1, column=2, sticky="w")
+        self.log_text_var = tk.StringVar()
+        ttk.Entry(filter_frame, textvariable=self.log_text_var, width=24).grid(
+            row=1, column=3, columnspan=3, padx=6, pady=4, sticky="we"
+        )
+
+        ttk.Button(filter_frame, text="Apply Filter", command=self._on_apply_log_filter).grid(
+            row=2, column=0, columnspan=6, pady=(4, 8)
+        )
+
+        self.log_view = tk.Listbox(
+            parent,
+            activestyle="none",
+            bg="#101010",
+            fg="#f0f0f0",
+            borderwidth=0,
+            highlightthickness=0,
+        )
+        self.log_view.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        self._log_filter: dict = {}
+        self._log_view_seq = -1
+        self.after(500, self._refresh_log_view)
+
+    def _on_apply_log_filter(self) -> None:
+        def as_int(var: tk.StringVar) -> int | None:
+            text = var.get().strip()
+            return int(text) if text.isdigit() else None
+
+        level = self.log_level_var.get()
+        self._log_filter = {
+            "level": None if level == "ALL" else level,
+            "channel_id": as_int(self.log_channel_var),
+            "proc_id": as_int(self.log_proc_var),
+            "text": self.log_text_var.get().strip() or None,
+        }
+        seconds = as_int(self.log_since_var)
+
+        store = self.logger.store
+        self.log_view.delete(0, tk.END)
+        if store is None:
+            return
+        self._log_view_seq = store.last_seq
+        records = store.query(
+            since=None if seconds is None else time.time() - seconds,
+            limit=self.LOG_VIEW_ROWS,
+            **self._log_filter,
+        )
+        # Newest first from the store; show oldest at the top
+        for record in reversed(list(records)):
+            self.log_view.insert(tk.END, self._format_log_record(record))
+        self.log_view.see(tk.END)
+
+    def _refresh_log_view(self) -> None:
+        store = self.logger.store
+        if store is not None and store.last_seq != self._log_view_seq:
+            new = list(store.query(after_seq=self._log_view_seq, limit=self.LOG_VIEW_ROWS, **self._log_filter))
+            self._log_view_seq = store.last_seq
+            for record in reversed(new):
+                self.log_view.insert(tk.END, self._format_log_record(record))
+            overflow = self.log_view.size() - self.LOG_VIEW_ROWS
+            if overflow > 0:
+                self.log_view.delete(0, overflow - 1)
+            if new:
+                self.log_view.see(tk.END)
+
+        self.after(500, self._refresh_log_view)
+
+    @staticmethod
+    def _format_log_record(record) -> str:
+        stamp = time.strftime("%H:%M:%S", time.localtime(record.timestamp))
+        return f"{stamp} {record.level:<8} {record.message}"
+
     def _build_chaos_tab(self, parent: ttk.Frame) -> None:
         ttk.Label(parent, text="Chaos Mode Controller (placeholder)").pack(
             padx=10, pady=10, anchor="w"
@@ -430,56 +568,111 @@ class ControlRoomApp(tk.Tk):
         Placeholder handler for creating a test process.
         Later, this will open a small dialog to choose type and name.
         """
-        
-
+        # The process panel and the menus follow the manager's change events
         proc_info = self.process_manager.create_dummy_process()
-        
-        display_name = f"{proc_info['id']} – {proc_info['name']} ({proc_info['role']})"
-        self.process_listbox.insert(tk.END, display_name)
-        self.logger.info(f"Created test process: {display_name}")
-
-       
-        self._refresh_pipe_process_menus()
-        self._refresh_queue_process_menus()
-        self._refresh_shm_process_menus()
-
+        self.logger.info(
+            f"Created test process: {proc_info['id']} – {proc_info['name']} ({proc_info['role']})"
+        )
 
     def _on_terminate_selected(self) -> None:
-        selection = self.process_listbox.curselection()
-        if not selection:
+        proc_id = self._selected_process_id()
+        if proc_id is None:
             self.logger.warning("Terminate requested, but no process selected.")
             return
 
-        index = selection[0]
-        item_text = self.process_listbox.get(index)
-        self.process_listbox.delete(index)
+        self.process_manager.terminate_process(proc_id)
+
+    def _on_toggle_profile(self) -> None:
+        proc_id = self._selected_process_id()
+        if proc_id is None:
+            self.logger.warning("Profile requested, but no worker selected.")
+            return
 
-        # In a later revision, parse the ID and signal the manager
-        self.logger.info(f"Terminated process (UI only for now): {item_text}")
-    def _refresh_pipe_process_menus(self) -> None:
-        processes = self.process_manager.list_processes()
-        labels = [f"{p.id}:{p.name}" for p in processes]
-        self.pipe_sender_menu["values"] = labels
-        self.pipe_receiver_menu["values"] = labels
+        if proc_id in self._profiling:
+            if self.process_manager.stop_profiling(proc_id):
+                self._profiling.discard(proc_id)
+        elif self.process_manager.start_profiling(proc_id, mode="sampler"):
+            self._profiling.add(proc_id)
 
+        self.profile_button.configure(
+            text="Stop Profile" if proc_id in self._profiling else "Profile Selected"
+        )
 
-    def _refresh_queue_process_menus(self) -> None:
-        processes = self.process_manager.list_processes()
-        labels = [f"{p.id}:{p.name}" for p in processes]
+    def _selected_process_id(self) -> int | None:
+        return self.process_panel.selected_id()
+
+    # ----- Worker output -----
+
+    def _drain_worker_output(self) -> None:
+        # Budgeted: at most a few ms per tick, then back to Tk; if work is
+        # left over, come back sooner
+        pending = self.process_manager.output.drain()
+        self.after(1 if pending else self.OUTPUT_DRAIN_MS, self._drain_worker_output)
+
+    # ----- Worker stats -----
+
+    def _refresh_worker_stats(self) -> None:
+        proc_id = self._selected_process_id()
+        stats = None if proc_id is None else self.process_manager.get_worker_stats(proc_id)
+
+        if stats is None:
+            self.worker_stats_var.set("Select a worker to see CPU / RSS.")
+            self.cpu_sparkline.delete("all")
+            self.rss_sparkline.delete("all")
+        else:
+            self.worker_stats_var.set(
+                f"PID {stats.pid}   CPU {stats.cpu_percent.last():5.1f}%   "
+                f"RSS {stats.rss_bytes.last() / (1 << 20):.1f} MB\n"
+                f"ctx switches/s: {stats.voluntary_per_s.last():.0f} voluntary, "
+                f"{stats.involuntary_per_s.last():.0f} involuntary"
+            )
+            self._draw_sparkline(self.cpu_sparkline, stats.cpu_percent.values(), "#3aa8ff")
+            self._draw_sparkline(self.rss_sparkline, stats.rss_bytes.values(), "#7fd36b")
+
+        self.after(1000, self._refresh_worker_stats)
+
+    def _draw_sparkline(self, canvas: tk.Canvas, values, color: str) -> None:
+        canvas.delete("all")
+        if len(values) < 2:
+            return
+        width = max(canvas.winfo_width(), 2)
+        height = max(canvas.winfo_height(), 2)
+        low, high = min(values), max(values)
+        span = (high - low) or 1.0
+        step = width / (len(values) - 1)
+
+        points = []
+        for i, value in enumerate(values):
+            points.append(i * step)
+            points.append(height - 2 - (value - low) / span * (height - 4))
+        canvas.create_line(*points, fill=color, width=1)
+    def _refresh_process_menus(self, labels) -> None:
+        """
+        Point every process dropdown at the panel's shared label list
+        (built once per change, not once per menu).
+        """
+        self._refresh_pipe_process_menus(labels)
+        self._refresh_queue_process_menus(labels)
+        self._refresh_shm_process_menus(labels)
 
+    def _refresh_pipe_process_menus(self, labels) -> None:
+        if hasattr(self, "pipe_sender_menu"):
+            self.pipe_sender_menu["values"] = labels
+        if hasattr(self, "pipe_receiver_menu"):
+            self.pipe_receiver_menu["values"] = labels
+
+
+    def _refresh_queue_process_menus(self, labels) -> None:
         if hasattr(self, "queue_sender_menu"):
             self.queue_sender_menu["values"] = labels
         if hasattr(self, "queue_receiver_menu"):
             self.queue_receiver_menu["values"] = labels
 
 
-    def _refresh_shm_process_menus(self) -> None:
+    def _refresh_shm_process_menus(self, labels) -> None:
         """
         Refresh writer and reader dropdowns for the SHM tab.
         """
-        processes = self.process_manager.list_processes()
-        labels = [f"{p.id}:{p.name}" for p in processes]
-
         if hasattr(self, "shm_writer_menu"):
             self.shm_writer_menu["values"] = labels
         if hasattr(self, "shm_reader_menu"):
@@ -500,10 +693,12 @@ class ControlRoomApp(tk.Tk):
         receiver_id = int(receiver_label.split(":")[0])
 
         # Create pipe channel
+        # Flow control keeps a slow receiver from freezing the GUI on send
         self.current_pipe_channel = self.ipc_manager.create_pipe_channel(
             name=f"pipe_{sender_id}_to_{receiver_id}",
             allowed_senders=[sender_id],
             allowed_receivers=[receiver_id],
+            flow_control_credits=64,
         )
 
         self.logger.info(
@@ -526,7 +721,14 @@ class ControlRoomApp(tk.Tk):
             return
         sender_id = int(s_label.split(":")[0])
 
-        self.current_pipe_channel.send_message(sender_id=sender_id, payload=msg)
+        sent = self.current_pipe_channel.send_message(
+            sender_id=sender_id, payload=msg, block=False
+        )
+        if not sent:
+            return
+        pending = self.current_pipe_channel.pending_count()
+        if pending:
+            self.logger.warning(f"Pipe is full, {pending} message(s) buffered until the receiver reads.")
         self._animate_pipe_dot()
     def _on_pipe_receive(self) -> None:
         if not self.current_pipe_channel:
@@ -541,6 +743,8 @@ class ControlRoomApp(tk.Tk):
         receiver_id = int(r_label.split(":")[0])
 
         msg = self.current_pipe_channel.receive_message(receiver_id=receiver_id, block=False)
+        # Reading returned a credit: push out anything buffered on send
+        self.current_pipe_channel.flush_pending()
         if msg is None:
             self.logger.info("No message available to receive.")
             return
@@ -561,6 +765,8 @@ class ControlRoomApp(tk.Tk):
         receiver_id = int(r_label.split(":")[0])
 
         msg = self.current_pipe_channel.receive_message(receiver_id=receiver_id, block=False)
+        # Reading returned a credit: push out anything buffered on send
+        self.current_pipe_channel.flush_pending()
         if msg is None:
             self.logger.info("No message available to receive.")
             return
@@ -735,9 +941,6 @@ class ControlRoomApp(tk.Tk):
             self.current_pipe_channel, sender_id
         )
 
-        # Display process in the left panel
-        self.process_listbox.insert(tk.END, f"{proc_id} – PingWorker")
-
     def _start_echo_test(self):
         if not self.current_pipe_channel:
             self.logger.warning("Create a pipe channel first before starting an Echo process.")
@@ -757,5 +960,3 @@ class ControlRoomApp(tk.Tk):
             self.current_pipe_channel, receiver_id, sender_id
         )
 
-        self.process_listbox.insert(tk.END, f"{proc_id} – EchoWorker")
-
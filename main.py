@@ -1,29 +1,86 @@
 # ipc_project/main.py
 
+import argparse
+import signal
+import threading
 import tkinter as tk  # (kept if you need anything from tk before app init)
 
 from core.process_manager import ProcessManager
 from core.ipc_manager import IPCManager
 from core.security import SecurityManager
+from core.topology import TopologyLoader
 from core.utils.logger import AppLogger
-from gui.dashboard import ControlRoomApp
+from core.utils.log_store import LogStore
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="IPC Control Room")
+    parser.add_argument("--topology", help="JSON/TOML topology spec to bring up at start")
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="run without the GUI until interrupted (Ctrl+C / SIGTERM)",
+    )
+    return parser.parse_args()
+
+
+def _run_headless() -> None:
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    try:
+        while not stop.wait(0.5):
+            pass
+    except KeyboardInterrupt:
+        pass
 
 
 def main() -> None:
+    args = _parse_args()
+
     # Core app components
-    logger = AppLogger()
+    # Structured records, bounded: the Logs tab filters these
+    logger = AppLogger(store=LogStore(capacity=20_000))
     security_manager = SecurityManager(logger=logger)
     process_manager = ProcessManager(logger=logger)
     ipc_manager = IPCManager(logger=logger, security_manager=security_manager)
 
-    # GUI application
+    if args.headless:
+        logger.register_sink(lambda message, level: print(f"[{level}] {message}", flush=True))
+
+    if args.topology:
+        TopologyLoader(ipc_manager, process_manager).load_file(args.topology)
+
+    # Reclaim shared memory leaked by crashed runs, then keep checking
+    ipc_manager.start_shm_reaper(interval=60.0)
+
+    # Background health: restart hung workers, sample CPU/RSS from /proc
+    process_manager.start_supervisor()
+    process_manager.start_sampler(interval=1.0)
+
+    if args.headless:
+        # No Tk loop to tick the worker output drain; use its thread
+        process_manager.output.start(interval=0.05)
+        try:
+            _run_headless()
+        finally:
+            process_manager.shutdown()
+            ipc_manager.close_all()
+        return
+
+    # GUI application (imported here so headless mode needs no display/Tk)
+    from gui.dashboard import ControlRoomApp
+
     app = ControlRoomApp(
         process_manager=process_manager,
         ipc_manager=ipc_manager,
         security_manager=security_manager,
         logger=logger,
     )
-    app.mainloop()
+    try:
+        app.mainloop()
+    finally:
+        process_manager.shutdown()
+        ipc_manager.close_all()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,358 @@
+# ipc_project/gui/process_panel.py
+
+from __future__ import annotations
+
+import bisect
+import tkinter as tk
+from collections import deque
+from tkinter import ttk
+from typing import Callable, Deque, Dict, List, Tuple
+
+from core.process_manager import ProcessInfo, ProcessManager
+from core.utils.proc_stats import WorkerStats
+
+
+class ProcessPanel(ttk.Frame):
+    """
+    Virtualized process list.
+
+    - Only the rows that fit in the visible area exist as canvas items;
+      scrolling re-targets that small pool of text items instead of
+      creating one widget row per process.
+    - ProcessManager change events are queued from whatever thread emits
+      them and applied on the Tk thread every APPLY_INTERVAL_MS, with
+      repeated events for one process coalesced into a single update.
+    - Combobox labels ("<id>:<name>") are built once per membership
+      change and shared by every caller of labels().
+    - Each visible row shows the worker's current CPU%, RSS and context
+      switch rate, with CPU and switch-rate sparklines from its sampled
+      history, refreshed every STATS_INTERVAL_MS.
+    """
+
+    ROW_HEIGHT = 18
+    APPLY_INTERVAL_MS = 100
+    STATS_INTERVAL_MS = 1000
+    SPARK_WIDTH = 60
+
+    def __init__(
+        self,
+        parent,
+        process_manager: ProcessManager,
+        on_select: Callable[[int | None], None] | None = None,
+        on_labels_changed: Callable[[List[str]], None] | None = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(parent, **kwargs)
+        self.process_manager = process_manager
+        self.on_select = on_select
+        self.on_labels_changed = on_labels_changed
+
+        # Process ids only grow, so appends keep this sorted; bisect
+        # handles anything out of order
+        self._ids: List[int] = []
+        self._rows: Dict[int, str] = {}
+        self._names: Dict[int, str] = {}
+        self._labels: List[str] | None = None
+        self._selected: int | None = None
+        self._top = 0
+
+        self._pending: Deque[Tuple[str, ProcessInfo]] = deque()
+        self._row_items: List[int] = []
+        # Per pooled row: stats text, CPU sparkline, switch-rate sparkline
+        self._stat_items: List[Tuple[int, int, int]] = []
+
+        self.canvas = tk.Canvas(
+            self,
+            bg="#151515",
+            borderwidth=0,
+            highlightthickness=0,
+            takefocus=1,
+        )
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self._highlight = self.canvas.create_rectangle(
+            0, 0, 0, 0, fill="#3aa8ff", outline="", state="hidden"
+        )
+
+        self.canvas.bind("<Configure>", lambda _event: self._redraw())
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
+        self.canvas.bind("<Button-4>", lambda _event: self._scroll_rows(-3))
+        self.canvas.bind("<Button-5>", lambda _event: self._scroll_rows(3))
+        self.canvas.bind("<Up>", lambda _event: self._move_selection(-1))
+        self.canvas.bind("<Down>", lambda _event: self._move_selection(1))
+
+        for info in process_manager.list_processes():
+            if info.status != "terminated":
+                self._pending.append(("added", info))
+        process_manager.register_listener(self._on_process_event)
+
+        self._apply_pending()
+        self._refresh_stats()
+
+    # ------------------------------------------------------------------ #
+    # Internal helpers                                                   #
+    # ------------------------------------------------------------------ #
+
+    def _on_process_event(self, event: str, info: ProcessInfo) -> None:
+        # Any thread; deque.append is atomic and nothing here touches Tk
+        self._pending.append((event, info))
+
+    @staticmethod
+    def _row_text(info: ProcessInfo) -> str:
+        return f"{info.id} – {info.name} ({info.role})  {info.status}"
+
+    @staticmethod
+    def _stats_text(stats: WorkerStats) -> str:
+        switches = stats.voluntary_per_s.last() + stats.involuntary_per_s.last()
+        return (
+            f"{stats.cpu_percent.last():5.1f}%  "
+            f"{stats.rss_bytes.last() / (1 << 20):7.1f} MB  "
+            f"{switches:7.0f} cs/s"
+        )
+
+    def _spark_coords(self, values: List[float], left: int, y: int, floor: float) -> List[float]:
+        # Scaled to max(floor, peak) so an idle worker stays a flat line
+        high = max(max(values), floor)
+        step = self.SPARK_WIDTH / (len(values) - 1)
+        bottom = y + self.ROW_HEIGHT - 3
+        span = self.ROW_HEIGHT - 6
+        coords: List[float] = []
+        for i, value in enumerate(values):
+            coords.append(left + i * step)
+            coords.append(bottom - max(value, 0.0) / high * span)
+        return coords
+
+    def _draw_stats(self, row: int, proc_id: int | None, selected: bool) -> None:
+        text_item, cpu_item, ctx_item = self._stat_items[row]
+        stats = None if proc_id is None else self.process_manager.get_worker_stats(proc_id)
+        if stats is None:
+            self.canvas.itemconfigure(text_item, text="")
+            self.canvas.itemconfigure(cpu_item, state="hidden")
+            self.canvas.itemconfigure(ctx_item, state="hidden")
+            return
+
+        width = self.canvas.winfo_width()
+        y = row * self.ROW_HEIGHT
+        self.canvas.coords(text_item, width - 2 * self.SPARK_WIDTH - 12, y + self.ROW_HEIGHT // 2)
+        self.canvas.itemconfigure(
+            text_item,
+            text=self._stats_text(stats),
+            fill="#000000" if selected else "#f0f0f0",
+        )
+
+        cpu = stats.cpu_percent.values()
+        switches = [
+            v + i for v, i in zip(stats.voluntary_per_s.values(), stats.involuntary_per_s.values())
+        ]
+        for item, values, left, floor in (
+            (cpu_item, cpu, width - 2 * self.SPARK_WIDTH - 8, 100.0),
+            (ctx_item, switches, width - self.SPARK_WIDTH - 4, 1.0),
+        ):
+            if len(values) < 2:
+                self.canvas.itemconfigure(item, state="hidden")
+                continue
+            self.canvas.coords(item, *self._spark_coords(values, left, y, floor))
+            self.canvas.itemconfigure(item, state="normal")
+
+    def _refresh_stats(self) -> None:
+        # Visible rows only; the sampler thread owns the histories
+        self._redraw_stats()
+        self.after(self.STATS_INTERVAL_MS, self._refresh_stats)
+
+    def _redraw_stats(self) -> None:
+        for row in range(len(self._stat_items)):
+            index = self._top + row
+            if row >= self._visible_count() or index >= len(self._ids):
+                self._draw_stats(row, None, False)
+            else:
+                proc_id = self._ids[index]
+                self._draw_stats(row, proc_id, proc_id == self._selected)
+
+    def _visible_count(self) -> int:
+        return max(self.canvas.winfo_height() // self.ROW_HEIGHT + 1, 1)
+
+    def _apply_pending(self) -> None:
+        """
+        Apply queued change events, newest state per process wins.
+        """
+        latest: Dict[int, Tuple[str, ProcessInfo]] = {}
+        while self._pending:
+            event, info = self._pending.popleft()
+            previous = latest.get(info.id)
+            if previous is not None and previous[0] == "added" and event == "updated":
+                # Still an insert as far as this view is concerned
+                event = "added"
+            latest[info.id] = (event, info)
+
+        membership_changed = False
+        redraw = False
+        first, last = self._top, self._top + self._visible_count()
+
+        for proc_id, (event, info) in latest.items():
+            known = proc_id in self._rows
+            if event == "removed":
+                if not known:
+                    continue
+                index = bisect.bisect_left(self._ids, proc_id)
+                del self._ids[index]
+                del self._rows[proc_id]
+                del self._names[proc_id]
+                if self._selected == proc_id:
+                    self._selected = None
+                    self._notify_select()
+                membership_changed = redraw = True
+                continue
+
+            if not known:
+                if not self._ids or proc_id > self._ids[-1]:
+                    self._ids.append(proc_id)
+                else:
+                    bisect.insort(self._ids, proc_id)
+                membership_changed = redraw = True
+            elif self._names[proc_id] != info.name:
+                membership_changed = True
+
+            text = self._row_text(info)
+            if self._rows.get(proc_id) != text:
+                self._rows[proc_id] = text
+                self._names[proc_id] = info.name
+                if not redraw:
+                    index = bisect.bisect_left(self._ids, proc_id)
+                    redraw = first <= index < last
+
+        if membership_changed:
+            self._labels = None
+            if self.on_labels_changed is not None:
+                self.on_labels_changed(self.labels())
+        if redraw:
+            self._redraw()
+
+        self.after(self.APPLY_INTERVAL_MS, self._apply_pending)
+
+    def _redraw(self) -> None:
+        visible = self._visible_count()
+        self._top = max(0, min(self._top, len(self._ids) - visible + 1))
+        width = self.canvas.winfo_width()
+
+        # Grow the item pool to the window height; it never shrinks
+        while len(self._row_items) < visible:
+            self._row_items.append(
+                self.canvas.create_text(
+                    6,
+                    len(self._row_items) * self.ROW_HEIGHT + self.ROW_HEIGHT // 2,
+                    anchor="w",
+                    fill="#f0f0f0",
+                    text="",
+                )
+            )
+        while len(self._stat_items) < visible:
+            self._stat_items.append(
+                (
+                    self.canvas.create_text(0, 0, anchor="e", fill="#f0f0f0", text=""),
+                    self.canvas.create_line(0, 0, 0, 0, fill="#3aa8ff", state="hidden"),
+                    self.canvas.create_line(0, 0, 0, 0, fill="#f0a030", state="hidden"),
+                )
+            )
+
+        self.canvas.itemconfigure(self._highlight, state="hidden")
+        for row, item in enumerate(self._row_items):
+            index = self._top + row
+            if row >= visible or index >= len(self._ids):
+                self.canvas.itemconfigure(item, text="")
+                continue
+            proc_id = self._ids[index]
+            selected = proc_id == self._selected
+            self.canvas.itemconfigure(
+                item,
+                text=self._rows[proc_id],
+                fill="#000000" if selected else "#f0f0f0",
+            )
+            if selected:
+                y = row * self.ROW_HEIGHT
+                self.canvas.coords(self._highlight, 0, y, width, y + self.ROW_HEIGHT)
+                self.canvas.itemconfigure(self._highlight, state="normal")
+                self.canvas.tag_lower(self._highlight)
+
+        self._redraw_stats()
+
+        total = len(self._ids)
+        if total <= visible:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self._top / total, min((self._top + visible) / total, 1.0))
+
+    def _scroll_rows(self, delta: int) -> None:
+        self._top += delta
+        self._redraw()
+
+    def _on_scrollbar(self, action: str, amount, unit: str | None = None) -> None:
+        if action == "moveto":
+            self._top = int(float(amount) * len(self._ids))
+        elif action == "scroll":
+            step = self._visible_count() - 1 if unit == "pages" else 1
+            self._top += int(amount) * max(step, 1)
+        self._redraw()
+
+    def _on_mousewheel(self, event) -> None:
+        self._scroll_rows(-3 if event.delta > 0 else 3)
+
+    def _on_click(self, event) -> None:
+        self.canvas.focus_set()
+        index = self._top + event.y // self.ROW_HEIGHT
+        if 0 <= index < len(self._ids):
+            self.select(self._ids[index])
+
+    def _move_selection(self, delta: int) -> None:
+        if not self._ids:
+            return
+        if self._selected is None:
+            index = self._top
+        else:
+            index = bisect.bisect_left(self._ids, self._selected) + delta
+        index = max(0, min(index, len(self._ids) - 1))
+        self.select(self._ids[index])
+
+        visible = self._visible_count() - 1
+        if index < self._top:
+            self._top = index
+        elif index >= self._top + visible:
+            self._top = index - visible + 1
+        self._redraw()
+
+    def _notify_select(self) -> None:
+        if self.on_select is not None:
+            self.on_select(self._selected)
+
+    # ------------------------------------------------------------------ #
+    # Public API                                                         #
+    # ------------------------------------------------------------------ #
+
+    def selected_id(self) -> int | None:
+        return self._selected
+
+    def select(self, proc_id: int | None) -> None:
+        if proc_id is not None and proc_id not in self._rows:
+            return
+        if proc_id != self._selected:
+            self._selected = proc_id
+            self._redraw()
+            self._notify_select()
+
+    def labels(self) -> List[str]:
+        """
+        "<id>:<name>" for every listed process, in id order. The same list
+        object is returned until the membership changes; do not mutate it.
+        """
+        if self._labels is None:
+            self._labels = [f"{proc_id}:{self._names[proc_id]}" for proc_id in self._ids]
+        return self._labels
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def destroy(self) -> None:
+        self.process_manager.unregister_listener(self._on_process_event)
+        super().destroy()
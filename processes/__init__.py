@@ -9,5 +9,6 @@ Do NOT import any GUI modules from here.
 from .base_process import BaseWorker  # optional
 from .ping_process import PingWorker  # optional
 from .echo_process import EchoWorker  # optional
+from .rpc_process import RpcServerWorker  # optional
 
-__all__ = ["BaseWorker", "PingWorker", "EchoWorker"]
+__all__ = ["BaseWorker", "PingWorker", "EchoWorker", "RpcServerWorker"]
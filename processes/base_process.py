@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 from multiprocessing import Process, Queue
+import os
 import time
 import traceback
 
+from core.status_table import ERROR_EXCEPTION, STATE_FAILED, STATE_STOPPED
+from core.utils.profiling import WorkerProfiler
+
 
 class BaseWorker(Process):
     """
@@ -14,8 +18,17 @@ class BaseWorker(Process):
     - Receives commands via cmd_queue.
     - Sends logs/output back via out_queue.
     - Runs a user-defined loop (run_loop).
+    - Optionally reports pid, heartbeat and loop count into its slot of a
+      shared WorkerStatusTable (set by ProcessManager before start()).
+    - Understands "profile start [cprofile|sampler]" and "profile stop"
+      commands; the stop command writes a .pstats file and logs a summary.
     """
 
+    # Pause between loop iterations; 0 for workers that block in run_loop
+    loop_interval: float = 0.1
+    # Where "profile stop" writes .pstats files (None: <tmp>/ipc-profiles)
+    profile_dir: str | None = None
+
     def __init__(self, proc_id: int, name: str, cmd_queue: Queue, out_queue: Queue):
         super().__init__()
         self.proc_id = proc_id
@@ -24,6 +37,13 @@ class BaseWorker(Process):
         self.out_queue = out_queue
         self._running = True
 
+        self.status_table = None
+        self.status_slot: int | None = None
+        self.loop_count = 0
+        # CPU set chosen by the placement policy; applied inside the child
+        self.cpu_affinity: set | None = None
+        self._profiler: WorkerProfiler | None = None
+
     def log(self, message: str):
         """
         Send a log/output message back to the main GUI.
@@ -36,11 +56,42 @@ class BaseWorker(Process):
     # ---------------------------------------------------------
     # Worker main loop
     # ---------------------------------------------------------
+    def _apply_affinity(self):
+        if not self.cpu_affinity or not hasattr(os, "sched_setaffinity"):
+            return
+        try:
+            os.sched_setaffinity(0, self.cpu_affinity)
+        except OSError as exc:
+            self.log(f"{self.name}: could not set CPU affinity {sorted(self.cpu_affinity)}: {exc}")
+
+    def _handle_profile_command(self, cmd: str):
+        parts = cmd.split()
+        action = parts[1] if len(parts) > 1 else ""
+        if self._profiler is None:
+            self._profiler = WorkerProfiler(self.name, self.profile_dir)
+
+        if action == "start":
+            self.log(self._profiler.start(parts[2] if len(parts) > 2 else "cprofile"))
+        elif action == "stop":
+            self.log(self._profiler.stop())
+        else:
+            self.log(f"{self.name}: usage: profile start [cprofile|sampler] | profile stop")
+
     def run(self):
+        self._apply_affinity()
+        table, slot = self.status_table, self.status_slot
+        if table is not None:
+            table.mark_started(slot, os.getpid())
+        final_state = STATE_STOPPED
+
         self.log(f"{self.name}: started")
 
         try:
             while self._running:
+                if table is not None:
+                    self.loop_count += 1
+                    table.heartbeat(slot, self.loop_count)
+
                 # Process commands
                 try:
                     cmd = self.cmd_queue.get_nowait()
@@ -48,19 +99,32 @@ class BaseWorker(Process):
                         self.log(f"{self.name}: stopping")
                         self._running = False
                         break
-                    self.handle_command(cmd)
+                    if isinstance(cmd, str) and cmd.startswith("profile"):
+                        self._handle_profile_command(cmd)
+                    else:
+                        self.handle_command(cmd)
                 except Exception:
                     pass
 
                 # User-defined loop implementation
                 self.run_loop()
 
-                time.sleep(0.1)
+                if self.loop_interval:
+                    time.sleep(self.loop_interval)
 
         except Exception as e:
+            final_state = STATE_FAILED
+            if table is not None:
+                table.set_error(slot, ERROR_EXCEPTION)
             self.out_queue.put((self.proc_id, f"ERROR: {e}"))
             traceback.print_exc()
 
+        if self._profiler is not None and self._profiler.active:
+            # Do not lose a profile that was still running at stop
+            self.log(self._profiler.stop())
+
+        if table is not None:
+            table.set_state(slot, final_state)
         self.log(f"{self.name}: terminated")
 
     # ---------------------------------------------------------
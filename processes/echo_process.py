@@ -6,17 +6,35 @@ from processes.base_process import BaseWorker
 class EchoWorker(BaseWorker):
     """
     Reads from a pipe/queue and echoes back uppercase responses.
+
+    Non-text messages are echoed unchanged. With a reply_channel the echo
+    goes there instead of back on `channel` (pipeline stages); a list of
+    reply channels is indexed by the message's route, msg[0], so one echo
+    worker can answer several ping workers (fan-in).
     """
 
-    def __init__(self, proc_id, name, cmd_queue, out_queue, channel, receiver_id, sender_id):
+    # > 0: wait up to this long for a message instead of polling once
+    receive_timeout = 0.0
+
+    def __init__(self, proc_id, name, cmd_queue, out_queue, channel, receiver_id, sender_id, reply_channel=None):
         super().__init__(proc_id, name, cmd_queue, out_queue)
         self.channel = channel
         self.receiver_id = receiver_id
         self.sender_id = sender_id
+        self.reply_channel = reply_channel
+
+    def _reply_target(self, msg):
+        target = self.channel if self.reply_channel is None else self.reply_channel
+        if isinstance(target, (list, tuple)):
+            target = target[msg[0]]
+        return target
 
     def run_loop(self):
-        msg = self.channel.receive_message(self.receiver_id, block=False)
+        if self.receive_timeout > 0:
+            msg = self.channel.receive_message(self.receiver_id, block=True, timeout=self.receive_timeout)
+        else:
+            msg = self.channel.receive_message(self.receiver_id, block=False)
         if msg:
-            echo_msg = msg.upper()
-            self.channel.send_message(self.sender_id, echo_msg)
+            echo_msg = msg.upper() if isinstance(msg, str) else msg
+            self._reply_target(msg).send_message(self.sender_id, echo_msg)
             self.log(f"{self.name}: {msg} -> {echo_msg}")
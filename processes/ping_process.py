@@ -1,5 +1,7 @@
 # ipc_project/processes/ping_process.py
 
+from array import array
+
 from processes.base_process import BaseWorker
 import time
 
@@ -7,15 +9,101 @@ import time
 class PingWorker(BaseWorker):
     """
     Sends "PING" once every second to a pipe or queue channel.
+
+    With a reply_channel it runs a timed round trip instead (used by
+    core.benchmark): after a "start" command it sends `count` pings
+    (route, seq, sent_at), keeps up to `window` in flight, and times each
+    reply coming back on reply_channel. `channel` may then be a list,
+    pinged round-robin (fan-out). When done it puts
+    (proc_id, rtt bytes (array "d"), elapsed, cpu seconds) on `results`.
     """
 
-    def __init__(self, proc_id, name, cmd_queue, out_queue, channel, sender_id):
+    # How long a round-trip loop iteration waits for a reply
+    receive_timeout = 0.05
+
+    def __init__(
+        self,
+        proc_id,
+        name,
+        cmd_queue,
+        out_queue,
+        channel,
+        sender_id,
+        reply_channel=None,
+        receiver_id=None,
+        count=0,
+        window=1,
+        route=0,
+        results=None,
+    ):
         super().__init__(proc_id, name, cmd_queue, out_queue)
         self.channel = channel
         self.sender_id = sender_id
         self._last_ping = 0
 
+        self.reply_channel = reply_channel
+        self.receiver_id = receiver_id
+        self.count = count
+        self.window = max(1, window)
+        # Echo workers serving several pings reply on channel[route]
+        self.route = route
+        self.results = results
+        self._targets = list(channel) if isinstance(channel, (list, tuple)) else [channel]
+        self._armed = False
+        self._done = False
+        self._seq = 0
+        self._in_flight = 0
+        self._rtts = array("d")
+        self._began = (0.0, 0.0)
+        if reply_channel is not None:
+            self.loop_interval = 0.0
+
+    def handle_command(self, cmd):
+        if cmd == "start" and self.reply_channel is not None and not self._armed:
+            self._armed = True
+            self._began = (time.perf_counter(), time.process_time())
+
+    def _finish(self):
+        elapsed = time.perf_counter() - self._began[0]
+        cpu = time.process_time() - self._began[1]
+        self._done = True
+        if self.results is not None:
+            self.results.put((self.proc_id, self._rtts.tobytes(), elapsed, cpu))
+        ordered = sorted(self._rtts)
+        median = ordered[len(ordered) // 2] if ordered else 0.0
+        self.log(
+            f"{self.name}: {len(self._rtts)} round trips in {elapsed:.3f}s, "
+            f"median {median * 1e6:.0f}us"
+        )
+
+    def _round_trip(self):
+        if not self._armed or self._done:
+            time.sleep(self.receive_timeout)
+            return
+
+        while self._in_flight < self.window and self._seq < self.count:
+            target = self._targets[self._seq % len(self._targets)]
+            if not target.send_message(self.sender_id, (self.route, self._seq, time.perf_counter())):
+                break
+            self._seq += 1
+            self._in_flight += 1
+
+        # Block for the first reply (if allowed), then take what is queued
+        timeout = self.receive_timeout
+        reply = self.reply_channel.receive_message(self.receiver_id, block=timeout > 0, timeout=timeout)
+        while reply is not None:
+            self._rtts.append(time.perf_counter() - reply[2])
+            self._in_flight -= 1
+            reply = self.reply_channel.receive_message(self.receiver_id, block=False)
+
+        if len(self._rtts) >= self.count:
+            self._finish()
+
     def run_loop(self):
+        if self.reply_channel is not None:
+            self._round_trip()
+            return
+
         # Send ping every 1 second
         now = time.time()
         if now - self._last_ping >= 1:
@@ -0,0 +1,74 @@
+# ipc_project/processes/rpc_process.py
+
+from processes.base_process import BaseWorker
+from core.rpc import RpcRequest, RpcResponse
+
+
+class RpcServerWorker(BaseWorker):
+    """
+    Serves RpcRequest envelopes from an RpcClient.
+
+    Subclasses add handlers as methods named rpc_<method>. Each loop
+    iteration waits briefly for one request, then drains whatever else is
+    already queued (up to max_batch), so pipelined requests are answered
+    back-to-back instead of one per loop tick.
+    """
+
+    loop_interval = 0.0
+    max_batch = 64
+    # How long run_loop waits for the first request before checking commands
+    receive_timeout = 0.05
+
+    def __init__(self, proc_id, name, cmd_queue, out_queue, channel, server_id, reply_channel=None):
+        super().__init__(proc_id, name, cmd_queue, out_queue)
+        self.channel = channel
+        self.server_id = server_id
+        self.reply_channel = reply_channel
+        self.calls_served = 0
+
+    def _reply(self, response):
+        if self.reply_channel is not None:
+            return self.reply_channel.send_message(self.server_id, response)
+        return self.channel.send_reply(self.server_id, response)
+
+    def _dispatch(self, request):
+        if not isinstance(request, RpcRequest):
+            self.log(f"{self.name}: ignoring non-RPC message {request!r}")
+            return
+
+        handler = getattr(self, f"rpc_{request.method}", None)
+        if handler is None:
+            response = RpcResponse(
+                request.call_id, ok=False, error=f"Unknown method '{request.method}'"
+            )
+        else:
+            try:
+                result = handler(*request.args, **request.kwargs)
+                response = RpcResponse(request.call_id, ok=True, result=result)
+            except Exception as exc:
+                response = RpcResponse(request.call_id, ok=False, error=repr(exc))
+
+        self._reply(response)
+        self.calls_served += 1
+
+    def run_loop(self):
+        request = self.channel.receive_message(
+            self.server_id, block=True, timeout=self.receive_timeout
+        )
+        handled = 0
+        while request is not None:
+            self._dispatch(request)
+            handled += 1
+            if handled >= self.max_batch:
+                break
+            request = self.channel.receive_message(self.server_id, block=False)
+
+    # ---------------------------------------------------------
+    # Built-in handlers
+    # ---------------------------------------------------------
+    def rpc_ping(self):
+        return "PONG"
+
+    def rpc_echo(self, text):
+        # Same behaviour as EchoWorker, as a request/response call
+        return text.upper()
@@ -0,0 +1,166 @@
+# ipc_project/processes/worker_host.py
+
+from __future__ import annotations
+
+import heapq
+import queue
+import time
+from collections import deque
+from multiprocessing import Queue
+
+from processes.base_process import BaseWorker
+
+
+class LocalQueue:
+    """
+    cmd_queue of a hosted worker: it lives in the same process as its
+    host, so a deque stands in for a multiprocessing.Queue (no pipe, no
+    feeder thread, no file descriptors).
+    """
+
+    def __init__(self):
+        self._items = deque()
+
+    def put(self, item):
+        self._items.append(item)
+
+    def get_nowait(self):
+        try:
+            return self._items.popleft()
+        except IndexError:
+            raise queue.Empty from None
+
+
+class WorkerHost(BaseWorker):
+    """
+    One OS process running many logical workers cooperatively.
+
+    Hosted workers are ordinary BaseWorker subclasses that are never
+    started as processes; the host calls their run_loop()/handle_command()
+    on a timer heap, each at its own loop_interval. They share the host's
+    out_queue (messages are already tagged with the worker's proc_id) and
+    get commands routed through the host's cmd_queue as (proc_id, cmd).
+
+    Only suitable for workers whose run_loop does not block: a member's
+    receive_timeout is forced to 0, so it polls instead of waiting, and
+    its loop_interval is raised to at least member_interval, so polling
+    members do not spin the host. Members are built in the parent before
+    the host forks, so they inherit channel handles (locks, pipes, shared
+    memory) like a normal worker would.
+    """
+
+    loop_interval = 0.0
+    # Longest the host sleeps, so its own commands and heartbeat stay live
+    max_sleep = 0.05
+    # Shortest cadence of a member
+    member_interval = 0.0005
+
+    def __init__(self, proc_id, name, cmd_queue: Queue, out_queue: Queue, members):
+        super().__init__(proc_id, name, cmd_queue, out_queue)
+        # members: [(proc_id, name, factory)], factory as for ProcessManager
+        self.members = {}
+        for member_id, member_name, factory in members:
+            worker = factory(member_id, member_name, LocalQueue(), out_queue)
+            if hasattr(worker, "receive_timeout"):
+                # A blocking receive would stall every other member
+                worker.receive_timeout = 0.0
+            worker.loop_interval = max(worker.loop_interval, self.member_interval)
+            self.members[member_id] = worker
+        self._heap = []
+        self._seq = 0
+        self._started = False
+
+    def _schedule(self, worker, due):
+        self._seq += 1
+        heapq.heappush(self._heap, (due, self._seq, worker.proc_id))
+
+    def _start_members(self):
+        now = time.monotonic()
+        for worker in self.members.values():
+            worker.log(f"{worker.name}: started (hosted by {self.name})")
+            self._schedule(worker, now)
+        self._started = True
+
+    def _step(self, worker):
+        """
+        One iteration of a hosted worker, mirroring BaseWorker.run().
+        """
+        try:
+            cmd = worker.cmd_queue.get_nowait()
+        except queue.Empty:
+            cmd = None
+        if cmd == "stop":
+            worker.log(f"{worker.name}: stopping")
+            worker._running = False
+        elif cmd is not None:
+            if isinstance(cmd, str) and cmd.startswith("profile"):
+                worker.log(f"{worker.name}: hosted worker, profile host {self.proc_id} instead")
+            else:
+                worker.handle_command(cmd)
+
+        if worker._running:
+            worker.run_loop()
+
+    def handle_command(self, cmd):
+        # (member proc_id, command) for a hosted worker
+        if isinstance(cmd, tuple) and len(cmd) == 2:
+            worker = self.members.get(cmd[0])
+            if worker is not None:
+                worker.cmd_queue.put(cmd[1])
+
+    def _drain_commands(self):
+        # BaseWorker.run() takes one command per iteration, but a host can
+        # get one per member at once (e.g. a bulk stop)
+        while self._running:
+            try:
+                cmd = self.cmd_queue.get_nowait()
+            except Exception:
+                return
+            if cmd == "stop":
+                self.log(f"{self.name}: stopping")
+                self._running = False
+            elif isinstance(cmd, str) and cmd.startswith("profile"):
+                self._handle_profile_command(cmd)
+            else:
+                self.handle_command(cmd)
+
+    def run_loop(self):
+        if not self._started:
+            self._start_members()
+        self._drain_commands()
+        if not self._running:
+            return
+
+        # Run everything that is due, then sleep until the next one
+        now = time.monotonic()
+        due_now = []
+        while self._heap and self._heap[0][0] <= now:
+            due_now.append(heapq.heappop(self._heap))
+        for due, _seq, member_id in due_now:
+            worker = self.members.get(member_id)
+            if worker is None:
+                continue
+            try:
+                self._step(worker)
+            except Exception as exc:
+                # One broken member must not take the others down
+                worker.log(f"ERROR: {exc}")
+                worker._running = False
+            if worker._running:
+                # Keep the cadence, but do not try to catch up after a stall
+                self._schedule(worker, max(due + worker.loop_interval, now))
+            else:
+                worker.log(f"{worker.name}: terminated")
+                del self.members[member_id]
+
+        wake = now + self.max_sleep
+        if self._heap:
+            wake = min(wake, self._heap[0][0])
+        delay = wake - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def run(self):
+        super().run()
+        for worker in self.members.values():
+            worker.log(f"{worker.name}: terminated")